@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+# Cumulative revenue share closing the A and B classes
+A_SHARE = 0.80
+B_SHARE = 0.95
+
+
+def classify_abc(totals, a_share=A_SHARE, b_share=B_SHARE):
+    """ABC (Pareto) classification of per-item revenue.
+
+    Items are ranked by revenue with one sort; A items together make up the
+    first a_share of revenue, B items the next share up to b_share, and the
+    rest are C. Items with no (or negative) revenue are always C.
+    """
+    values = np.nan_to_num(totals.to_numpy(dtype='float64'))
+    order = np.argsort(-values, kind='stable')
+    ranked = values[order]
+    positive_total = ranked[ranked > 0].sum()
+
+    cumulative = np.cumsum(np.clip(ranked, 0, None))
+    share = ranked / positive_total if positive_total else np.zeros_like(ranked)
+    cumulative_share = cumulative / positive_total if positive_total else np.zeros_like(ranked)
+    # Share held by the items ranked above, so the item crossing a threshold stays in the class
+    share_before = cumulative_share - np.clip(share, 0, None)
+
+    classes = np.where(share_before < a_share, 'A', np.where(share_before < b_share, 'B', 'C'))
+    classes[ranked <= 0] = 'C'
+
+    return pd.DataFrame({
+        totals.index.name or 'Item': totals.index.to_numpy()[order],
+        'Revenue': ranked,
+        'Share %': share * 100,
+        'Cumulative %': cumulative_share * 100,
+        'Class': classes
+    })
+
+
+def summarize_abc(abc):
+    """Item count and revenue per class."""
+    summary = abc.groupby('Class').agg(Items=('Revenue', 'size'), Revenue=('Revenue', 'sum'))
+    summary = summary.reindex(['A', 'B', 'C'], fill_value=0)
+    total_items = summary['Items'].sum()
+    summary['Items %'] = summary['Items'] / total_items * 100 if total_items else 0.0
+    summary['Revenue %'] = abc['Share %'].groupby(abc['Class']).sum().reindex(summary.index, fill_value=0)
+    return summary
+
+
+class DateRangeTotals:
+    """Per-group sums over a date range, updated incrementally as the range moves.
+
+    The rows are ordered by date once. When the range changes, only the rows
+    entering or leaving it are added to or subtracted from the running
+    totals, instead of regrouping every row in the new range.
+    """
+
+    def __init__(self, dates, groups, values, row_mask=None):
+        dates = np.asarray(dates, dtype='datetime64[ns]')
+        self.order = np.argsort(dates, kind='stable')
+        self.sorted_dates = dates[self.order]
+        # NaT sorts last; only a range with neither bound includes those rows, as in filter_date_range
+        self.n_dated = int((~np.isnat(self.sorted_dates)).sum())
+        self.codes, self.labels = pd.factorize(groups)
+        self.values = np.nan_to_num(np.asarray(values, dtype='float64'))
+        self.row_mask = row_mask
+        self.totals = np.zeros(len(self.labels), dtype='float64')
+        self.counts = np.zeros(len(self.labels), dtype='int64')
+        self.bounds = None
+
+    def _positions(self, start, end):
+        dated = self.sorted_dates[:self.n_dated]
+        lo = 0 if start is None else int(np.searchsorted(dated, pd.Timestamp(start).to_datetime64(), 'left'))
+        if end is not None:
+            hi = int(np.searchsorted(dated, pd.Timestamp(end).to_datetime64(), 'right'))
+        else:
+            hi = len(self.sorted_dates) if start is None else self.n_dated
+        return lo, max(lo, hi)
+
+    def _apply(self, lo, hi, sign):
+        if hi <= lo:
+            return
+        rows = self.order[lo:hi]
+        keep = self.codes[rows] >= 0
+        if self.row_mask is not None:
+            keep &= self.row_mask[rows]
+        rows = rows[keep]
+        codes = self.codes[rows]
+        self.totals += sign * np.bincount(codes, weights=self.values[rows], minlength=len(self.labels))
+        self.counts += sign * np.bincount(codes, minlength=len(self.labels))
+
+    def update(self, start=None, end=None):
+        """Totals per group with rows in start <= date <= end (either bound may be None)."""
+        lo, hi = self._positions(start, end)
+        if self.bounds is None:
+            changed = hi - lo
+        else:
+            old_lo, old_hi = self.bounds
+            changed = abs(lo - old_lo) + abs(hi - old_hi)
+
+        if self.bounds is None or changed >= hi - lo or hi <= self.bounds[0] or lo >= self.bounds[1]:
+            # Cheaper (and exact) to start over
+            self.totals[:] = 0
+            self.counts[:] = 0
+            self._apply(lo, hi, 1)
+        else:
+            old_lo, old_hi = self.bounds
+            self._apply(lo, old_lo, 1)
+            self._apply(old_lo, lo, -1)
+            self._apply(old_hi, hi, 1)
+            self._apply(hi, old_hi, -1)
+        self.bounds = (lo, hi)
+        present = self.counts > 0
+        return pd.Series(self.totals[present], index=pd.Index(self.labels[present]))
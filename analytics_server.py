@@ -0,0 +1,287 @@
+"""Serve the dashboard's numbers as JSON over HTTP.
+
+Loads a spreadsheet once, keeps it in memory and answers requests such as
+
+    GET /metrics?start=2024-01-01&end=2024-03-31&store=Nairobi
+    GET /products?top=20&brand=Crown,Sadolin
+    GET /departments
+    GET /trend
+
+Every endpoint accepts ``start``/``end`` dates and the store, brand,
+department and category filters (comma-separated values are ORed). Responses
+are cached per query and carry an ETag; clients sending ``If-None-Match``
+get ``304 Not Modified``.
+
+    python analytics_server.py sales.xlsx --port 8050
+"""
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+from bitmap_index import BitmapIndex
+from paint_analytics import AnalyticsEngine
+from memory_budget import MemoryBudget
+import session_snapshot
+
+CACHE_SIZE = 256
+# Rollups of recent row selections, shared by the product, department and trend views
+ROLLUP_CACHE_SIZE = 16
+MAX_HEADER_BYTES = 64 * 1024
+
+STATUS_TEXT = {
+    200: 'OK',
+    304: 'Not Modified',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    500: 'Internal Server Error'
+}
+
+
+def json_default(value):
+    """Serialize numpy scalars as plain numbers and anything else as text."""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class AnalyticsService(AnalyticsEngine):
+    """Resident dataset plus cached JSON views of the dashboard analyses."""
+
+    def __init__(self, file_path, workers=None):
+        self.file_path = file_path
+        self.memory = MemoryBudget()
+        self.df, self.validation_report = self.read_dataset(file_path)
+        self.date_col = next((col for col in self.df.columns if str(col).lower().strip() == 'date'), None)
+        self.filter_columns = self.find_filter_columns(self.df)
+        self.filter_index = BitmapIndex(self.df, list(self.filter_columns.values()))
+
+        fingerprint = session_snapshot.file_fingerprint(file_path)
+        self.version = hashlib.sha1(json.dumps(fingerprint).encode()).hexdigest()[:12]
+
+        self.cache = OrderedDict()
+        self.in_flight = {}
+        self.rollups = OrderedDict()
+        self.rollup_lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.routes = {
+            '/metrics': self.metrics,
+            '/products': self.products,
+            '/departments': self.departments,
+            '/trend': self.trend,
+            '/health': self.health
+        }
+
+    def select(self, params):
+        """Rows matching the date range and dimension filters in the query."""
+        filters = {}
+        for dimension, col in self.filter_columns.items():
+            values = params.get(dimension.lower())
+            if values:
+                filters[col] = [value for value in values.split(',') if value]
+        mask = None
+        if filters:
+            mask = self.filter_index.to_mask(self.filter_index.select(filters))
+        if self.date_col and (params.get('start') or params.get('end')):
+            date_mask = self.filter_date_range(self.df, self.date_col, params.get('start'), params.get('end'))
+            mask = date_mask if mask is None else mask & date_mask
+        return self.df if mask is None else self.df[mask]
+
+    def selection_rollup(self, params, df):
+        """Rollup of the rows df selected by the query, built once per selection."""
+        key = tuple(sorted((name, value) for name, value in params.items() if name != 'top'))
+        with self.rollup_lock:
+            if key in self.rollups:
+                self.rollups.move_to_end(key)
+                return self.rollups[key]
+        rollup = self.build_rollup(df) if len(df) else None
+        with self.rollup_lock:
+            self.rollups[key] = rollup
+            if len(self.rollups) > ROLLUP_CACHE_SIZE:
+                self.rollups.popitem(last=False)
+        return rollup
+
+    def metrics(self, params):
+        return self.calculate_financial_metrics(self.select(params))
+
+    def products(self, params):
+        top_n = int(params.get('top', 10))
+        df = self.select(params)
+        products, _, columns = self.calculate_product_tables(df, top_n=top_n,
+                                                             rollup=self.selection_rollup(params, df))
+        return {'columns': columns, 'rows': json.loads(products.to_json(orient='records'))}
+
+    def departments(self, params):
+        df = self.select(params)
+        columns = self.find_product_columns(df)
+        missing = [name for name in ('department', 'quantity', 'revenue') if columns[name] is None]
+        if missing:
+            raise ValueError(f"Missing columns for department analysis: {', '.join(missing)}")
+        departments = self.calculate_department_table(df, columns, rollup=self.selection_rollup(params, df))
+        rows = json.loads(departments.to_json(orient='records'))
+        return {'columns': columns, 'rows': rows}
+
+    def trend(self, params):
+        df = self.select(params)
+        monthly = self.calculate_monthly_trend(df, rollup=self.selection_rollup(params, df))
+        return {'rows': json.loads(monthly.to_json(orient='records'))}
+
+    def health(self, params):
+        return {'status': 'ok', 'rows': len(self.df), 'version': self.version,
+                'filters': self.filter_columns, 'cached': len(self.cache),
+                'memory': {'budget': self.memory.budget, 'resident': self.memory.resident,
+                           'spilled': sum(self.memory.spilled.values()), 'stages': self.memory.stages}}
+
+    async def respond(self, path, params):
+        """Return (status, body, etag) for a GET request, using the cache."""
+        handler = self.routes.get(path)
+        if handler is None:
+            return 404, json.dumps({'error': f"Unknown endpoint {path}"}).encode(), None
+        if handler == self.health:
+            return 200, json.dumps(handler(params)).encode(), None
+
+        key = (path, tuple(sorted(params.items())))
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        # Identical concurrent requests share a single computation
+        if key not in self.in_flight:
+            loop = asyncio.get_running_loop()
+            self.in_flight[key] = loop.run_in_executor(self.executor, self.compute, handler, params)
+        future = self.in_flight[key]
+        try:
+            result = await future
+        finally:
+            self.in_flight.pop(key, None)
+
+        if result[0] == 200:
+            self.cache[key] = result
+            if len(self.cache) > CACHE_SIZE:
+                self.cache.popitem(last=False)
+        return result
+
+    def compute(self, handler, params):
+        try:
+            payload = handler(params)
+        except (ValueError, KeyError) as e:
+            return 400, json.dumps({'error': str(e)}).encode(), None
+        body = json.dumps(payload, default=json_default).encode()
+        etag = '"' + self.version + '-' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        return 200, body, etag
+
+
+async def read_request(reader):
+    """Read one request head; returns (method, target, headers) or None on EOF."""
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    except asyncio.LimitOverrunError:
+        raise ValueError("Request headers too large")
+    request_line, *header_lines = head.decode('latin-1').split('\r\n')
+    method, target, _ = request_line.split(' ', 2)
+    headers = {}
+    for line in header_lines:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    return method, target, headers
+
+
+def build_response(status, body=b'', etag=None, keep_alive=True):
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}",
+             "Content-Type: application/json",
+             f"Content-Length: {len(body)}",
+             "Cache-Control: no-cache",
+             f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    if etag:
+        lines.append(f"ETag: {etag}")
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode() + body
+
+
+def make_handler(service):
+    async def handle_connection(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except ValueError:
+                    writer.write(build_response(400, keep_alive=False))
+                    break
+                if request is None:
+                    break
+                method, target, headers = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+
+                if method != 'GET':
+                    status, body, etag = 405, b'', None
+                else:
+                    url = urlsplit(target)
+                    params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+                    try:
+                        status, body, etag = await service.respond(url.path.rstrip('/') or '/', params)
+                    except Exception as e:
+                        # stderr, so errors still show while stdout is silenced
+                        print(f"Error serving {target}: {str(e)}", file=sys.stderr)
+                        status, body, etag = 500, json.dumps({'error': str(e)}).encode(), None
+
+                if etag and headers.get('if-none-match') == etag:
+                    status, body = 304, b''
+                writer.write(build_response(status, body, etag, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+    return handle_connection
+
+
+async def serve(service, host, port):
+    server = await asyncio.start_server(make_handler(service), host, port, limit=MAX_HEADER_BYTES)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve paint sales analytics as JSON over HTTP.")
+    parser.add_argument('data', help="Spreadsheet to serve")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="Threads used to compute uncached responses")
+    parser.add_argument('--verbose', action='store_true',
+                        help="Keep the analysis debug output on the console")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    service = AnalyticsService(args.data, workers=args.workers)
+    print(f"Loaded dataset in {time.perf_counter() - start:.1f}s")
+    print(f"Serving {service.file_path} ({len(service.df):,} rows) on http://{args.host}:{args.port}")
+
+    with contextlib.ExitStack() as stack:
+        if not args.verbose:
+            # The analysis methods print debugging detail on every call; errors go to stderr
+            devnull = stack.enter_context(open(os.devnull, 'w'))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+        try:
+            asyncio.run(serve(service, args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark product/department aggregations over a shared-memory process pool.
+
+Generates a synthetic sales table, places it in shared memory once and times
+the per-product and per-department sums with 1, 2, 4, ... worker processes:
+
+    python bench_parallel.py --rows 20000000 --products 10000
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from shared_dataset import SharedDataset
+
+VALUE_COLUMNS = ['Qty', 'Net Sales', 'Cost of Sale']
+
+
+def make_sales(rows, products, seed=42):
+    rng = np.random.default_rng(seed)
+    qty = rng.integers(1, 20, rows)
+    price = rng.uniform(5, 80, rows)
+    return pd.DataFrame({
+        'Product Description': pd.Categorical.from_codes(
+            rng.integers(0, products, rows), [f"SKU {i:06d}" for i in range(products)]),
+        'Department': pd.Categorical.from_codes(
+            rng.integers(0, 12, rows), [f"Dept {i:02d}" for i in range(12)]),
+        'Qty': qty,
+        'Net Sales': qty * price,
+        'Cost of Sale': qty * price * 0.7
+    })
+
+
+def time_best(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared-memory aggregation benchmark.")
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--products', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    print(f"Generating {args.rows:,} rows, {args.products:,} products...")
+    df = make_sales(args.rows, args.products)
+
+    start = time.perf_counter()
+    shared = SharedDataset.create(df, numeric=VALUE_COLUMNS, categorical=['Product Description', 'Department'])
+    print(f"Copied to shared memory in {time.perf_counter() - start:.2f}s")
+
+    baseline, expected = time_best(
+        lambda: df.groupby('Product Description', observed=True)[VALUE_COLUMNS].sum(), args.repeat)
+    print(f"pandas groupby (1 process): {baseline:.3f}s")
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= args.max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != args.max_workers:
+        worker_counts.append(args.max_workers)
+
+    try:
+        print(f"\n{'workers':>7} {'products':>10} {'departments':>12} {'speedup':>8}")
+        single = None
+        for workers in worker_counts:
+            with shared.executor(workers) as pool:
+                # Warm up so process start-up is not timed
+                shared.group_sums('Department', VALUE_COLUMNS, pool, partitions=workers)
+                product_time, products = time_best(
+                    lambda: shared.group_sums('Product Description', VALUE_COLUMNS, pool, partitions=workers),
+                    args.repeat)
+                dept_time, _ = time_best(
+                    lambda: shared.group_sums('Department', VALUE_COLUMNS, pool, partitions=workers),
+                    args.repeat)
+            total = product_time + dept_time
+            single = single or total
+            print(f"{workers:>7} {product_time:>9.3f}s {dept_time:>11.3f}s {single / total:>7.2f}x")
+
+        assert np.allclose(products.to_numpy(), expected.to_numpy()), "Shared-memory result differs from pandas"
+        print("\nResults match pandas groupby.")
+    finally:
+        shared.close()
+
+
+if __name__ == "__main__":
+    main()
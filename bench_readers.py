@@ -0,0 +1,79 @@
+"""Benchmark the file reader backends on the generated sample data.
+
+Repeats the rows of sample_paint_sales.xlsx (see generate_sample_data.py) to
+the requested size, writes them as .xlsx, .csv and (with pyarrow) .parquet,
+and times every installed reader on each file:
+
+    python bench_readers.py --rows 200000
+"""
+import argparse
+import importlib.util
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from file_readers import readers_for
+
+
+def time_best(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def write_files(df, directory):
+    paths = {}
+    start = time.perf_counter()
+    paths['.xlsx'] = os.path.join(directory, 'sales.xlsx')
+    df.to_excel(paths['.xlsx'], index=False)
+    paths['.csv'] = os.path.join(directory, 'sales.csv')
+    df.to_csv(paths['.csv'], index=False)
+    if importlib.util.find_spec('pyarrow') or importlib.util.find_spec('fastparquet'):
+        paths['.parquet'] = os.path.join(directory, 'sales.parquet')
+        df.to_parquet(paths['.parquet'], index=False)
+    print(f"Wrote {', '.join(paths)} in {time.perf_counter() - start:.1f}s")
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="File reader backend benchmark.")
+    parser.add_argument('--data', default='sample_paint_sales.xlsx',
+                        help="Generated sample data to repeat (default: sample_paint_sales.xlsx)")
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    sample = pd.read_excel(args.data)
+    df = sample.iloc[np.arange(args.rows) % len(sample)].reset_index(drop=True)
+    print(f"Benchmarking {len(df):,} rows x {len(df.columns)} columns")
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_files(df, directory)
+
+        print(f"\n{'file':<9} {'reader':<12} {'time':>8} {'rows/s':>12}")
+        for ext, path in paths.items():
+            # pandas' own default, for reference
+            if ext == '.xlsx':
+                elapsed, _ = time_best(lambda: pd.read_excel(path, engine='openpyxl'), args.repeat)
+                print(f"{ext:<9} {'(pandas)':<12} {elapsed:>7.3f}s {len(df) / elapsed:>12,.0f}")
+            for chosen, reader_class in enumerate(readers_for(path)):
+                reader = reader_class()
+                elapsed, result = time_best(lambda: reader.read(path), args.repeat)
+                assert result.shape == df.shape, f"{reader.name} read {result.shape}, expected {df.shape}"
+                marker = '  <- chosen' if chosen == 0 else ''
+                print(f"{ext:<9} {reader.name:<12} {elapsed:>7.3f}s {len(df) / elapsed:>12,.0f}{marker}")
+
+        missing = [reader.name for ext in paths for reader in readers_for(paths[ext], installed_only=False)
+                   if not reader.available()]
+        if missing:
+            print(f"\nNot installed: {', '.join(sorted(set(missing)))}")
+
+
+if __name__ == "__main__":
+    main()
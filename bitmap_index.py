@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+
+class BitmapIndex:
+    """Per-value bitsets for dimension columns, combined with bitwise AND/OR.
+
+    Each distinct value of an indexed column gets a packed bitset (one bit per
+    row, eight rows per byte), so a filter such as
+    ``Store in (A, B) and Brand == C`` resolves to a couple of vectorized byte
+    operations instead of rescanning the columns.
+    """
+
+    def __init__(self, df, columns):
+        self.n_rows = len(df)
+        self.n_bytes = (self.n_rows + 7) // 8
+        self.bitmaps = {}
+        for col in columns:
+            if col in df.columns:
+                self.bitmaps[col] = self._build_column(df[col])
+
+    def _build_column(self, series):
+        codes, uniques = pd.factorize(series, sort=True)
+        bitmaps = {}
+        if self.n_rows == 0:
+            return bitmaps
+        # Group row positions by code once, then set each value's bits
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        bounds = np.searchsorted(sorted_codes, np.arange(len(uniques) + 1))
+        for code, value in enumerate(uniques):
+            rows = np.zeros(self.n_rows, dtype=bool)
+            rows[order[bounds[code]:bounds[code + 1]]] = True
+            bitmaps[value] = np.packbits(rows)
+        return bitmaps
+
+    def columns(self):
+        return list(self.bitmaps.keys())
+
+    def values(self, col):
+        """Distinct values of an indexed column, sorted."""
+        return list(self.bitmaps.get(col, {}).keys())
+
+    def empty(self):
+        return np.zeros(self.n_bytes, dtype=np.uint8)
+
+    def full(self):
+        return np.packbits(np.ones(self.n_rows, dtype=bool))
+
+    def bitmap(self, col, value):
+        """Bitset of the rows where ``col == value``."""
+        return self.bitmaps[col].get(value, self.empty())
+
+    def any_of(self, col, values):
+        """Bitset of the rows where ``col`` is one of ``values`` (OR)."""
+        result = self.empty()
+        for value in values:
+            np.bitwise_or(result, self.bitmap(col, value), out=result)
+        return result
+
+    def all_of(self, *bitsets):
+        """Intersection (AND) of several bitsets."""
+        result = self.full()
+        for bits in bitsets:
+            np.bitwise_and(result, bits, out=result)
+        return result
+
+    def invert(self, bits):
+        """Complement of a bitset (NOT), keeping padding bits clear."""
+        return np.bitwise_and(np.invert(bits), self.full())
+
+    def select(self, filters):
+        """Bitset for ``{column: [values]}``: OR within a column, AND across columns."""
+        return self.all_of(*(self.any_of(col, values) for col, values in filters.items()))
+
+    def to_mask(self, bits):
+        """Expand a bitset to a boolean row mask."""
+        return np.unpackbits(bits, count=self.n_rows).astype(bool)
+
+    def count(self, bits):
+        """Number of rows set in a bitset."""
+        return int(np.unpackbits(bits, count=self.n_rows).sum())
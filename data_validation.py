@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+# Net Sales may differ from Qty x SP incl VAT - Discounts by rounding only
+NET_SALES_RTOL = 0.005
+NET_SALES_ATOL = 0.05
+
+
+def _record(report, df, name, mask, sample_size):
+    """Add a check result (count and first row labels) if any rows failed."""
+    mask = np.asarray(mask, dtype=bool)
+    count = int(mask.sum())
+    if count:
+        positions = np.flatnonzero(mask)[:sample_size]
+        report['checks'][name] = {
+            'count': count,
+            'rows': df.index[positions].tolist()
+        }
+
+
+def infer_date_range(dates):
+    """Reporting period of a file: whole months spanning the bulk (0.1%-99.9%) of its dates."""
+    dates = dates.dropna()
+    if dates.empty:
+        return None
+    low, high = dates.quantile([0.001, 0.999])
+    start = low.to_period('M').start_time
+    end = high.to_period('M').end_time
+    return start, end
+
+
+def validate_dataset(df, unparseable=None, date_col=None, date_range=None, sample_size=5):
+    """Run the data-quality checks on a cleaned dataset in vectorized passes.
+
+    unparseable maps numeric column names to boolean masks of values that were
+    present in the file but could not be converted. Returns a report dict with
+    the row count and, per failed check, the number of rows and a sample of
+    their index labels.
+    """
+    report = {'rows': len(df), 'checks': {}}
+
+    for col, mask in (unparseable or {}).items():
+        _record(report, df, f"Unparseable {col}", mask, sample_size)
+
+    for col in ['Qty', 'Net Sales']:
+        if col in df.columns and pd.api.types.is_numeric_dtype(df[col]):
+            _record(report, df, f"Negative {col}", (df[col] < 0).to_numpy(), sample_size)
+
+    _record(report, df, "Duplicate transactions", df.duplicated(keep='first').to_numpy(), sample_size)
+
+    if date_col is not None and date_col in df.columns:
+        dates = df[date_col]
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            _record(report, df, f"Missing or unparseable {date_col}", dates.isna().to_numpy(), sample_size)
+            date_range = date_range or infer_date_range(dates)
+            if date_range:
+                start, end = date_range
+                report['date_range'] = (str(start.date()), str(end.date()))
+                _record(report, df, f"{date_col} outside file range",
+                        ((dates < start) | (dates > end)).to_numpy(), sample_size)
+
+    needed = ['Net Sales', 'Qty', 'SP incl VAT', 'Discounts']
+    if all(col in df.columns and pd.api.types.is_numeric_dtype(df[col]) for col in needed):
+        net = df['Net Sales'].to_numpy(dtype='float64')
+        expected = (df['Qty'].to_numpy(dtype='float64') * df['SP incl VAT'].to_numpy(dtype='float64')
+                    - np.nan_to_num(df['Discounts'].to_numpy(dtype='float64')))
+        comparable = ~(np.isnan(net) | np.isnan(expected))
+        mismatch = comparable & ~np.isclose(net, expected, rtol=NET_SALES_RTOL, atol=NET_SALES_ATOL)
+        _record(report, df, "Net Sales != Qty x SP incl VAT - Discounts", mismatch, sample_size)
+
+    return report
+
+
+def format_report(report):
+    """Render a validation report as a short block of text."""
+    lines = ["Data Quality Report", "=" * 50, f"Rows checked: {report['rows']:,}"]
+    if 'date_range' in report:
+        lines.append(f"File date range: {report['date_range'][0]} to {report['date_range'][1]}")
+    if not report['checks']:
+        lines.append("No problems found.")
+    for name, result in report['checks'].items():
+        lines.append(f"- {name}: {result['count']:,} rows (e.g. rows {result['rows']})")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,174 @@
+import importlib.util
+import os
+
+import pandas as pd
+
+# Rows the openpyxl reader turns into column arrays at a time, so the
+# sheet is never held whole as Python row tuples
+OPENPYXL_CHUNK_ROWS = 50_000
+
+
+class FileReader:
+    """A way of reading a sales file into a DataFrame.
+
+    Each backend declares the file extensions it handles, the modules it
+    needs and a speed rank (lower is faster). choose_reader picks the
+    fastest installed backend for a file.
+    """
+
+    name = None
+    extensions = ()
+    requires = ()
+    rank = 100
+    # True if the rows are read in a stream rather than loading the whole file
+    streaming = False
+
+    @classmethod
+    def available(cls):
+        return all(importlib.util.find_spec(module) is not None for module in cls.requires)
+
+    @classmethod
+    def handles(cls, file_path):
+        return os.path.splitext(file_path)[1].lower() in cls.extensions
+
+    def read(self, file_path):
+        raise NotImplementedError
+
+
+class CalamineReader(FileReader):
+    """Rust calamine parser through pandas; several times faster than openpyxl."""
+
+    name = 'calamine'
+    extensions = ('.xlsx', '.xlsm', '.xls', '.ods')
+    requires = ('python_calamine',)
+    rank = 10
+
+    def read(self, file_path):
+        return pd.read_excel(file_path, engine='calamine')
+
+
+class OpenpyxlReader(FileReader):
+    """Streams the first sheet from an openpyxl read-only workbook, OPENPYXL_CHUNK_ROWS rows at a time."""
+
+    name = 'openpyxl'
+    extensions = ('.xlsx', '.xlsm')
+    requires = ('openpyxl',)
+    rank = 50
+    streaming = True
+
+    def read(self, file_path):
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return pd.DataFrame()
+            # Read-only sheets can report trailing empty cells; drop unnamed trailing columns
+            width = len(header)
+            while width and header[width - 1] is None:
+                width -= 1
+            columns = [f"Unnamed: {i}" if name is None else name for i, name in enumerate(header[:width])]
+            chunks = []
+            records = []
+            for row in rows:
+                if any(value is not None for value in row):
+                    records.append(row[:width])
+                    if len(records) == OPENPYXL_CHUNK_ROWS:
+                        chunks.append(pd.DataFrame.from_records(records, columns=columns))
+                        records = []
+            if records or not chunks:
+                chunks.append(pd.DataFrame.from_records(records, columns=columns))
+            return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+        finally:
+            workbook.close()
+
+
+class XlrdReader(FileReader):
+    """Legacy .xls workbooks."""
+
+    name = 'xlrd'
+    extensions = ('.xls',)
+    requires = ('xlrd',)
+    rank = 50
+
+    def read(self, file_path):
+        return pd.read_excel(file_path, engine='xlrd')
+
+
+class PyArrowCsvReader(FileReader):
+    """Multithreaded pyarrow CSV parser."""
+
+    name = 'pyarrow-csv'
+    extensions = ('.csv',)
+    requires = ('pyarrow',)
+    rank = 10
+
+    def read(self, file_path):
+        from pyarrow import csv
+
+        # Leave dates to parse_date so every backend hands over the same text
+        convert = csv.ConvertOptions(timestamp_parsers=[])
+        return csv.read_csv(file_path, convert_options=convert).to_pandas()
+
+
+class PandasCsvReader(FileReader):
+    """pandas' C parser; always available."""
+
+    name = 'pandas-csv'
+    extensions = ('.csv',)
+    rank = 50
+
+    def read(self, file_path):
+        return pd.read_csv(file_path)
+
+
+class ParquetReader(FileReader):
+    """Columnar Parquet files through pyarrow (or fastparquet)."""
+
+    name = 'parquet'
+    extensions = ('.parquet', '.pq')
+    requires = ('pyarrow',)
+    rank = 1
+
+    @classmethod
+    def available(cls):
+        return any(importlib.util.find_spec(module) is not None for module in ('pyarrow', 'fastparquet'))
+
+    def read(self, file_path):
+        return pd.read_parquet(file_path)
+
+
+READERS = [CalamineReader, OpenpyxlReader, XlrdReader, PyArrowCsvReader, PandasCsvReader, ParquetReader]
+
+
+def register_reader(reader_class):
+    """Add a backend; it competes with the built-in ones on rank."""
+    READERS.append(reader_class)
+    return reader_class
+
+
+def supported_extensions():
+    """Extensions readable with the installed backends."""
+    return sorted({ext for reader in READERS if reader.available() for ext in reader.extensions})
+
+
+def readers_for(file_path, installed_only=True):
+    """Backends handling file_path, fastest first."""
+    candidates = [reader for reader in READERS
+                  if reader.handles(file_path) and (reader.available() or not installed_only)]
+    return sorted(candidates, key=lambda reader: reader.rank)
+
+
+def choose_reader(file_path, name=None):
+    """The fastest installed backend for file_path, or the backend called name."""
+    candidates = readers_for(file_path)
+    if name is not None:
+        candidates = [reader for reader in candidates if reader.name == name]
+    if not candidates:
+        missing = {module for reader in readers_for(file_path, installed_only=False) for module in reader.requires}
+        hint = f" (install {' or '.join(sorted(missing))})" if missing else ""
+        raise ValueError(f"No reader available for {os.path.basename(file_path)}{hint}. "
+                         f"Supported files: {', '.join(supported_extensions())}")
+    return candidates[0]()
@@ -0,0 +1,149 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+SEASON_LENGTH = 12
+FORECAST_HORIZON = 3
+
+# Smoothing parameters tried for every series; each series keeps the best fit
+ALPHAS = (0.1, 0.3, 0.6)
+BETAS = (0.05, 0.2)
+GAMMAS = (0.1, 0.3)
+
+# Two-sided 80% prediction interval
+INTERVAL_Z = 1.2816
+
+
+def build_series_matrix(df, group_cols, date_col, value_col):
+    """Pivot rows into a groups x months matrix of summed values (vectorized).
+
+    Returns the matrix, a DataFrame of group keys (one row per matrix row)
+    and the PeriodIndex of months. Months without sales are zero.
+    """
+    months = pd.to_datetime(df[date_col]).dt.to_period('M')
+    # Rows without a date or with a blank key are left out before numbering
+    # the groups, so every group has at least one row in the matrix
+    valid = months.notna().to_numpy() & df[group_cols].notna().all(axis=1).to_numpy()
+    rows = df.loc[valid, group_cols]
+    group_ids = rows.groupby(group_cols, sort=False, observed=True).ngroup().to_numpy()
+
+    month_codes = (months[valid].dt.year * 12 + months[valid].dt.month - 1).to_numpy()
+    first_month = month_codes.min() if len(month_codes) else 0
+    n_months = int(month_codes.max() - first_month + 1) if len(month_codes) else 0
+    n_groups = int(group_ids.max()) + 1 if len(group_ids) else 0
+
+    flat = group_ids * n_months + (month_codes - first_month)
+    values = np.nan_to_num(pd.to_numeric(df[value_col], errors='coerce').to_numpy(dtype='float64')[valid])
+    matrix = np.bincount(flat, weights=values, minlength=n_groups * n_months).reshape(n_groups, n_months)
+
+    keys = rows.iloc[np.unique(group_ids, return_index=True)[1]].reset_index(drop=True)
+    index = pd.period_range(pd.Period(year=first_month // 12, month=first_month % 12 + 1, freq='M'),
+                            periods=n_months, freq='M')
+    return matrix, keys, index
+
+
+def _smooth(Y, alpha, beta, gamma, season):
+    """Additive Holt-Winters over all rows of Y at once; gamma=None disables seasonality.
+
+    Returns the final level, trend and seasonal state plus the mean squared
+    one-step-ahead error of each row.
+    """
+    n_series, n_months = Y.shape
+    if gamma is not None:
+        level = Y[:, :season].mean(axis=1)
+        trend = (Y[:, season:2 * season].mean(axis=1) - level) / season
+        seasonal = Y[:, :season] - level[:, None]
+        start = season
+    else:
+        level = Y[:, 0].copy()
+        trend = (Y[:, 1] - Y[:, 0]) if n_months > 1 else np.zeros(n_series)
+        seasonal = np.zeros((n_series, 1))
+        start = 1
+
+    sse = np.zeros(n_series)
+    for t in range(start, n_months):
+        s_index = t % seasonal.shape[1]
+        season_t = seasonal[:, s_index]
+        predicted = level + trend + season_t
+        error = Y[:, t] - predicted
+        sse += error ** 2
+        previous_level = level
+        level = alpha * (Y[:, t] - season_t) + (1 - alpha) * (level + trend)
+        trend = beta * (level - previous_level) + (1 - beta) * trend
+        if gamma is not None:
+            seasonal[:, s_index] = gamma * (Y[:, t] - level) + (1 - gamma) * season_t
+    return level, trend, seasonal, sse / max(n_months - start, 1)
+
+
+def forecast_matrix(Y, horizon=FORECAST_HORIZON, season=SEASON_LENGTH):
+    """Forecast every row of a series matrix for the next horizon periods.
+
+    Uses additive Holt-Winters when there are at least two full seasons of
+    history, otherwise Holt's linear trend. The smoothing parameters are
+    chosen per series from a small grid by in-sample one-step error, with
+    all series fitted together as array operations. Returns point forecasts
+    and the lower/upper bounds of an 80% interval, each of shape
+    (series, horizon), clipped at zero.
+    """
+    Y = np.asarray(Y, dtype='float64')
+    n_series, n_months = Y.shape
+    if n_months == 0:
+        empty = np.zeros((n_series, horizon))
+        return empty, empty, empty
+    if n_months < 2:
+        point = np.repeat(Y[:, -1:], horizon, axis=1)
+        return point, point, point
+
+    seasonal_model = n_months >= 2 * season
+    gammas = GAMMAS if seasonal_model else (None,)
+
+    best_mse = np.full(n_series, np.inf)
+    best_point = np.zeros((n_series, horizon))
+    steps = np.arange(1, horizon + 1)
+    for alpha, beta, gamma in itertools.product(ALPHAS, BETAS, gammas):
+        level, trend, seasonal, mse = _smooth(Y, alpha, beta, gamma, season)
+        season_index = (n_months + steps - 1) % seasonal.shape[1]
+        point = level[:, None] + trend[:, None] * steps + seasonal[:, season_index]
+        better = mse < best_mse
+        best_mse[better] = mse[better]
+        best_point[better] = point[better]
+
+    # Interval widens with the horizon like a random walk on the one-step error
+    spread = INTERVAL_Z * np.sqrt(best_mse)[:, None] * np.sqrt(steps)
+    lower = np.clip(best_point - spread, 0, None)
+    upper = np.clip(best_point + spread, 0, None)
+    return np.clip(best_point, 0, None), lower, upper
+
+
+def forecast_groups(df, group_cols, date_col, value_col, horizon=FORECAST_HORIZON):
+    """Per-group forecasts for the next horizon months, as a long DataFrame.
+
+    One row per group with the actual total of the last horizon months, the
+    forecast total for the next horizon months with its interval (the sum of
+    the monthly bounds, so on the wide side) and the monthly point forecasts
+    in columns named after the months.
+    """
+    matrix, keys, months = build_series_matrix(df, group_cols, date_col, value_col)
+    point, lower, upper = forecast_matrix(matrix, horizon)
+    future = pd.period_range(months[-1] + 1, periods=horizon, freq='M') if len(months) else []
+    result = keys.copy()
+    result['Last Period'] = matrix[:, -horizon:].sum(axis=1) if matrix.size else 0.0
+    result['Forecast'] = point.sum(axis=1)
+    result['Lower'] = lower.sum(axis=1)
+    result['Upper'] = upper.sum(axis=1)
+    for i, month in enumerate(future):
+        result[str(month)] = point[:, i]
+    return result
+
+
+def forecast_total(monthly_values, months, horizon=FORECAST_HORIZON):
+    """Forecast a single monthly series; returns a DataFrame of Month, Forecast, Lower, Upper."""
+    point, lower, upper = forecast_matrix(np.asarray(monthly_values, dtype='float64')[None, :], horizon)
+    future = pd.period_range(pd.Period(months[-1], freq='M') + 1, periods=horizon, freq='M')
+    return pd.DataFrame({
+        'Month': future.astype(str),
+        'Forecast': point[0],
+        'Lower': lower[0],
+        'Upper': upper[0]
+    })
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+
+class GroupIndex:
+    """Row positions of every value of a column, from one stable sort.
+
+    rows(label) is a slice of the sorted row order, so a drill-down step
+    reads only that group's rows instead of filtering and regrouping the
+    whole frame. codes keeps the integer code of every row for grouping a
+    subset of rows by this column.
+    """
+
+    def __init__(self, values):
+        self.codes, self.labels = pd.factorize(values, sort=True)
+        self.positions = {label: code for code, label in enumerate(self.labels)}
+        order = np.argsort(self.codes, kind='stable')
+        # Missing values (code -1) sort first and belong to no group
+        self.order = order[int((self.codes < 0).sum()):]
+        counts = np.bincount(self.codes[self.codes >= 0], minlength=len(self.labels))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def code(self, label):
+        return self.positions.get(label, -1)
+
+    def rows(self, label):
+        """Positions of the rows with this value, in row order."""
+        code = self.code(label)
+        if code < 0:
+            return np.empty(0, dtype=self.order.dtype)
+        return self.order[self.offsets[code]:self.offsets[code + 1]]
+
+
+class GroupIndexCache:
+    """GroupIndex per column, built on first use and kept for one dataset version."""
+
+    def __init__(self):
+        self.version = None
+        self.indexes = {}
+
+    def get(self, df, column, version):
+        if version != self.version:
+            self.indexes = {}
+            self.version = version
+        if column not in self.indexes:
+            self.indexes[column] = GroupIndex(df[column])
+        return self.indexes[column]
+
+
+def totals_by(index, rows, measures):
+    """Sum measures (name -> aligned array) over rows, per group of index; sorted by the first measure."""
+    codes = index.codes[rows]
+    keep = codes >= 0
+    codes = codes[keep]
+    counts = np.bincount(codes, minlength=len(index.labels))
+    present = counts > 0
+
+    columns = {'Group': index.labels[present]}
+    for name, values in measures.items():
+        sums = np.bincount(codes, weights=np.nan_to_num(np.asarray(values)[rows][keep].astype('float64')),
+                           minlength=len(index.labels))
+        columns[name] = sums[present]
+    columns['Rows'] = counts[present]
+    table = pd.DataFrame(columns)
+    return table.sort_values(next(iter(measures)), ascending=False, ignore_index=True)
+
+
+def daily_totals(dates, rows, measures):
+    """Sum measures over rows per calendar day."""
+    days = np.asarray(dates)[rows].astype('datetime64[D]')
+    valid = ~np.isnat(days)
+    unique_days, day_codes = np.unique(days[valid], return_inverse=True)
+    columns = {'Date': unique_days}
+    for name, values in measures.items():
+        weights = np.nan_to_num(np.asarray(values)[rows][valid].astype('float64'))
+        columns[name] = np.bincount(day_codes, weights=weights, minlength=len(unique_days))
+    return pd.DataFrame(columns)
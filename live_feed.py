@@ -0,0 +1,287 @@
+import csv
+import io
+import json
+import os
+import queue
+import socket
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# A batch is handed on after this many records or this many seconds, whichever comes first
+FEED_BATCH_RECORDS = 5000
+FEED_BATCH_SECONDS = 0.5
+
+# Bytes read from a connection or pipe at a time
+FEED_READ_BYTES = 64 * 1024
+
+DEFAULT_FEED_ADDRESS = '127.0.0.1:9100'
+
+
+def parse_address(address):
+    """(host, port) for a 'host:port' or 'port' address, or None for a named pipe path."""
+    host, _, port = address.strip().rpartition(':')
+    if port.isdigit() and (host or address.strip().isdigit()):
+        return host or '127.0.0.1', int(port)
+    return None
+
+
+def parse_records(lines, header=None):
+    """DataFrame from NDJSON lines, or CSV lines when header (the column names) is given.
+
+    Lines that do not parse are skipped; returns the frame and the number
+    of lines skipped.
+    """
+    if header is not None:
+        df = pd.read_csv(io.BytesIO(b'\n'.join(lines)), header=None, names=header,
+                         dtype=str, on_bad_lines='skip', skip_blank_lines=True)
+        return df, len(lines) - len(df)
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return pd.DataFrame.from_records(records), len(lines) - len(records)
+
+
+class LiveFeed:
+    """Reads transaction records from tills and hands them on in micro-batches.
+
+    A 'host:port' address listens for TCP connections, one per till; any
+    other address is a named pipe (a FIFO on Linux/macOS, \\\\.\\pipe\\name on
+    Windows) that is reopened whenever its writer closes it. Every stream
+    sends newline-delimited JSON objects, or CSV whose first line is the
+    header. Each stream is read by one thread and batched by another, so a
+    partial batch is still flushed after FEED_BATCH_SECONDS when the till
+    goes quiet, and on stop(). on_batch(df, skipped) is called on the
+    batching thread.
+    """
+
+    def __init__(self, address, on_batch, on_error=None,
+                 batch_records=FEED_BATCH_RECORDS, batch_seconds=FEED_BATCH_SECONDS):
+        self.address = address
+        self.on_batch = on_batch
+        self.on_error = on_error or (lambda message: print(f"Live feed error: {message}"))
+        self.batch_records = batch_records
+        self.batch_seconds = batch_seconds
+        self.stopped = threading.Event()
+        self.server = None
+        self.connections = []
+        # (chunk queue, event set once its last batch is handed on) of each open stream
+        self.streams = []
+        self.lock = threading.Lock()
+
+    def start(self):
+        endpoint = parse_address(self.address)
+        if endpoint is not None:
+            self.server = socket.create_server(endpoint)
+            self.server.settimeout(0.5)
+            target = self.accept
+        else:
+            if not os.path.exists(self.address) and not self.address.startswith('\\\\'):
+                raise ValueError(f"Named pipe not found: {self.address}")
+            target = self.read_pipe
+        threading.Thread(target=target, daemon=True).start()
+        print(f"Live feed listening on {self.address}")
+
+    def stop(self):
+        """Stop reading and wait until the records already received have been handed on."""
+        self.stopped.set()
+        with self.lock:
+            open_connections = list(self.connections)
+        for conn in open_connections + [self.server]:
+            if conn is not None:
+                try:
+                    conn.close()
+                except OSError:
+                    pass
+        if self.server is None and hasattr(os, 'O_NONBLOCK'):
+            # Wake read_pipe if it is still waiting in open() for a writer
+            try:
+                os.close(os.open(self.address, os.O_WRONLY | os.O_NONBLOCK))
+            except OSError:
+                pass
+        with self.lock:
+            streams = list(self.streams)
+        # End every stream after the chunks already read, so they are still handed on
+        for chunks, done in streams:
+            chunks.put(None)
+        for chunks, done in streams:
+            done.wait()
+
+    def accept(self):
+        while not self.stopped.is_set():
+            try:
+                conn, peer = self.server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            print(f"Live feed connection from {peer[0]}:{peer[1]}")
+            with self.lock:
+                self.connections.append(conn)
+            self.follow(lambda conn=conn: conn.recv(FEED_READ_BYTES),
+                        on_done=lambda conn=conn: self.drop(conn))
+
+    def drop(self, conn):
+        """Forget and close a connection whose stream has ended."""
+        with self.lock:
+            if conn in self.connections:
+                self.connections.remove(conn)
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+    def read_pipe(self):
+        while not self.stopped.is_set():
+            try:
+                # Blocks until a writer opens the pipe, or stop() wakes it
+                pipe = open(self.address, 'rb', buffering=0)
+            except OSError as e:
+                self.on_error(str(e))
+                return
+            if self.stopped.is_set():
+                pipe.close()
+                return
+            done = self.follow(lambda: pipe.read(FEED_READ_BYTES))
+            done.wait()
+            pipe.close()
+
+    def follow(self, read, on_done=None):
+        """Start the reader and batcher threads of one stream; returns an event set when it ends.
+
+        on_done, if given, is called on the batching thread once the stream's
+        last batch has been handed on.
+        """
+        chunks = queue.Queue()
+        done = threading.Event()
+        with self.lock:
+            self.streams = [stream for stream in self.streams if not stream[1].is_set()] + [(chunks, done)]
+
+        def reader():
+            try:
+                while not self.stopped.is_set():
+                    chunk = read()
+                    if not chunk:
+                        break
+                    chunks.put(chunk)
+            except OSError as e:
+                if not self.stopped.is_set():
+                    self.on_error(str(e))
+            chunks.put(None)
+
+        def batcher():
+            try:
+                self.batch_stream(chunks)
+            except Exception as e:
+                self.on_error(str(e))
+            if on_done is not None:
+                on_done()
+            done.set()
+
+        threading.Thread(target=reader, daemon=True).start()
+        threading.Thread(target=batcher, daemon=True).start()
+        return done
+
+    def batch_stream(self, chunks):
+        """Split a stream's chunks into lines and pass them on in batches."""
+        header = None
+        first = True
+        pending = b''
+        lines = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                chunk = chunks.get(timeout=timeout)
+            except queue.Empty:
+                chunk = b''
+            if chunk:
+                parts = (pending + chunk).split(b'\n')
+                pending = parts.pop()
+                for line in parts:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    if first:
+                        first = False
+                        # CSV streams start with their header; NDJSON lines are objects
+                        if not line.startswith(b'{'):
+                            header = [name.strip() for name in next(csv.reader([line.decode('utf-8-sig')]))]
+                            continue
+                    lines.append(line)
+                if lines and deadline is None:
+                    deadline = time.monotonic() + self.batch_seconds
+            elif chunk is None and pending.strip():
+                lines.append(pending.strip())
+            if lines and (chunk is None or len(lines) >= self.batch_records or time.monotonic() >= deadline):
+                df, skipped = parse_records(lines, header)
+                self.on_batch(df, skipped)
+                lines = []
+                deadline = None
+            if chunk is None:
+                return
+
+
+class LiveTotals:
+    """Running totals and monthly revenue and cost of ingested records, updated batch by batch."""
+
+    def __init__(self):
+        self.quantity = 0.0
+        self.revenue = 0.0
+        self.cost = 0.0
+        self.rows = 0
+        # Month code (months since 1970) -> [revenue, cost]
+        self.months = {}
+
+    def add(self, df, date_col=None):
+        def column(name):
+            if name not in df.columns:
+                return np.zeros(len(df))
+            return np.nan_to_num(df[name].to_numpy(dtype='float64', na_value=np.nan))
+
+        revenue = column('Net Sales')
+        cost = column('Cost of Sale')
+        self.quantity += column('Qty').sum()
+        self.revenue += revenue.sum()
+        self.cost += cost.sum()
+        self.rows += len(df)
+
+        if date_col is not None and date_col in df.columns:
+            months = np.asarray(df[date_col], dtype='datetime64[M]')
+            valid = ~np.isnat(months)
+            codes, inverse = np.unique(months[valid].astype('int64'), return_inverse=True)
+            revenue_sums = np.bincount(inverse, weights=revenue[valid], minlength=len(codes))
+            cost_sums = np.bincount(inverse, weights=cost[valid], minlength=len(codes))
+            for code, month_revenue, month_cost in zip(codes.tolist(), revenue_sums, cost_sums):
+                totals = self.months.setdefault(code, [0.0, 0.0])
+                totals[0] += month_revenue
+                totals[1] += month_cost
+
+    def metrics(self):
+        """The metric card values, with the same keys as calculate_financial_metrics."""
+        profit = self.revenue - self.cost
+        return {
+            'Total Revenue': self.revenue,
+            'Total Cost': self.cost,
+            'Total Profit': profit,
+            'Total Units Sold': self.quantity,
+            'Profit Margin (%)': profit / self.revenue * 100 if self.revenue > 0 else 0,
+            'Average Profit per Unit': profit / self.quantity if self.quantity > 0 else 0,
+            'Markup (%)': profit / self.cost * 100 if self.cost > 0 else 0
+        }
+
+    def monthly_trend(self):
+        """Monthly revenue, cost and profit in the layout of calculate_monthly_trend."""
+        codes = sorted(self.months)
+        monthly = pd.DataFrame({
+            'Month': [str(np.datetime64(code, 'M')) for code in codes],
+            'Net Sales': [self.months[code][0] for code in codes],
+            'Cost of Sale': [self.months[code][1] for code in codes]
+        })
+        monthly['Profit'] = monthly['Net Sales'] - monthly['Cost of Sale']
+        return monthly
@@ -0,0 +1,103 @@
+"""Load-test a running analytics_server.py.
+
+Opens several keep-alive connections and sends a mix of requests, then
+reports latency percentiles and throughput:
+
+    python load_test.py --url http://127.0.0.1:8050 --connections 32 --requests 2000
+"""
+import argparse
+import asyncio
+import random
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = [
+    '/metrics',
+    '/products?top=10',
+    '/departments',
+    '/trend',
+]
+
+
+async def fetch(reader, writer, host, path, etag=None):
+    """Send one GET over an open connection; returns (status, etag)."""
+    request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n"
+    if etag:
+        request += f"If-None-Match: {etag}\r\n"
+    writer.write((request + "\r\n").encode())
+    await writer.drain()
+
+    head = await reader.readuntil(b'\r\n\r\n')
+    status_line, *header_lines = head.decode('latin-1').split('\r\n')
+    headers = {}
+    for line in header_lines:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', 0))
+    if length:
+        await reader.readexactly(length)
+    return int(status_line.split(' ')[1]), headers.get('etag')
+
+
+async def worker(host, port, paths, count, latencies, statuses, revalidate):
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    try:
+        for _ in range(count):
+            path = random.choice(paths)
+            start = time.perf_counter()
+            status, etag = await fetch(reader, writer, host, path, etags.get(path) if revalidate else None)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+            if etag:
+                etags[path] = etag
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run(url, connections, total_requests, paths, revalidate):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    # The first total_requests % connections workers send one extra request
+    base, extra = divmod(total_requests, connections)
+    counts = [base + (i < extra) for i in range(connections)]
+    latencies, statuses = [], {}
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(host, port, paths, count, latencies, statuses, revalidate)
+                           for count in counts if count))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"Requests:    {len(latencies):,} over {connections} connections in {elapsed:.2f}s")
+    print(f"Status:      {', '.join(f'{code} x{n}' for code, n in sorted(statuses.items()))}")
+    print(f"Throughput:  {len(latencies) / elapsed:,.0f} requests/second")
+    print(f"Latency p50: {percentile(latencies, 50) * 1000:.2f} ms")
+    print(f"Latency p99: {percentile(latencies, 99) * 1000:.2f} ms")
+    print(f"Latency max: {latencies[-1] * 1000:.2f} ms" if latencies else "")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the analytics server.")
+    parser.add_argument('--url', default='http://127.0.0.1:8050')
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=1000, help="Total number of requests")
+    parser.add_argument('--path', action='append', dest='paths',
+                        help="Endpoint to request (repeatable; default: metrics, products, departments, trend)")
+    parser.add_argument('--revalidate', action='store_true',
+                        help="Send If-None-Match with the last ETag seen for each path")
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.connections, args.requests, args.paths or DEFAULT_PATHS, args.revalidate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import atexit
+import ctypes
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+MB = 1024 * 1024
+
+# Default budget; override with the PAINT_ANALYTICS_MEMORY_MB environment variable
+DEFAULT_BUDGET_MB = 4096
+
+# Share of the budget the loaded dataset may keep resident; the rest is
+# working space for filtered selections and aggregations
+DATASET_SHARE = 0.5
+
+# Text columns with at most this share of distinct values are stored as categoricals
+CATEGORY_MAX_UNIQUE = 0.5
+
+# Seconds between resident memory samples while a stage runs
+SAMPLE_INTERVAL = 0.005
+
+HAS_PSUTIL = importlib.util.find_spec('psutil') is not None
+
+
+def process_memory():
+    """Resident memory of this process in bytes, or None where it cannot be read."""
+    if HAS_PSUTIL:
+        import psutil
+        return psutil.Process().memory_info().rss
+    if sys.platform.startswith('linux'):
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    if sys.platform == 'win32':
+        class Counters(ctypes.Structure):
+            _fields_ = [('cb', ctypes.c_ulong), ('PageFaultCount', ctypes.c_ulong)] + [
+                (name, ctypes.c_size_t) for name in (
+                    'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage',
+                    'QuotaPagedPoolUsage', 'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage',
+                    'PagefileUsage', 'PeakPagefileUsage')]
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+    return None
+
+
+def exact_sum(series):
+    """Sum a column, accumulating float32 (downcast) columns in float64 so large totals keep their cents."""
+    if series.dtype == np.float32:
+        series = series.astype('float64')
+    return series.sum()
+
+
+class MemoryBudget:
+    """Keeps the loaded dataset within a memory budget and records peak memory per stage.
+
+    fit() shrinks a freshly loaded DataFrame in steps, each taken only while
+    the dataset is still over its share of the budget: lossless downcasting
+    (smallest integer type, float32 where exact, categoricals for repetitive
+    text) always; then spilling columns the analyses never read to
+    memory-mapped files; then float32 for the remaining float columns; and
+    finally spilling the analysed numeric columns too. Spilled columns stay
+    ordinary DataFrame columns, but their pages come from disk and can be
+    dropped by the OS under pressure.
+    """
+
+    def __init__(self, budget_mb=None, spill_dir=None):
+        if budget_mb is None:
+            budget_mb = float(os.environ.get('PAINT_ANALYTICS_MEMORY_MB', DEFAULT_BUDGET_MB))
+        self.budget = int(budget_mb * MB)
+        self.spill_dir = spill_dir
+        self.spill_files = []
+        self.spilled = {}
+        self.resident = 0
+        self.stages = {}
+        self.actions = []
+
+    @contextmanager
+    def stage(self, name):
+        """Record the peak resident memory of the process while the block runs."""
+        start = process_memory()
+        if start is None:
+            yield
+            return
+
+        peak = [start]
+        done = threading.Event()
+
+        def sample():
+            while not done.wait(SAMPLE_INTERVAL):
+                peak[0] = max(peak[0], process_memory())
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        try:
+            yield
+        finally:
+            done.set()
+            sampler.join()
+            end = process_memory()
+            self.stages[name] = {'peak': max(peak[0], end), 'added': max(peak[0], end) - start}
+
+    def reset(self):
+        self.stages = {}
+        self.actions = []
+
+    def downcast(self, df, lossy=False, columns=None):
+        """Shrink numeric and text columns in place; float64 goes to float32 only if exact unless lossy."""
+        changed = []
+        for col in df.columns if columns is None else columns:
+            series = df[col]
+            kind = series.dtype.kind
+            if kind in 'iu':
+                new = pd.to_numeric(series, downcast='integer' if kind == 'i' else 'unsigned')
+            elif kind == 'f' and series.dtype != np.float32:
+                new = series.astype('float32')
+                if not lossy and not np.array_equal(new.to_numpy(dtype='float64'), series.to_numpy(),
+                                                    equal_nan=True):
+                    continue
+            elif kind == 'O' and not isinstance(series.dtype, pd.CategoricalDtype) and len(series) \
+                    and pd.api.types.infer_dtype(series, skipna=True) == 'string' \
+                    and series.nunique() <= CATEGORY_MAX_UNIQUE * len(series):
+                new = series.astype('category')
+            else:
+                continue
+            if new.dtype != series.dtype:
+                df[col] = new
+                changed.append(col)
+        return changed
+
+    def spill(self, df, columns):
+        """Move numeric columns to memory-mapped files; returns the DataFrame using them."""
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix='paint_analytics_')
+            atexit.register(shutil.rmtree, self.spill_dir, True)
+
+        mapped = {}
+        for col in columns:
+            values = df[col].to_numpy()
+            path = os.path.join(self.spill_dir, f"column_{len(self.spill_files):04d}.bin")
+            store = np.memmap(path, dtype=values.dtype, mode='w+', shape=values.shape)
+            store[:] = values
+            store.flush()
+            del store
+            self.spill_files.append(path)
+            # Copy-on-write mapping: edits stay in memory and never touch the file
+            mapped[col] = np.memmap(path, dtype=values.dtype, mode='c', shape=values.shape)
+            self.spilled[col] = values.nbytes
+
+        # Rebuilt without copying so the spilled columns stay backed by their files
+        return pd.concat([pd.Series(mapped[col], index=df.index, name=col, copy=False) if col in mapped
+                          else df[col] for col in df.columns], axis=1)
+
+    def release(self):
+        """Delete the spill files of the previous dataset."""
+        for path in self.spill_files:
+            try:
+                os.remove(path)
+            except OSError:
+                # Still mapped on Windows; removed with the directory at exit
+                pass
+        self.spill_files = []
+        self.spilled = {}
+
+    def fit(self, df, hot_columns=()):
+        """Shrink a loaded DataFrame to the dataset share of the budget (see class docstring)."""
+        self.release()
+        target = self.budget * DATASET_SHARE
+        before = int(df.memory_usage(deep=True).sum())
+
+        changed = self.downcast(df)
+        if changed:
+            self.actions.append(f"downcast {len(changed)} columns")
+        # Measured once; kept up to date as columns are converted or spilled
+        sizes = df.memory_usage(deep=True).to_dict()
+
+        def resident():
+            return sum(size for col, size in sizes.items() if col not in self.spilled)
+
+        def spill_until_fits(hot, label):
+            nonlocal df
+            candidates = sorted((col for col in df.columns
+                                 if (col in hot_columns) == hot and col not in self.spilled
+                                 and isinstance(df[col].dtype, np.dtype) and df[col].dtype.kind in 'iufb'),
+                                key=lambda col: sizes[col], reverse=True)
+            chosen = []
+            excess = resident() - target
+            for col in candidates:
+                if excess <= 0:
+                    break
+                chosen.append(col)
+                excess -= sizes[col]
+            if chosen:
+                df = self.spill(df, chosen)
+                self.actions.append(f"spilled {len(chosen)} {label} columns to disk")
+
+        if len(df) and resident() > target:
+            spill_until_fits(hot=False, label='unused')
+        if len(df) and resident() > target:
+            changed = self.downcast(df, lossy=True, columns=[col for col in df.columns if col not in self.spilled])
+            for col in changed:
+                sizes[col] = df[col].memory_usage(deep=True, index=False)
+            if changed:
+                self.actions.append(f"stored {len(changed)} columns as float32")
+        if len(df) and resident() > target:
+            spill_until_fits(hot=True, label='analysed')
+
+        self.resident = resident()
+        if self.resident > target:
+            self.actions.append(f"dataset still needs {self.resident / MB:,.0f} MB, "
+                                f"over its {target / MB:,.0f} MB share of the budget")
+        print(f"Dataset memory: {before / MB:,.1f} MB -> {self.resident / MB:,.1f} MB resident, "
+              f"{sum(self.spilled.values()) / MB:,.1f} MB spilled")
+        return df
+
+    def over_budget(self):
+        current = process_memory()
+        return current is not None and current > self.budget
+
+    def summary(self):
+        """Peak memory per stage, dataset footprint and the steps taken to fit the budget."""
+        lines = [f"Memory budget: {self.budget / MB:,.0f} MB"]
+        lines.append(f"Dataset: {self.resident / MB:,.1f} MB resident, "
+                     f"{sum(self.spilled.values()) / MB:,.1f} MB spilled to disk")
+        if self.stages:
+            lines.append("Peak per stage: " + ", ".join(
+                f"{name} {usage['peak'] / MB:,.0f} MB (+{usage['added'] / MB:,.0f})"
+                for name, usage in self.stages.items()))
+        if self.actions:
+            lines.append("Fitted by: " + "; ".join(self.actions))
+        return "\n".join(lines)
@@ -1,15 +1,567 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk, filedialog, messagebox, simpledialog
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.io as pio
 from PIL import Image, ImageTk
 import webbrowser
 import os
+import queue
+import threading
 from datetime import datetime
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+import session_snapshot
+from bitmap_index import BitmapIndex
+from sketches import ProductSketch, DistributionSketches
+from data_validation import validate_dataset, format_report
+from rollup import Rollup
+from abc_analysis import DateRangeTotals, classify_abc, summarize_abc
+from forecasting import forecast_groups, forecast_total, FORECAST_HORIZON
+from file_readers import choose_reader, supported_extensions
+from memory_budget import MemoryBudget, exact_sum, MB
+from period_comparison import compare_periods, monthly_growth
+from group_index import GroupIndexCache, totals_by, daily_totals
+from live_feed import LiveFeed, LiveTotals, DEFAULT_FEED_ADDRESS
 
-class PaintAnalyticsApp:
+NUMERIC_COLUMNS = ['Qty', 'CP incl VAT', 'SP incl VAT', 'Cost of Sale', 
+                   'Discounts', 'Net Sales', 'Nt. Sl. Ls Vt']
+
+# Number of products listed in the product views
+TOP_N_PRODUCTS = 10
+
+# Rows fed to the streaming product sketch per batch
+SKETCH_BATCH_ROWS = 100_000
+
+# Products drawn as bars on the Pareto chart (the cumulative line covers all)
+PARETO_MAX_BARS = 200
+
+# Percentiles shown in the distribution view
+DISTRIBUTION_QUANTILES = [0.1, 0.25, 0.5, 0.75, 0.9]
+
+# Live feed: how often queued batches are applied, and the trend chart rewritten
+LIVE_POLL_MS = 100
+LIVE_CHART_SECONDS = 5
+
+# Header filters and the column name fragments used to find them
+FILTER_DIMENSIONS = {
+    'Store': ('store', 'branch', 'location'),
+    'Brand': ('brand',),
+    'Department': ('department',),
+    'Category': ('category',)
+}
+
+class AnalyticsEngine:
+    """Data loading and analysis shared by the dashboard and the analytics server."""
+
+    def parse_date(self, date_series):
+        """Try multiple date formats to parse the date column."""
+        date_formats = [
+            # ISO format
+            '%Y-%m-%d',
+            # British format
+            '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y',
+            # American format
+            '%m/%d/%Y', '%m-%d-%Y', '%m.%d.%Y',
+            # Month name formats
+            '%d-%b-%Y', '%d %b %Y', '%d-%B-%Y', '%d %B %Y',
+            '%b-%d-%Y', '%b %d %Y', '%B-%d-%Y', '%B %d %Y',
+            # Two digit years
+            '%d/%m/%y', '%m/%d/%y',
+            # With time
+            '%Y-%m-%d %H:%M:%S', '%d/%m/%Y %H:%M:%S', '%m/%d/%Y %H:%M:%S'
+        ]
+
+        # First try pandas default parsing
+        try:
+            return pd.to_datetime(date_series, errors='raise')
+        except:
+            pass
+
+        # Try each format
+        for date_format in date_formats:
+            try:
+                return pd.to_datetime(date_series, format=date_format, errors='raise')
+            except:
+                continue
+
+        # If no format works, try a more flexible parser
+        try:
+            return pd.to_datetime(date_series, format='mixed', errors='raise')
+        except Exception as e:
+            raise ValueError(f"Could not parse dates. Please ensure dates are in a standard format. Error: {str(e)}")
+
+    def read_dataset(self, file_path, reader=None, memory=None):
+        """Read a spreadsheet, CSV or Parquet file, convert its numeric columns and validate it.
+
+        The fastest installed reader for the file type is used unless a
+        reader name is given. The data is fitted to memory (self.memory
+        unless another MemoryBudget is given). Returns the cleaned DataFrame
+        and its data quality report.
+        """
+        backend = choose_reader(file_path, reader)
+        memory = memory or self.memory
+        memory.reset()
+
+        try:
+            # First try reading with no data conversion
+            print(f"Loading file with the {backend.name} reader (initial read)...")
+            with memory.stage('read'):
+                df = backend.read(file_path)
+            
+            print("\nInitial data read successful")
+            print(f"Shape: {df.shape}")
+            print("\nColumns found:", df.columns.tolist())
+            
+            # Show sample of raw data
+            print("\nFirst few rows of raw data:")
+            print(df.head())
+            
+            with memory.stage('clean'):
+                # Now try to convert numeric columns, in place: only the
+                # column being converted is held twice
+                print("\nAttempting numeric conversion...")
+                unparseable = {}
+            
+                for col in NUMERIC_COLUMNS:
+                    if col in df.columns:
+                        print(f"\nProcessing column: {col}")
+                        print("Original values (first 5):", df[col].head().tolist())
+                        print("Data type:", df[col].dtype)
+                        original = df[col]
+                    
+                        try:
+                            # Try direct numeric conversion first
+                            df[col] = pd.to_numeric(df[col], errors='coerce')
+                            print("Converted values:", df[col].head().tolist())
+                            print(f"Sum: {df[col].sum()}")
+                        except Exception as conv_err:
+                            print(f"Direct conversion failed: {str(conv_err)}")
+                        
+                            # Try cleaning and converting
+                            try:
+                                # Convert to string and clean
+                                cleaned = df[col].astype(str)
+                                cleaned = cleaned.str.replace('£', '', regex=False)
+                                cleaned = cleaned.str.replace('$', '', regex=False)
+                                cleaned = cleaned.str.replace(',', '', regex=False)
+                                cleaned = cleaned.str.replace(' ', '', regex=False)
+                                cleaned = cleaned.str.strip()
+                            
+                                print("Cleaned values:", cleaned.head().tolist())
+                            
+                                # Convert to numeric
+                                df[col] = pd.to_numeric(cleaned, errors='coerce')
+                                print("Final converted values:", df[col].head().tolist())
+                                print(f"Sum: {df[col].sum()}")
+                            except Exception as clean_err:
+                                print(f"Cleaning conversion failed: {str(clean_err)}")
+                    
+                        # Values present in the file that did not convert
+                        unparseable[col] = (original.notna() & df[col].isna()).to_numpy()
+                    else:
+                        print(f"Warning: Column {col} not found")
+            
+                # Parse the date column once so validation and filtering can use it
+                date_col = next((col for col in df.columns if str(col).lower().strip() == 'date'), None)
+                if date_col is not None:
+                    try:
+                        df[date_col] = self.parse_date(df[date_col])
+                    except ValueError as date_err:
+                        print(f"Date parsing failed: {str(date_err)}")
+                        date_col = None
+            
+            # Show final data info
+            print("\nFinal DataFrame Info:")
+            print(df.info())
+            
+            with memory.stage('validate'):
+                report = validate_dataset(df, unparseable, date_col)
+                print("\n" + format_report(report))
+            
+            # Downcast, and spill to disk if needed, to fit the memory budget
+            with memory.stage('fit'):
+                df = memory.fit(df, self.analysed_columns(df))
+            return df, report
+            
+        except Exception as load_err:
+            print(f"File load error: {str(load_err)}")
+            raise ValueError(f"Could not read file. Error: {str(load_err)}")
+
+    def calculate_financial_metrics(self, df):
+        """Calculate key financial metrics."""
+        try:
+            print("\nCalculating financial metrics...")
+            print("\nOriginal DataFrame Info:")
+            print(df.info())
+            
+            # Cleaned copies of the three columns used; df itself is not copied or modified
+            work_df = {}
+            
+            # Define column mappings
+            qty_col = 'Qty'
+            revenue_col = 'Net Sales'
+            cost_col = 'Cost of Sale'
+            
+            # Print raw data samples
+            print("\nRaw data samples:")
+            for col in [qty_col, revenue_col, cost_col]:
+                if col in df.columns:
+                    print(f"\n{col}:")
+                    print("First 5 values:", df[col].head().tolist())
+                    print("Data type:", df[col].dtype)
+            
+            # Clean numeric data
+            def clean_numeric_column(df, col_name):
+                if col_name not in df.columns:
+                    print(f"Warning: Column {col_name} not found")
+                    raise KeyError(col_name)
+                
+                # Already converted by read_dataset
+                if pd.api.types.is_numeric_dtype(df[col_name]):
+                    return df[col_name]
+                
+                print(f"\nCleaning {col_name}:")
+                try:
+                    print("Original values:", df[col_name].head().tolist())
+                    values = self.clean_numeric_values(df[col_name])
+                    print("After numeric conversion:", values.head().tolist())
+                    print("Sum:", values.sum())
+                    print("Non-null count:", values.count())
+                    return values
+                    
+                except Exception as e:
+                    print(f"Error cleaning {col_name}: {str(e)}")
+                    raise
+            
+            # Clean all numeric columns
+            for col in [qty_col, revenue_col, cost_col]:
+                work_df[col] = clean_numeric_column(df, col)
+            
+            # Calculate totals
+            total_quantity = exact_sum(work_df[qty_col])
+            total_revenue = exact_sum(work_df[revenue_col])
+            total_cost = exact_sum(work_df[cost_col])
+            
+            print("\nCalculated totals:")
+            print(f"Total quantity: {total_quantity}")
+            print(f"Total revenue: {total_revenue}")
+            print(f"Total cost: {total_cost}")
+            
+            if total_quantity == 0 or total_revenue == 0 or total_cost == 0:
+                error_msg = "One or more totals are zero. Details:\n"
+                error_msg += f"Quantity total: {total_quantity}\n"
+                error_msg += f"Revenue total: {total_revenue}\n"
+                error_msg += f"Cost total: {total_cost}\n\n"
+                
+                error_msg += "Column details:\n"
+                for col in [qty_col, revenue_col, cost_col]:
+                    if col in work_df:
+                        error_msg += f"\n{col}:\n"
+                        error_msg += f"  Type: {work_df[col].dtype}\n"
+                        error_msg += f"  Non-null count: {work_df[col].count()}\n"
+                        error_msg += f"  Sample values (first 5): {work_df[col].head().tolist()}\n"
+                        error_msg += f"  Sum: {exact_sum(work_df[col])}\n"
+                
+                raise ValueError(error_msg)
+            
+            # Calculate metrics
+            total_profit = total_revenue - total_cost
+            profit_margin = (total_profit / total_revenue * 100) if total_revenue > 0 else 0
+            markup = ((total_revenue - total_cost) / total_cost * 100) if total_cost > 0 else 0
+            avg_profit_per_unit = total_profit / total_quantity if total_quantity > 0 else 0
+            
+            metrics = {
+                'Total Revenue': total_revenue,
+                'Total Cost': total_cost,
+                'Total Profit': total_profit,
+                'Total Units Sold': total_quantity,
+                'Profit Margin (%)': profit_margin,
+                'Average Profit per Unit': avg_profit_per_unit,
+                'Markup (%)': markup
+            }
+            
+            print("\nFinal metrics:")
+            for key, value in metrics.items():
+                print(f"{key}: {value}")
+            
+            return metrics
+            
+        except Exception as e:
+            print(f"\nError in calculate_financial_metrics: {str(e)}")
+            raise ValueError(f"Failed to calculate metrics: {str(e)}")
+
+    def clean_numeric_values(self, values):
+        """Convert text amounts to numbers, removing currency symbols, commas and spaces first."""
+        values = values.astype(str)
+        for symbol in ['£', '$', ',', ' ']:
+            values = values.str.replace(symbol, '', regex=False)
+        return pd.to_numeric(values.str.strip(), errors='coerce')
+
+    def clean_feed_batch(self, df):
+        """Type a batch of live feed records with the same rules as loaded files.
+
+        Numeric columns go through clean_numeric_values and the date column
+        through parse_date; records whose date does not parse are dropped.
+        """
+        for col in NUMERIC_COLUMNS:
+            if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = self.clean_numeric_values(df[col])
+        date_col = next((col for col in df.columns if str(col).lower().strip() == 'date'), None)
+        if date_col is not None:
+            try:
+                df[date_col] = self.parse_date(df[date_col])
+            except ValueError:
+                df[date_col] = pd.to_datetime(df[date_col], errors='coerce', format='mixed')
+            df = df[df[date_col].notna()]
+        return df
+
+    def format_currency(self, value):
+        """Format number as currency."""
+        return f"${value:,.2f}"
+
+    def format_percent(self, value):
+        """Format number as percentage."""
+        return f"{value:.1f}%"
+
+    def format_change(self, value):
+        """Format a growth percentage with its sign; n/a when there is nothing to compare with."""
+        return "n/a" if pd.isna(value) else f"{value:+.1f}%"
+
+    def calculate_monthly_trend(self, df, rollup=None):
+        """Aggregate revenue, cost and profit by month."""
+        if rollup is not None and 'Month' in rollup.dimensions:
+            monthly = rollup.grouping_set(['Month'])[['Month', 'Net Sales', 'Cost of Sale']].sort_values('Month')
+        else:
+            # Convert date and group by month
+            months = pd.to_datetime(df['Date']).dt.to_period('M').rename('Month')
+            monthly = df.groupby(months).agg({
+                'Net Sales': 'sum',
+                'Cost of Sale': 'sum'
+            }).reset_index()
+        
+        # Calculate profit
+        monthly['Profit'] = monthly['Net Sales'] - monthly['Cost of Sale']
+        monthly['Month'] = monthly['Month'].astype(str)
+        return monthly
+
+    def find_product_columns(self, df):
+        """Find the product, department, quantity and revenue columns (case-insensitive)."""
+        return {
+            'product': next((col for col in df.columns if 'product description' in col.lower().strip()), None),
+            'department': next((col for col in df.columns if 'department' in col.lower().strip()), None),
+            'quantity': next((col for col in df.columns if col.lower().strip() == 'qty'), None),
+            'revenue': next((col for col in df.columns if col.lower().strip() in ['net sales', 'nt. sl. ls vt']), None)
+        }
+
+    def analysed_columns(self, df):
+        """Columns the analyses read; the memory budget spills the others first."""
+        columns = [col for col in self.find_product_columns(df).values() if col is not None]
+        columns += list(self.find_filter_columns(df).values())
+        columns += [col for col in df.columns
+                    if str(col).lower().strip() in ['date', 'color', 'colour', 'net sales', 'cost of sale']]
+        return set(columns)
+
+    def build_rollup(self, df):
+        """Aggregate the measures over all report dimensions in one pass.
+
+        Dimensions are product, department, brand, color, store, category and
+        month; the product, department and trend views read their grouping
+        sets from the result.
+        """
+        columns = self.find_product_columns(df)
+        dimensions = {}
+        for col in [columns['product'], columns['department']]:
+            if col is not None:
+                dimensions[col] = df[col]
+        for col in self.find_filter_columns(df).values():
+            dimensions.setdefault(col, df[col])
+        color_col = next((col for col in df.columns if str(col).lower().strip() in ['color', 'colour']), None)
+        if color_col is not None:
+            dimensions[color_col] = df[color_col]
+        if 'Date' in df.columns:
+            dimensions['Month'] = pd.to_datetime(df['Date']).dt.to_period('M')
+        
+        measures = {}
+        for col in [columns['quantity'], columns['revenue'], 'Net Sales', 'Cost of Sale']:
+            if col is not None and col in df.columns:
+                measures[col] = df[col]
+        if not dimensions or not measures:
+            return None
+        return Rollup(dimensions, measures)
+
+    def calculate_product_tables(self, df, top_n=None, rollup=None):
+        """Aggregate quantity and revenue by product and by department.
+
+        With top_n, only the top_n products by revenue are returned. With a
+        rollup built from df, the tables are read from its grouping sets.
+        """
+        required_columns = self.find_product_columns(df)
+        
+        # Check for missing columns
+        missing = [name for name, col in required_columns.items() if col is None]
+        if missing:
+            raise ValueError(f"Missing columns for product analysis: {', '.join(missing)}")
+        
+        value_columns = [required_columns['quantity'], required_columns['revenue']]
+        
+        # Group by product and calculate metrics
+        if rollup is not None:
+            product_metrics = rollup.grouping_set([required_columns['product']])[
+                [required_columns['product']] + value_columns]
+        else:
+            product_metrics = df.groupby(required_columns['product'], sort=False, observed=True).agg({
+                required_columns['quantity']: 'sum',
+                required_columns['revenue']: 'sum'
+            }).reset_index()
+        
+        # Sort by revenue; for a top-N view only the leaders need ordering
+        if top_n:
+            product_metrics = product_metrics.nlargest(top_n, required_columns['revenue'])
+        else:
+            product_metrics = product_metrics.sort_values(by=required_columns['revenue'], ascending=False)
+        
+        # Department Analysis
+        dept_metrics = self.calculate_department_table(df, required_columns, rollup=rollup)
+        
+        return product_metrics, dept_metrics, required_columns
+
+    def calculate_department_table(self, df, required_columns, rollup=None):
+        """Aggregate quantity and revenue by department; None without a department column."""
+        if not required_columns['department']:
+            return None
+        
+        value_columns = [required_columns['quantity'], required_columns['revenue']]
+        if rollup is not None:
+            dept_metrics = rollup.grouping_set([required_columns['department']])[
+                [required_columns['department']] + value_columns]
+        else:
+            dept_metrics = df.groupby(required_columns['department'], observed=True).agg({
+                required_columns['quantity']: 'sum',
+                required_columns['revenue']: 'sum'
+            }).reset_index()
+        
+        return dept_metrics.sort_values(by=required_columns['revenue'], ascending=False)
+
+    def build_product_sketch(self, df):
+        """Stream the dataset through the approximate top-N product sketch."""
+        product_col = next((col for col in df.columns if 'product description' in col.lower().strip()), None)
+        measures = {'Revenue': 'Net Sales', 'Units Sold': 'Qty'}
+        if product_col is None or not all(col in df.columns for col in measures.values()):
+            print("Product sketch skipped: product, Net Sales or Qty column missing")
+            return None
+        
+        sketch = ProductSketch()
+        for start in range(0, len(df), SKETCH_BATCH_ROWS):
+            batch = df.iloc[start:start + SKETCH_BATCH_ROWS]
+            sketch.update(batch[product_col].astype(str).to_numpy(),
+                          {name: batch[col].to_numpy() for name, col in measures.items()})
+        print(f"Product sketch built over {sketch.rows} rows")
+        return sketch
+
+    def distribution_values(self, df):
+        """Per-line measures for the distribution view: value, units, unit price and discount depth."""
+        values = {}
+        for name, col in [('Line Value', 'Net Sales'), ('Units per Line', 'Qty'), ('Unit Price', 'SP incl VAT')]:
+            if col in df.columns:
+                values[name] = df[col].to_numpy(dtype='float64', na_value=np.nan)
+        if 'Discounts' in df.columns and 'Net Sales' in df.columns:
+            # Discount as a share of the pre-discount price; lines without a discount are left out
+            discount = np.abs(df['Discounts'].to_numpy(dtype='float64', na_value=np.nan))
+            gross = df['Net Sales'].to_numpy(dtype='float64', na_value=np.nan) + discount
+            with np.errstate(divide='ignore', invalid='ignore'):
+                values['Discount Depth %'] = np.where((discount > 0) & (gross > 0), discount / gross * 100, np.nan)
+        return values
+
+    def build_distribution_sketches(self, df):
+        """Sketch the dataset's distributions per department, store and month.
+
+        The rows are fed in a single update: the cost is per cell, not per
+        row, so feeding them in batches would only repeat it.
+        """
+        group_col = self.find_product_columns(df)['department']
+        store_col = self.find_filter_columns(df).get('Store')
+        date_col = next((col for col in df.columns if str(col).lower().strip() == 'date'), None)
+        if group_col is not None:
+            # Rows without a department are left out, as in the department table
+            has_group = df[group_col].notna().to_numpy()
+            if not has_group.all():
+                df = df[has_group]
+        
+        sketches = DistributionSketches()
+        constant = np.full(len(df), 'All', dtype=object)
+        # Months as integer codes (months since 1970) so cells hash cheaply
+        months = (np.asarray(pd.to_datetime(df[date_col]), dtype='datetime64[M]').astype('int64')
+                  if date_col is not None else np.zeros(len(df), dtype='int64'))
+        sketches.update(df[group_col].to_numpy() if group_col is not None else constant,
+                        df[store_col].to_numpy() if store_col is not None else constant,
+                        months, self.distribution_values(df))
+        print(f"Distribution sketches built over {sketches.rows} rows in {len(sketches.cells)} cells")
+        return sketches
+
+    def full_month_range(self, dates, start=None, end=None):
+        """First and last month wholly inside start..end, as month codes (None = open).
+
+        A bound at or beyond the first or last of dates is open, so the date
+        range set on load covers every month.
+        """
+        first = last = None
+        if start and pd.Timestamp(start) > dates.min():
+            start = pd.Timestamp(start)
+            first = int(np.datetime64(start.to_datetime64(), 'M').astype('int64')) + (start.day != 1)
+        if end and pd.Timestamp(end) < dates.max():
+            end = pd.Timestamp(end)
+            last = int(np.datetime64(end.to_datetime64(), 'M').astype('int64')) - (not end.is_month_end)
+        return first, last
+
+    def range_distribution_sketches(self, sketches, dates, df, date_col, start=None, end=None):
+        """Distribution sketches of the rows df selected for start..end.
+
+        sketches and dates cover the whole dataset. Whole months are taken
+        from sketches; the rows of df in the partly covered months at either
+        end are sketched directly and added. Returns the sketches and the
+        number of rows sketched directly.
+        """
+        first, last = self.full_month_range(dates, start, end)
+        # Undated rows are only selected when no date range is set (see filter_date_range)
+        undated = np.datetime64('NaT', 'M').astype('int64')
+        dated_only = bool(start or end)
+        full_months = {month for _, _, month in sketches.cells
+                       if (first is None or month >= first) and (last is None or month <= last)
+                       and not (dated_only and month == undated)}
+        result = sketches.subset(full_months)
+        
+        row_months = np.asarray(df[date_col], dtype='datetime64[M]').astype('int64')
+        edge = np.zeros(len(df), dtype=bool)
+        if first is not None:
+            edge |= row_months < first
+        if last is not None:
+            edge |= row_months > last
+        if edge.any():
+            result.cells.update(self.build_distribution_sketches(df[edge]).cells)
+        return result, int(edge.sum())
+
+    def find_filter_columns(self, df):
+        """Map each filter dimension (Store, Brand, ...) to its column in the data."""
+        filter_columns = {}
+        for dimension, fragments in FILTER_DIMENSIONS.items():
+            col = next((col for col in df.columns
+                        if any(fragment in str(col).lower().strip() for fragment in fragments)), None)
+            if col is not None:
+                filter_columns[dimension] = col
+        return filter_columns
+
+    def filter_date_range(self, df, date_col, start_date=None, end_date=None):
+        """Boolean row mask for start_date <= date <= end_date (either bound optional)."""
+        mask = np.ones(len(df), dtype=bool)
+        if start_date:
+            mask &= (df[date_col] >= pd.to_datetime(start_date)).to_numpy()
+        if end_date:
+            mask &= (df[date_col] <= pd.to_datetime(end_date)).to_numpy()
+        return mask
+
+class PaintAnalyticsApp(AnalyticsEngine):
     def __init__(self, root):
         self.root = root
         self.root.title("Paint Retail Analytics Dashboard")
@@ -30,11 +582,18 @@ class PaintAnalyticsApp:
                            font=('Helvetica', 14, 'bold'),
                            background='white',
                            padding=5)
+        self.style.configure('Dashboard.TLabel',
+                           background='#f0f2f5',
+                           foreground='#5f6368',
+                           font=('Helvetica', 9))
         self.style.configure('Metric.TLabel',
                            font=('Helvetica', 20, 'bold'),
                            background='white',
                            padding=5)
         
+        # Memory budget for the loaded data; see memory_budget.py
+        self.memory = MemoryBudget()
+        
         # Create main container
         self.main_container = ttk.Frame(root, style='Dashboard.TFrame')
         self.main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -47,6 +606,32 @@ class PaintAnalyticsApp:
         
         # Initialize data
         self.df = None
+        self.file_path = None
+        self.validation_report = None
+        self.filter_index = None
+        self.product_sketch = None
+        self.distribution_sketches = None
+        self.analysis_df = None
+        self.rollup = None
+        self.abc_totals = None
+        self.abc_key = None
+        self.filter_columns = {}
+        self.last_results = {}
+        self.background_results = queue.Queue()
+        
+        # Live feed batches, cleaned on the feed threads and applied on the Tk thread
+        self.live_feed = None
+        self.live_batches = queue.Queue()
+        
+        # Drill-down group indexes, cached until a new dataset is loaded
+        self.dataset_version = 0
+        self.group_indexes = GroupIndexCache()
+        self.selection_mask = None
+        self.link_count = 0
+        
+        # Save a session snapshot on exit and restore the previous one now
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.restore_snapshot()
         
     def create_header(self):
         """Create the dashboard header with controls."""
@@ -67,6 +652,13 @@ class PaintAnalyticsApp:
                               command=self.load_file)
         upload_btn.pack(side=tk.LEFT, padx=10)
         
+        self.live_button = ttk.Button(left_header,
+                                      text=" Live Feed",
+                                      command=self.toggle_live_feed)
+        self.live_button.pack(side=tk.LEFT, padx=5)
+        self.live_status = ttk.Label(left_header, text="", style='Dashboard.TLabel')
+        self.live_status.pack(side=tk.LEFT, padx=5)
+        
         # Right side - Analysis Controls
         right_header = ttk.Frame(header, style='Dashboard.TFrame')
         right_header.pack(side=tk.RIGHT)
@@ -82,6 +674,22 @@ class PaintAnalyticsApp:
         self.end_date = ttk.Entry(date_frame, width=10)
         self.end_date.pack(side=tk.LEFT, padx=5)
         
+        # Dimension filters (populated when data is loaded)
+        filter_frame = ttk.Frame(right_header, style='Dashboard.TFrame')
+        filter_frame.pack(side=tk.LEFT, padx=10)
+        
+        self.filter_buttons = {}
+        self.filter_menus = {}
+        self.filter_vars = {}
+        for dimension in FILTER_DIMENSIONS:
+            button = ttk.Menubutton(filter_frame, text=f"{dimension}: All")
+            menu = tk.Menu(button, tearoff=False)
+            button['menu'] = menu
+            button.pack(side=tk.LEFT, padx=2)
+            self.filter_buttons[dimension] = button
+            self.filter_menus[dimension] = menu
+            self.filter_vars[dimension] = {}
+        
         # Analysis Type
         analysis_frame = ttk.Frame(right_header, style='Dashboard.TFrame')
         analysis_frame.pack(side=tk.LEFT, padx=10)
@@ -95,6 +703,18 @@ class PaintAnalyticsApp:
                                      command=self.refresh_analysis)
         analysis_menu.pack(side=tk.LEFT, padx=5)
         
+        self.approx_top_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(analysis_frame,
+                        text="Approx. Top-N",
+                        variable=self.approx_top_var,
+                        command=self.refresh_analysis).pack(side=tk.LEFT, padx=5)
+        
+        self.compare_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(analysis_frame,
+                        text="Compare periods",
+                        variable=self.compare_var,
+                        command=self.refresh_analysis).pack(side=tk.LEFT, padx=5)
+        
         # Refresh button
         refresh_btn = ttk.Button(right_header,
                                text=" Refresh",
@@ -103,6 +723,11 @@ class PaintAnalyticsApp:
         
     def create_dashboard_layout(self):
         """Create the main dashboard layout."""
+        # Memory status line, packed first so the panels cannot push it off screen
+        self.memory_label = ttk.Label(self.main_container, text="Memory: no data loaded",
+                                      style='Dashboard.TLabel')
+        self.memory_label.pack(side=tk.BOTTOM, fill=tk.X, pady=(10, 0))
+        
         # Create left and right panels
         self.left_panel = ttk.Frame(self.main_container, style='Dashboard.TFrame')
         self.left_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
@@ -190,41 +815,85 @@ class PaintAnalyticsApp:
             self.metric_cards["Total Revenue"].config(text=self.format_currency(metrics['Total Revenue']))
             self.metric_cards["Total Profit"].config(text=self.format_currency(metrics['Total Profit']))
             self.metric_cards["Units Sold"].config(text=f"{int(metrics['Total Units Sold']):,}")
-            self.metric_cards["Profit Margin"].config(text=self.format_percent(metrics['Profit Margin %']))
+            self.metric_cards["Profit Margin"].config(text=self.format_percent(metrics['Profit Margin (%)']))
+    
+    def update_memory_status(self):
+        """Show the peak memory of the last load and analysis stages."""
+        stages = ", ".join(f"{name} {usage['peak'] / MB:,.0f} MB"
+                           for name, usage in self.memory.stages.items())
+        text = f"Memory (budget {self.memory.budget / MB:,.0f} MB) - peak per stage: {stages or 'n/a'}"
+        if self.memory.spilled:
+            text += f" - {sum(self.memory.spilled.values()) / MB:,.0f} MB of data spilled to disk"
+        if self.memory.over_budget():
+            text += " - OVER BUDGET"
+            print(f"Warning: memory use is over the {self.memory.budget / MB:,.0f} MB budget")
+        self.memory_label.config(text=text)
     
     def create_trend_chart(self, df):
         """Create and display trend chart."""
         if 'Date' not in df.columns:
             return
             
-        # Convert date and group by month
-        df['Month'] = pd.to_datetime(df['Date']).dt.to_period('M')
-        monthly = df.groupby('Month').agg({
-            'Net Sales': 'sum',
-            'Cost of Sale': 'sum'
-        }).reset_index()
-        
-        # Calculate profit
-        monthly['Profit'] = monthly['Net Sales'] - monthly['Cost of Sale']
-        
+        monthly = self.calculate_monthly_trend(df, rollup=self.rollup)
+        self.last_results['monthly'] = monthly
+        self.render_trend_chart(monthly, forecast=self.last_results.get('forecast'),
+                                growth=self.last_results.get('growth'))
+
+    def render_trend_chart(self, monthly, open_browser=True, forecast=None, growth=None):
+        """Plot monthly revenue and profit to trend_chart.html.
+
+        Optionally adds the revenue forecast band and, on a second axis, the
+        month-on-month and year-on-year revenue growth.
+        """
         # Create figure
         fig = go.Figure()
         
         # Add traces
         fig.add_trace(go.Scatter(
-            x=monthly['Month'].astype(str),
+            x=monthly['Month'],
             y=monthly['Net Sales'],
             name='Revenue',
             line=dict(color='#4285f4', width=2)
         ))
         
         fig.add_trace(go.Scatter(
-            x=monthly['Month'].astype(str),
+            x=monthly['Month'],
             y=monthly['Profit'],
             name='Profit',
             line=dict(color='#34a853', width=2)
         ))
         
+        if forecast is not None:
+            # Band first so the forecast line is drawn over it
+            fig.add_trace(go.Scatter(
+                x=list(forecast['Month']) + list(forecast['Month'])[::-1],
+                y=list(forecast['Upper']) + list(forecast['Lower'])[::-1],
+                fill='toself',
+                fillcolor='rgba(66, 133, 244, 0.15)',
+                line=dict(width=0),
+                name='Forecast range (80%)',
+                hoverinfo='skip'
+            ))
+            fig.add_trace(go.Scatter(
+                x=[monthly['Month'].iloc[-1]] + list(forecast['Month']),
+                y=[monthly['Net Sales'].iloc[-1]] + list(forecast['Forecast']),
+                name='Revenue forecast',
+                line=dict(color='#4285f4', width=2, dash='dash')
+            ))
+        
+        if growth is not None:
+            shown = growth[growth['Month'].isin(set(monthly['Month']))]
+            for col, color in [('MoM %', '#fbbc05'), ('YoY %', '#ea4335')]:
+                fig.add_trace(go.Scatter(
+                    x=shown['Month'],
+                    y=shown[col],
+                    name=f"Revenue {col.replace(' %', '')} growth (%)",
+                    yaxis='y2',
+                    line=dict(color=color, width=1, dash='dot')
+                ))
+            fig.update_layout(yaxis2=dict(title='Growth (%)', overlaying='y', side='right',
+                                          showgrid=False, zeroline=True))
+        
         # Update layout
         fig.update_layout(
             title='Monthly Revenue and Profit Trends',
@@ -237,82 +906,32 @@ class PaintAnalyticsApp:
         
         # Save and display
         fig.write_html("trend_chart.html")
-        webbrowser.open("trend_chart.html")
+        if open_browser:
+            webbrowser.open("trend_chart.html")
         
     def load_file(self):
         try:
             file_path = filedialog.askopenfilename(
-                filetypes=[("Excel files", "*.xlsx;*.xls"), ("CSV files", "*.csv")]
+                filetypes=[("Sales data", " ".join(f"*{ext}" for ext in supported_extensions())),
+                           ("Excel files", "*.xlsx *.xls"), ("CSV files", "*.csv"),
+                           ("Parquet files", "*.parquet")]
             )
             
             if file_path:
                 print(f"\nAttempting to load file: {file_path}")
-                
-                if file_path.lower().endswith(('.xlsx', '.xls')):
-                    try:
-                        # First try reading with no data conversion
-                        print("Loading Excel file (initial read)...")
-                        raw_df = pd.read_excel(file_path, engine='openpyxl')
-                        
-                        print("\nInitial data read successful")
-                        print(f"Shape: {raw_df.shape}")
-                        print("\nColumns found:", raw_df.columns.tolist())
-                        
-                        # Show sample of raw data
-                        print("\nFirst few rows of raw data:")
-                        print(raw_df.head())
-                        
-                        # Now try to convert numeric columns
-                        print("\nAttempting numeric conversion...")
-                        self.df = raw_df.copy()
-                        
-                        numeric_cols = ['Qty', 'CP incl VAT', 'SP incl VAT', 'Cost of Sale', 
-                                      'Discounts', 'Net Sales', 'Nt. Sl. Ls Vt']
-                        
-                        for col in numeric_cols:
-                            if col in self.df.columns:
-                                print(f"\nProcessing column: {col}")
-                                print("Original values (first 5):", self.df[col].head().tolist())
-                                print("Data type:", self.df[col].dtype)
-                                
-                                try:
-                                    # Try direct numeric conversion first
-                                    self.df[col] = pd.to_numeric(self.df[col], errors='coerce')
-                                    print("Converted values:", self.df[col].head().tolist())
-                                    print(f"Sum: {self.df[col].sum()}")
-                                except Exception as conv_err:
-                                    print(f"Direct conversion failed: {str(conv_err)}")
-                                    
-                                    # Try cleaning and converting
-                                    try:
-                                        # Convert to string and clean
-                                        cleaned = self.df[col].astype(str)
-                                        cleaned = cleaned.str.replace('£', '', regex=False)
-                                        cleaned = cleaned.str.replace('$', '', regex=False)
-                                        cleaned = cleaned.str.replace(',', '', regex=False)
-                                        cleaned = cleaned.str.replace(' ', '', regex=False)
-                                        cleaned = cleaned.str.strip()
-                                        
-                                        print("Cleaned values:", cleaned.head().tolist())
-                                        
-                                        # Convert to numeric
-                                        self.df[col] = pd.to_numeric(cleaned, errors='coerce')
-                                        print("Final converted values:", self.df[col].head().tolist())
-                                        print(f"Sum: {self.df[col].sum()}")
-                                    except Exception as clean_err:
-                                        print(f"Cleaning conversion failed: {str(clean_err)}")
-                            else:
-                                print(f"Warning: Column {col} not found")
-                        
-                        # Show final data info
-                        print("\nFinal DataFrame Info:")
-                        print(self.df.info())
-                        
-                    except Exception as excel_err:
-                        print(f"Excel load error: {str(excel_err)}")
-                        raise ValueError(f"Could not read Excel file. Error: {str(excel_err)}")
-                else:
-                    raise ValueError("Please use an Excel file (.xlsx or .xls)")
+                self.df, self.validation_report = self.read_dataset(file_path)
+                self.dataset_version += 1
+                self.file_path = file_path
+                with self.memory.stage('index'):
+                    self.build_filter_index()
+                    
+                    # Streaming top-N sketch, built during ingestion when enabled
+                    self.product_sketch = None
+                    if self.approx_top_var.get():
+                        self.product_sketch = self.build_product_sketch(self.df)
+                    
+                    # Quantile sketches for the distribution view
+                    self.distribution_sketches = self.build_distribution_sketches(self.df)
                 
                 # Clear previous results
                 self.result_text.delete(1.0, tk.END)
@@ -321,6 +940,8 @@ class PaintAnalyticsApp:
                 self.result_text.insert(tk.END, "Data Preview\n")
                 self.result_text.insert(tk.END, "=" * 50 + "\n\n")
                 self.result_text.insert(tk.END, f"Loaded {len(self.df)} rows and {len(self.df.columns)} columns\n\n")
+                self.result_text.insert(tk.END, format_report(self.validation_report) + "\n")
+                self.result_text.insert(tk.END, self.memory.summary() + "\n\n")
                 self.result_text.insert(tk.END, "Column Details:\n\n")
                 
                 for col in self.df.columns:
@@ -329,8 +950,8 @@ class PaintAnalyticsApp:
                     self.result_text.insert(tk.END, f"  Non-null values: {self.df[col].count()}\n")
                     self.result_text.insert(tk.END, f"  Null values: {self.df[col].isna().sum()}\n")
                     
-                    if col in numeric_cols:
-                        self.result_text.insert(tk.END, f"  Sum: {self.df[col].sum()}\n")
+                    if col in NUMERIC_COLUMNS:
+                        self.result_text.insert(tk.END, f"  Sum: {exact_sum(self.df[col])}\n")
                         
                     sample_vals = self.df[col].head(3).tolist()
                     self.result_text.insert(tk.END, f"  Sample values: {sample_vals}\n\n")
@@ -370,18 +991,29 @@ class PaintAnalyticsApp:
                 raise ValueError("Please load a data file first")
             
             print("\nRunning analysis...")
+            self.last_results = {}
             
-            # Filter data by date if needed
-            filtered_df = self.filter_data_by_date()
-            
-            # Get selected analysis type
-            analysis_type = self.analysis_var.get()
+            # Release the previous selection before making the new one
+            self.analysis_df = None
+            self.rollup = None
             
-            # Run the analysis
-            self.analyze_data(filtered_df, analysis_type)
+            with self.memory.stage('analysis'):
+                # Filter data by date if needed
+                filtered_df = self.filter_data_by_date()
+                
+                # Aggregated on first use, then shared by the views of this run
+                self.analysis_df = filtered_df
+                
+                # Get selected analysis type
+                analysis_type = self.analysis_var.get()
+                
+                # Run the analysis
+                self.analyze_data(filtered_df, analysis_type)
             
             # Create and show trend chart
-            self.create_trend_chart(filtered_df)
+            with self.memory.stage('charts'):
+                self.create_trend_chart(filtered_df)
+            self.update_memory_status()
             
         except Exception as e:
             error_msg = f"Analysis failed: {str(e)}"
@@ -394,43 +1026,6 @@ class PaintAnalyticsApp:
                     self.result_text.insert(tk.END, f"- {col}\n")
             messagebox.showerror("Error", error_msg)
             
-    def parse_date(self, date_series):
-        """Try multiple date formats to parse the date column."""
-        date_formats = [
-            # ISO format
-            '%Y-%m-%d',
-            # British format
-            '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y',
-            # American format
-            '%m/%d/%Y', '%m-%d-%Y', '%m.%d.%Y',
-            # Month name formats
-            '%d-%b-%Y', '%d %b %Y', '%d-%B-%Y', '%d %B %Y',
-            '%b-%d-%Y', '%b %d %Y', '%B-%d-%Y', '%B %d %Y',
-            # Two digit years
-            '%d/%m/%y', '%m/%d/%y',
-            # With time
-            '%Y-%m-%d %H:%M:%S', '%d/%m/%Y %H:%M:%S', '%m/%d/%Y %H:%M:%S'
-        ]
-
-        # First try pandas default parsing
-        try:
-            return pd.to_datetime(date_series, errors='raise')
-        except:
-            pass
-
-        # Try each format
-        for date_format in date_formats:
-            try:
-                return pd.to_datetime(date_series, format=date_format, errors='raise')
-            except:
-                continue
-
-        # If no format works, try a more flexible parser
-        try:
-            return pd.to_datetime(date_series, format='mixed', errors='raise')
-        except Exception as e:
-            raise ValueError(f"Could not parse dates. Please ensure dates are in a standard format. Error: {str(e)}")
-
     def filter_data_by_date(self):
         # Print columns for debugging
         print("Available columns:", self.df.columns.tolist())
@@ -451,148 +1046,98 @@ class PaintAnalyticsApp:
                 except:
                     continue
         
+        # Store/brand/department/category selection from the bitmap index
+        dim_mask = self.dimension_mask()
+        unfiltered = self.df if dim_mask is None else self.df[dim_mask]
+        # Selected rows of self.df for drill-down; None selects all
+        self.selection_mask = dim_mask
+        
         if not date_columns:
             messagebox.showwarning("Warning", 
                 f"Date column not found. Available columns: {', '.join(self.df.columns)}")
-            return self.df
+            return unfiltered
             
         date_col = date_columns[0]
         print(f"Using column '{date_col}' as date column")
         
         try:
-            # Convert dates using flexible parser
-            self.df[date_col] = self.parse_date(self.df[date_col])
+            # Convert dates using flexible parser (read_dataset has normally done this already)
+            if not pd.api.types.is_datetime64_any_dtype(self.df[date_col]):
+                self.df[date_col] = self.parse_date(self.df[date_col])
             date_filter = self.start_date.get() + " to " + self.end_date.get()
             
             if date_filter == "  to ":
-                return self.df
+                return unfiltered
             
-            start_date = pd.to_datetime(self.start_date.get())
-            end_date = pd.to_datetime(self.end_date.get())
-                
-            return self.df[(self.df[date_col] >= start_date) & (self.df[date_col] <= end_date)]
+            mask = self.filter_date_range(self.df, date_col, self.start_date.get(), self.end_date.get())
+            if dim_mask is not None:
+                mask &= dim_mask
+            # No copy when nothing is filtered out
+            if mask.all():
+                self.selection_mask = None
+                return self.df
+            self.selection_mask = np.asarray(mask)
+            return self.df[mask]
         except Exception as e:
             messagebox.showerror("Error", 
                 f"Error processing date column '{date_col}': {str(e)}\n"
                 f"Sample values: {', '.join(map(str, self.df[date_col].head().tolist()))}")
-            return self.df
+            return unfiltered
         
-    def calculate_financial_metrics(self, df):
-        """Calculate key financial metrics."""
-        try:
-            print("\nCalculating financial metrics...")
-            print("\nOriginal DataFrame Info:")
-            print(df.info())
-            
-            # First, make a copy to avoid modifying original
-            work_df = df.copy()
-            
-            # Define column mappings
-            qty_col = 'Qty'
-            revenue_col = 'Net Sales'
-            cost_col = 'Cost of Sale'
-            
-            # Print raw data samples
-            print("\nRaw data samples:")
-            for col in [qty_col, revenue_col, cost_col]:
-                if col in work_df.columns:
-                    print(f"\n{col}:")
-                    print("First 5 values:", work_df[col].head().tolist())
-                    print("Data type:", work_df[col].dtype)
-            
-            # Clean numeric data
-            def clean_numeric_column(df, col_name):
-                if col_name not in df.columns:
-                    print(f"Warning: Column {col_name} not found")
-                    return
-                
-                print(f"\nCleaning {col_name}:")
-                try:
-                    # Convert to string first
-                    df[col_name] = df[col_name].astype(str)
-                    print("After string conversion:", df[col_name].head().tolist())
-                    
-                    # Remove any currency symbols, commas, and spaces
-                    df[col_name] = df[col_name].str.replace('£', '', regex=False)
-                    df[col_name] = df[col_name].str.replace('$', '', regex=False)
-                    df[col_name] = df[col_name].str.replace(',', '', regex=False)
-                    df[col_name] = df[col_name].str.strip()
-                    print("After cleaning:", df[col_name].head().tolist())
-                    
-                    # Convert to numeric
-                    df[col_name] = pd.to_numeric(df[col_name], errors='coerce')
-                    print("After numeric conversion:", df[col_name].head().tolist())
-                    print("Sum:", df[col_name].sum())
-                    print("Non-null count:", df[col_name].count())
-                    
-                except Exception as e:
-                    print(f"Error cleaning {col_name}: {str(e)}")
-                    raise
-            
-            # Clean all numeric columns
-            for col in [qty_col, revenue_col, cost_col]:
-                clean_numeric_column(work_df, col)
-            
-            # Calculate totals
-            total_quantity = work_df[qty_col].sum()
-            total_revenue = work_df[revenue_col].sum()
-            total_cost = work_df[cost_col].sum()
-            
-            print("\nCalculated totals:")
-            print(f"Total quantity: {total_quantity}")
-            print(f"Total revenue: {total_revenue}")
-            print(f"Total cost: {total_cost}")
-            
-            if total_quantity == 0 or total_revenue == 0 or total_cost == 0:
-                error_msg = "One or more totals are zero. Details:\n"
-                error_msg += f"Quantity total: {total_quantity}\n"
-                error_msg += f"Revenue total: {total_revenue}\n"
-                error_msg += f"Cost total: {total_cost}\n\n"
-                
-                error_msg += "Column details:\n"
-                for col in [qty_col, revenue_col, cost_col]:
-                    if col in work_df.columns:
-                        error_msg += f"\n{col}:\n"
-                        error_msg += f"  Type: {work_df[col].dtype}\n"
-                        error_msg += f"  Non-null count: {work_df[col].count()}\n"
-                        error_msg += f"  Sample values (first 5): {work_df[col].head().tolist()}\n"
-                        error_msg += f"  Sum: {work_df[col].sum()}\n"
-                
-                raise ValueError(error_msg)
-            
-            # Calculate metrics
-            total_profit = total_revenue - total_cost
-            profit_margin = (total_profit / total_revenue * 100) if total_revenue > 0 else 0
-            markup = ((total_revenue - total_cost) / total_cost * 100) if total_cost > 0 else 0
-            avg_profit_per_unit = total_profit / total_quantity if total_quantity > 0 else 0
-            
-            metrics = {
-                'Total Revenue': total_revenue,
-                'Total Cost': total_cost,
-                'Total Profit': total_profit,
-                'Total Units Sold': total_quantity,
-                'Profit Margin (%)': profit_margin,
-                'Average Profit per Unit': avg_profit_per_unit,
-                'Markup (%)': markup
-            }
-            
-            print("\nFinal metrics:")
-            for key, value in metrics.items():
-                print(f"{key}: {value}")
-            
-            return metrics
-            
-        except Exception as e:
-            print(f"\nError in calculate_financial_metrics: {str(e)}")
-            raise ValueError(f"Failed to calculate metrics: {str(e)}")
+    def build_filter_index(self):
+        """Build bitmap indexes for the filter dimensions and fill the header menus."""
+        self.filter_columns = self.find_filter_columns(self.df)
+        
+        self.filter_index = BitmapIndex(self.df, list(self.filter_columns.values()))
+        print(f"Built filter indexes for: {self.filter_columns}")
+        
+        for dimension, button in self.filter_buttons.items():
+            menu = self.filter_menus[dimension]
+            menu.delete(0, tk.END)
+            self.filter_vars[dimension] = {}
+            col = self.filter_columns.get(dimension)
+            if col is None:
+                button.config(text=f"{dimension}: --", state=tk.DISABLED)
+                continue
+            button.config(text=f"{dimension}: All", state=tk.NORMAL)
+            menu.add_command(label="All", command=lambda d=dimension: self.clear_dimension_filter(d))
+            menu.add_separator()
+            for value in self.filter_index.values(col):
+                var = tk.BooleanVar(value=False)
+                self.filter_vars[dimension][value] = var
+                menu.add_checkbutton(label=str(value), variable=var,
+                                     command=lambda d=dimension: self.on_filter_change(d))
 
-    def format_currency(self, value):
-        """Format number as currency."""
-        return f"${value:,.2f}"
+    def selected_filters(self):
+        """Return {column: [values]} for the ticked filter values."""
+        filters = {}
+        for dimension, values in self.filter_vars.items():
+            chosen = [value for value, var in values.items() if var.get()]
+            if chosen:
+                filters[self.filter_columns[dimension]] = chosen
+        return filters
 
-    def format_percent(self, value):
-        """Format number as percentage."""
-        return f"{value:.1f}%"
+    def dimension_mask(self):
+        """Boolean row mask for the header filters, or None when nothing is selected."""
+        if self.filter_index is None or self.filter_index.n_rows != len(self.df):
+            return None
+        filters = self.selected_filters()
+        if not filters:
+            return None
+        bits = self.filter_index.select(filters)
+        print(f"Filters {filters} match {self.filter_index.count(bits)} rows")
+        return self.filter_index.to_mask(bits)
+
+    def on_filter_change(self, dimension):
+        chosen = [str(value) for value, var in self.filter_vars[dimension].items() if var.get()]
+        label = ", ".join(chosen) if len(chosen) <= 2 else f"{len(chosen)} selected"
+        self.filter_buttons[dimension].config(text=f"{dimension}: {label or 'All'}")
+        self.refresh_analysis()
+
+    def clear_dimension_filter(self, dimension):
+        for var in self.filter_vars[dimension].values():
+            var.set(False)
+        self.on_filter_change(dimension)
 
     def analyze_sales(self, df):
         try:
@@ -652,59 +1197,173 @@ class PaintAnalyticsApp:
             
             messagebox.showerror("Error", "Analysis failed. Check the main window for details.")
 
-    def analyze_products(self, df):
-        try:
-            # Find required columns (case-insensitive)
-            required_columns = {
-                'product': next((col for col in df.columns if 'product description' in col.lower().strip()), None),
-                'department': next((col for col in df.columns if 'department' in col.lower().strip()), None),
-                'quantity': next((col for col in df.columns if col.lower().strip() == 'qty'), None),
-                'revenue': next((col for col in df.columns if col.lower().strip() in ['net sales', 'nt. sl. ls vt']), None)
-            }
-            
-            # Check for missing columns
-            missing = [name for name, col in required_columns.items() if col is None]
-            if missing:
-                raise ValueError(f"Missing columns for product analysis: {', '.join(missing)}")
-            
-            # Group by product and calculate metrics
-            product_metrics = df.groupby(required_columns['product']).agg({
-                required_columns['quantity']: 'sum',
-                required_columns['revenue']: 'sum'
-            }).reset_index()
-            
-            # Sort by revenue
-            product_metrics = product_metrics.sort_values(by=required_columns['revenue'], ascending=False)
-            
-            # Display results
-            self.result_text.delete(1.0, tk.END)
-            self.result_text.insert(tk.END, "Top Products by Revenue\n")
+    def show_product_tables(self, product_metrics, dept_metrics, required_columns):
+        """Display the product and department tables in the details area."""
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, "Top Products by Revenue\n")
+        self.result_text.insert(tk.END, "=" * 50 + "\n\n")
+        
+        # Display top products
+        for _, row in product_metrics.head(TOP_N_PRODUCTS).iterrows():
+            self.result_text.insert(tk.END, f"Product: {row[required_columns['product']]}\n")
+            self.result_text.insert(tk.END, f"Total Revenue: {self.format_currency(row[required_columns['revenue']])}\n")
+            self.result_text.insert(tk.END, f"Units Sold: {int(row[required_columns['quantity']]):,}\n")
+            self.result_text.insert(tk.END, "-" * 50 + "\n")
+        
+        if dept_metrics is not None:
+            self.result_text.insert(tk.END, "\nDepartment Performance\n")
             self.result_text.insert(tk.END, "=" * 50 + "\n\n")
             
-            # Display top 10 products
-            for _, row in product_metrics.head(10).iterrows():
-                self.result_text.insert(tk.END, f"Product: {row[required_columns['product']]}\n")
+            if self.df is not None:
+                self.result_text.insert(tk.END, "Click a department to see its products.\n\n")
+            for _, row in dept_metrics.iterrows():
+                department = row[required_columns['department']]
+                self.result_text.insert(tk.END, "Department: ")
+                if self.df is not None:
+                    self.insert_link(str(department), lambda d=department: self.drill_department(d))
+                else:
+                    self.result_text.insert(tk.END, str(department))
+                self.result_text.insert(tk.END, "\n")
                 self.result_text.insert(tk.END, f"Total Revenue: {self.format_currency(row[required_columns['revenue']])}\n")
                 self.result_text.insert(tk.END, f"Units Sold: {int(row[required_columns['quantity']]):,}\n")
                 self.result_text.insert(tk.END, "-" * 50 + "\n")
+
+    def insert_link(self, text, command):
+        """Insert clickable text in the details area."""
+        self.link_count += 1
+        tag = f"link{self.link_count}"
+        self.result_text.insert(tk.END, text, ("link", tag))
+        self.result_text.tag_config("link", foreground='#1a73e8', underline=True)
+        self.result_text.tag_bind(tag, "<Button-1>", lambda event: command())
+        self.result_text.tag_bind(tag, "<Enter>", lambda event: self.result_text.config(cursor='hand2'))
+        self.result_text.tag_bind(tag, "<Leave>", lambda event: self.result_text.config(cursor=''))
+
+    def drill_rows(self, column, value, within=None):
+        """Selected rows with column == value, from the cached group index.
+
+        Only the group's own rows are read. within=(column, value) narrows
+        them further, e.g. to one product inside a department.
+        """
+        index = self.group_indexes.get(self.df, column, self.dataset_version)
+        rows = index.rows(value)
+        if within is not None:
+            outer = self.group_indexes.get(self.df, within[0], self.dataset_version)
+            rows = rows[outer.codes[rows] == outer.code(within[1])]
+        if self.selection_mask is not None:
+            rows = rows[self.selection_mask[rows]]
+        return rows
+
+    def drill_department(self, department):
+        """Show the products of one department."""
+        try:
+            columns = self.find_product_columns(self.df)
+            start = datetime.now()
+            rows = self.drill_rows(columns['department'], department)
+            products = totals_by(
+                self.group_indexes.get(self.df, columns['product'], self.dataset_version), rows,
+                {'Revenue': self.df[columns['revenue']].to_numpy(), 'Units': self.df[columns['quantity']].to_numpy()})
+            elapsed = (datetime.now() - start).total_seconds() * 1000
+            print(f"Drill-down {department}: {len(rows)} rows in {elapsed:.1f} ms")
             
-            # Department Analysis
-            if required_columns['department']:
-                dept_metrics = df.groupby(required_columns['department']).agg({
-                    required_columns['quantity']: 'sum',
-                    required_columns['revenue']: 'sum'
-                }).reset_index()
-                
-                dept_metrics = dept_metrics.sort_values(by=required_columns['revenue'], ascending=False)
-                
-                self.result_text.insert(tk.END, "\nDepartment Performance\n")
-                self.result_text.insert(tk.END, "=" * 50 + "\n\n")
-                
-                for _, row in dept_metrics.iterrows():
-                    self.result_text.insert(tk.END, f"Department: {row[required_columns['department']]}\n")
-                    self.result_text.insert(tk.END, f"Total Revenue: {self.format_currency(row[required_columns['revenue']])}\n")
-                    self.result_text.insert(tk.END, f"Units Sold: {int(row[required_columns['quantity']]):,}\n")
-                    self.result_text.insert(tk.END, "-" * 50 + "\n")
+            self.result_text.delete(1.0, tk.END)
+            self.insert_link("< Back to departments", self.show_last_product_tables)
+            self.result_text.insert(tk.END, f"\n\nDepartment: {department}\n")
+            self.result_text.insert(tk.END, "=" * 50 + "\n")
+            self.result_text.insert(tk.END, f"{len(products)} products, {len(rows):,} sales rows. "
+                                            "Click a product to see its daily sales.\n\n")
+            for _, row in products.iterrows():
+                self.insert_link(str(row['Group']),
+                                 lambda p=row['Group']: self.drill_product(department, p))
+                self.result_text.insert(tk.END, f"\n  Revenue: {self.format_currency(row['Revenue'])}"
+                                                f" | Units: {int(row['Units']):,}\n")
+        except Exception as e:
+            print(f"Error in drill_department: {str(e)}")
+            messagebox.showwarning("Warning", f"Could not show department {department}: {str(e)}")
+
+    def drill_product(self, department, product):
+        """Show the daily sales of one product within a department."""
+        try:
+            columns = self.find_product_columns(self.df)
+            date_col = self.get_date_column(self.df)
+            rows = self.drill_rows(columns['product'], product, within=(columns['department'], department))
+            daily = daily_totals(self.df[date_col].to_numpy(), rows,
+                                 {'Revenue': self.df[columns['revenue']].to_numpy(),
+                                  'Units': self.df[columns['quantity']].to_numpy()})
+            
+            self.result_text.delete(1.0, tk.END)
+            self.insert_link(f"< Back to {department}", lambda: self.drill_department(department))
+            self.result_text.insert(tk.END, "   ")
+            self.insert_link("Open daily chart", lambda: self.render_daily_chart(product, daily))
+            self.result_text.insert(tk.END, f"\n\nDaily Sales: {product} ({department})\n")
+            self.result_text.insert(tk.END, "=" * 50 + "\n")
+            self.result_text.insert(tk.END, f"Revenue: {self.format_currency(daily['Revenue'].sum())} | "
+                                            f"Units: {int(daily['Units'].sum()):,} | Days with sales: {len(daily)}\n\n")
+            for _, row in daily.iterrows():
+                self.result_text.insert(tk.END, f"{pd.Timestamp(row['Date']):%Y-%m-%d}  "
+                                                f"{self.format_currency(row['Revenue']):>14}  "
+                                                f"{int(row['Units']):>6,} units\n")
+        except Exception as e:
+            print(f"Error in drill_product: {str(e)}")
+            messagebox.showwarning("Warning", f"Could not show product {product}: {str(e)}")
+
+    def render_daily_chart(self, product, daily):
+        """Plot one product's daily revenue to drill_chart.html."""
+        fig = go.Figure(go.Bar(x=daily['Date'], y=daily['Revenue'], name='Revenue',
+                               marker_color='#4285f4'))
+        fig.update_layout(title=f'Daily Revenue - {product}', xaxis_title='Date', yaxis_title='Revenue',
+                          template='plotly_white', height=400, margin=dict(l=40, r=40, t=40, b=40))
+        fig.write_html("drill_chart.html")
+        webbrowser.open("drill_chart.html")
+
+    def show_last_product_tables(self):
+        if 'products' in self.last_results:
+            self.show_product_tables(self.last_results['products'], self.last_results.get('departments'),
+                                     self.last_results['product_columns'])
+
+    def show_approximate_top_products(self):
+        """Display sketch-based top products over the full history, with error bounds."""
+        if self.product_sketch is None:
+            self.product_sketch = self.build_product_sketch(self.df)
+        if self.product_sketch is None:
+            return False
+        
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, "Approximate Top Products (full history)\n")
+        self.result_text.insert(tk.END, "=" * 50 + "\n")
+        self.result_text.insert(tk.END, "Date range and filters are not applied. "
+                                        "Untick Approx. Top-N for exact figures.\n\n")
+        
+        for measure, fmt in [('Revenue', self.format_currency), ('Units Sold', lambda v: f"{v:,.0f}")]:
+            bounds = self.product_sketch.error_bounds(measure)
+            self.result_text.insert(tk.END, f"Top {TOP_N_PRODUCTS} by {measure}\n")
+            self.result_text.insert(tk.END, f"(any product's figure is overstated by at most {fmt(bounds['space_saving'])}; "
+                                            f"Count-Min bound {fmt(bounds['count_min'])} at "
+                                            f"{bounds['count_min_confidence']:.0%} confidence)\n\n")
+            top = self.product_sketch.top(measure, TOP_N_PRODUCTS)
+            for product, row in top.iterrows():
+                self.result_text.insert(tk.END, f"Product: {product}\n")
+                self.result_text.insert(tk.END, f"{measure}: {fmt(row['estimate'])}")
+                if row['max_error'] > 0:
+                    self.result_text.insert(tk.END, f" (at least {fmt(row['lower_bound'])})")
+                self.result_text.insert(tk.END, "\n" + "-" * 50 + "\n")
+            self.result_text.insert(tk.END, "\n")
+        return True
+
+    def analyze_products(self, df, analysis_type="Product Analysis"):
+        try:
+            if (analysis_type == "Product Analysis" and self.approx_top_var.get()
+                    and self.show_approximate_top_products()):
+                return
+            
+            product_metrics, dept_metrics, required_columns = self.calculate_product_tables(
+                df, top_n=TOP_N_PRODUCTS, rollup=self.current_rollup())
+            
+            self.last_results['products'] = product_metrics
+            self.last_results['departments'] = dept_metrics
+            self.last_results['product_columns'] = required_columns
+            
+            # Display results
+            self.show_product_tables(product_metrics, dept_metrics, required_columns)
             
         except Exception as e:
             print(f"Error in analyze_products: {str(e)}")
@@ -717,11 +1376,309 @@ class PaintAnalyticsApp:
                 self.result_text.insert(tk.END, f"- {col}\n")
             messagebox.showwarning("Warning", str(e))
 
+    def current_rollup(self):
+        """Rollup of the rows selected for the current analysis, built on first use."""
+        if self.rollup is None and self.analysis_df is not None and not self.analysis_df.empty:
+            self.rollup = self.build_rollup(self.analysis_df)
+        return self.rollup
+
+    def abc_product_totals(self, df, columns):
+        """Product revenue for the selected rows, updated incrementally on date changes."""
+        date_col = next((col for col in self.df.columns if str(col).lower().strip() == 'date'), None)
+        if date_col is None or not pd.api.types.is_datetime64_any_dtype(self.df[date_col]):
+            rollup = self.current_rollup()
+            product_metrics, _, _ = self.calculate_product_tables(df, rollup=rollup)
+            return product_metrics.set_index(columns['product'])[columns['revenue']]
+        
+        # Rebuild only when the dataset, columns or dimension filters change
+        filters = self.selected_filters()
+        key = (self.dataset_version, columns['product'], columns['revenue'],
+               tuple(sorted((col, tuple(values)) for col, values in filters.items())))
+        if self.abc_totals is None or self.abc_key != key:
+            self.abc_totals = DateRangeTotals(self.df[date_col], self.df[columns['product']],
+                                              self.df[columns['revenue']], self.dimension_mask())
+            self.abc_key = key
+        return self.abc_totals.update(self.start_date.get().strip() or None,
+                                      self.end_date.get().strip() or None)
+
+    def analyze_abc(self, df):
+        """ABC classification of products by revenue, with a Pareto chart."""
+        try:
+            columns = self.find_product_columns(df)
+            if columns['product'] is None or columns['revenue'] is None:
+                raise ValueError("ABC analysis needs a product description and a Net Sales column")
+            
+            totals = self.abc_product_totals(df, columns).rename_axis(columns['product'])
+            abc = classify_abc(totals)
+            summary = summarize_abc(abc)
+            
+            self.result_text.delete(1.0, tk.END)
+            self.result_text.insert(tk.END, "ABC Product Classification\n")
+            self.result_text.insert(tk.END, "=" * 50 + "\n\n")
+            for product_class, row in summary.iterrows():
+                self.result_text.insert(tk.END, f"Class {product_class}: {int(row['Items']):,} products "
+                                                f"({self.format_percent(row['Items %'])}) - "
+                                                f"{self.format_currency(row['Revenue'])} "
+                                                f"({self.format_percent(row['Revenue %'])} of revenue)\n")
+            
+            self.result_text.insert(tk.END, "\nClass A Products\n")
+            self.result_text.insert(tk.END, "=" * 50 + "\n\n")
+            for _, row in abc[abc['Class'] == 'A'].head(50).iterrows():
+                self.result_text.insert(tk.END, f"Product: {row[columns['product']]}\n")
+                self.result_text.insert(tk.END, f"Revenue: {self.format_currency(row['Revenue'])} "
+                                                f"(cumulative {self.format_percent(row['Cumulative %'])})\n")
+                self.result_text.insert(tk.END, "-" * 50 + "\n")
+            
+            self.render_pareto_chart(abc, columns['product'])
+            
+        except Exception as e:
+            print(f"Error in analyze_abc: {str(e)}")
+            self.result_text.delete(1.0, tk.END)
+            self.result_text.insert(tk.END, "Error in ABC Analysis\n")
+            self.result_text.insert(tk.END, "=" * 50 + "\n\n")
+            self.result_text.insert(tk.END, f"Error: {str(e)}\n")
+            messagebox.showwarning("Warning", str(e))
+
+    def render_pareto_chart(self, abc, product_col):
+        """Plot revenue per product with the cumulative share to pareto_chart.html."""
+        bars = abc.head(PARETO_MAX_BARS)
+        colors = bars['Class'].map({'A': '#34a853', 'B': '#fbbc05', 'C': '#ea4335'})
+        
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            x=bars[product_col].astype(str),
+            y=bars['Revenue'],
+            name='Revenue',
+            marker_color=colors
+        ))
+        fig.add_trace(go.Scatter(
+            x=abc[product_col].astype(str),
+            y=abc['Cumulative %'],
+            name='Cumulative %',
+            yaxis='y2',
+            line=dict(color='#4285f4', width=2)
+        ))
+        
+        fig.update_layout(
+            title=f'Pareto Chart - ABC Classification ({len(abc):,} products)',
+            xaxis=dict(title='Product', range=[-0.5, len(bars) - 0.5], showticklabels=len(bars) <= 50),
+            yaxis=dict(title='Revenue'),
+            yaxis2=dict(title='Cumulative %', overlaying='y', side='right', range=[0, 105]),
+            template='plotly_white',
+            height=500,
+            margin=dict(l=40, r=40, t=40, b=40)
+        )
+        fig.add_hline(y=80, line_dash='dash', line_color='gray', yref='y2')
+        fig.add_hline(y=95, line_dash='dot', line_color='gray', yref='y2')
+        
+        fig.write_html("pareto_chart.html")
+        webbrowser.open("pareto_chart.html")
+
+    def analyze_forecast(self, df):
+        """Next-quarter demand forecast per product and per product and store."""
+        try:
+            columns = self.find_product_columns(df)
+            date_col = next((col for col in df.columns if str(col).lower().strip() == 'date'), None)
+            if columns['product'] is None or columns['quantity'] is None or date_col is None:
+                raise ValueError("Demand forecast needs Date, product description and Qty columns")
+            
+            print("\nForecasting demand...")
+            by_product = forecast_groups(df, [columns['product']], date_col, columns['quantity'])
+            by_product = by_product.nlargest(TOP_N_PRODUCTS * 2, 'Forecast')
+            
+            store_col = self.find_filter_columns(df).get('Store')
+            by_store = None
+            if store_col is not None:
+                by_store = forecast_groups(df, [columns['product'], store_col], date_col, columns['quantity'])
+                by_store = by_store.nlargest(TOP_N_PRODUCTS * 2, 'Forecast')
+            
+            # Revenue forecast for the trend chart, on a gap-free monthly series
+            monthly = self.calculate_monthly_trend(df, rollup=self.rollup)
+            months = pd.PeriodIndex(monthly['Month'], freq='M')
+            full_range = pd.period_range(months.min(), months.max(), freq='M')
+            revenue = monthly.set_index(months)['Net Sales'].reindex(full_range, fill_value=0)
+            self.last_results['forecast'] = forecast_total(revenue.to_numpy(), full_range.astype(str))
+            
+            self.result_text.delete(1.0, tk.END)
+            self.result_text.insert(tk.END, f"Demand Forecast - next {FORECAST_HORIZON} months (units)\n")
+            self.result_text.insert(tk.END, "=" * 50 + "\n\n")
+            self.result_text.insert(tk.END, "Ranges are 80% prediction intervals.\n\n")
+            
+            tables = [("Top Products", by_product, [columns['product']])]
+            if by_store is not None:
+                tables.append(("Top Products by Store", by_store, [columns['product'], store_col]))
+            for title, table, keys in tables:
+                self.result_text.insert(tk.END, f"{title}\n")
+                self.result_text.insert(tk.END, "-" * 50 + "\n")
+                for _, row in table.iterrows():
+                    label = " @ ".join(str(row[key]) for key in keys)
+                    self.result_text.insert(tk.END, f"{label}\n")
+                    self.result_text.insert(tk.END, f"  Forecast: {row['Forecast']:,.0f} "
+                                                    f"({row['Lower']:,.0f} - {row['Upper']:,.0f}); "
+                                                    f"last {FORECAST_HORIZON} months: {row['Last Period']:,.0f}\n")
+                self.result_text.insert(tk.END, "\n")
+            
+        except Exception as e:
+            print(f"Error in analyze_forecast: {str(e)}")
+            self.result_text.delete(1.0, tk.END)
+            self.result_text.insert(tk.END, "Error in Demand Forecast\n")
+            self.result_text.insert(tk.END, "=" * 50 + "\n\n")
+            self.result_text.insert(tk.END, f"Error: {str(e)}\n")
+            messagebox.showwarning("Warning", str(e))
+
+    def analyze_comparison(self, df):
+        """Append current vs previous period and same period last year revenue, by product, department and store.
+
+        The comparison periods lie outside the selected date range, so they
+        are read from the whole dataset with only the dimension filters applied.
+        """
+        date_col = self.get_date_column(self.df)
+        columns = self.find_product_columns(self.df)
+        if date_col is None or columns['revenue'] is None:
+            raise ValueError("Period comparison needs Date and Net Sales columns")
+        
+        # Empty date fields compare the range of the analysed rows
+        start = self.start_date.get().strip() or pd.to_datetime(df[date_col]).min()
+        end = self.end_date.get().strip() or pd.to_datetime(df[date_col]).max()
+        
+        mask = self.dimension_mask()
+        def column(col):
+            return self.df[col] if mask is None else self.df[col][mask]
+        
+        groups = {}
+        for name, col in [('Product', columns['product']), ('Department', columns['department']),
+                          ('Store', self.find_filter_columns(self.df).get('Store'))]:
+            if col is not None:
+                groups[name] = column(col)
+        
+        print("\nComparing periods...")
+        windows, totals, tables = compare_periods(column(date_col), groups, column(columns['revenue']), start, end)
+        self.last_results['growth'] = monthly_growth(column(date_col), column(columns['revenue']))
+        self.last_results['comparison'] = {name: table.reset_index() for name, table in tables.items()}
+        
+        def window_text(name):
+            lo, hi = windows[name]
+            return f"{pd.Timestamp(lo):%Y-%m-%d} to {pd.Timestamp(hi) - pd.Timedelta(days=1):%Y-%m-%d}"
+        
+        self.result_text.insert(tk.END, "\n\nPeriod Comparison (revenue)\n")
+        self.result_text.insert(tk.END, "=" * 50 + "\n\n")
+        self.result_text.insert(tk.END, f"Current:   {window_text('Current')}\n")
+        self.result_text.insert(tk.END, f"Previous:  {window_text('Previous')}\n")
+        self.result_text.insert(tk.END, f"Last year: {window_text('Last Year')}\n\n")
+        self.result_text.insert(tk.END, f"Total: {self.format_currency(totals['Current'])}, "
+                                        f"previous {self.format_currency(totals['Previous'])} "
+                                        f"({self.format_change(totals['Change %'])}), "
+                                        f"last year {self.format_currency(totals['Last Year'])} "
+                                        f"({self.format_change(totals['YoY %'])})\n")
+        
+        for name, table in tables.items():
+            self.result_text.insert(tk.END, f"\nBy {name}\n")
+            self.result_text.insert(tk.END, "-" * 50 + "\n")
+            for label, row in table.head(TOP_N_PRODUCTS).iterrows():
+                self.result_text.insert(tk.END, f"{label}\n")
+                self.result_text.insert(tk.END, f"  {self.format_currency(row['Current'])} | "
+                                                f"prev {self.format_change(row['Change %'])} | "
+                                                f"YoY {self.format_change(row['YoY %'])}\n")
+
+    def analyze_distribution(self, df):
+        """Percentiles of line value, units, unit price and discount depth by department.
+
+        Answered by merging the quantile sketches of the selected stores,
+        departments and whole months. Rows of the partly covered months at
+        either end of the date range are sketched directly and merged in.
+        Other filters are not cells of the sketches; the selected rows are
+        then all sketched directly.
+        """
+        try:
+            start = datetime.now()
+            if self.distribution_sketches is None:
+                self.distribution_sketches = self.build_distribution_sketches(self.df)
+            
+            group_col = self.find_product_columns(self.df)['department']
+            store_col = self.filter_columns.get('Store')
+            date_col = next((col for col in self.df.columns if str(col).lower().strip() == 'date'), None)
+            selected = self.selected_filters()
+            other_filters = [col for col in selected if col not in (store_col, group_col)]
+            
+            if other_filters or date_col is None or not pd.api.types.is_datetime64_any_dtype(self.df[date_col]):
+                print("Distribution: sketching the selected rows")
+                sketches = self.build_distribution_sketches(df)
+                groups = stores = None
+                source = "sketched from the selected rows"
+            else:
+                sketches, edge_rows = self.range_distribution_sketches(
+                    self.distribution_sketches, self.df[date_col], df, date_col,
+                    self.start_date.get().strip(), self.end_date.get().strip())
+                source = "merged from the sketches built at load"
+                if edge_rows:
+                    source += f" and {edge_rows:,} rows of partial months"
+                groups = selected.get(group_col)
+                stores = selected.get(store_col)
+            
+            if not sketches.cells:
+                raise ValueError("No rows to analyse for the selected filters")
+            measures = next(iter(sketches.cells.values()))
+            tables = {measure: sketches.summary(measure, DISTRIBUTION_QUANTILES, groups, stores)
+                      for measure in measures}
+            elapsed = (datetime.now() - start).total_seconds() * 1000
+            print(f"Distribution analysis in {elapsed:.1f} ms ({source})")
+            self.last_results['distribution'] = {measure: table.reset_index(names='Group')
+                                                 for measure, table in tables.items()}
+            
+            self.result_text.delete(1.0, tk.END)
+            self.result_text.insert(tk.END, "Distribution Analysis\n")
+            self.result_text.insert(tk.END, "=" * 50 + "\n\n")
+            error = 100 * next(iter(measures.values())).rank_error()
+            self.result_text.insert(tk.END, f"Percentiles {source} in {elapsed:.0f} ms; "
+                                            f"approximate to about {error:.1f}% in rank.\n")
+            
+            for measure, table in tables.items():
+                self.result_text.insert(tk.END, f"\n{measure}\n")
+                self.result_text.insert(tk.END, "-" * 50 + "\n")
+                self.result_text.insert(tk.END, f"{'':<16}" + "".join(f"{col:>10}" for col in table.columns) + "\n")
+                for group, row in table.iterrows():
+                    cells = f"{int(row['Count']):>10,}" + "".join(f"{value:>10,.2f}" for value in row.iloc[1:])
+                    self.result_text.insert(tk.END, f"{str(group)[:16]:<16}{cells}\n")
+            
+            self.render_distribution_chart(tables)
+            
+        except Exception as e:
+            print(f"Error in analyze_distribution: {str(e)}")
+            self.result_text.delete(1.0, tk.END)
+            self.result_text.insert(tk.END, "Error in Distribution Analysis\n")
+            self.result_text.insert(tk.END, "=" * 50 + "\n\n")
+            self.result_text.insert(tk.END, f"Error: {str(e)}\n")
+            messagebox.showwarning("Warning", str(e))
+
+    def render_distribution_chart(self, tables):
+        """Box plots (p25-p75 boxes, p10-p90 whiskers) per department to distribution_chart.html."""
+        fig = make_subplots(rows=2, cols=2, subplot_titles=list(tables)[:4])
+        for i, (measure, table) in enumerate(list(tables.items())[:4]):
+            fig.add_trace(go.Box(
+                x=[str(group) for group in table.index],
+                lowerfence=table['p10'], q1=table['p25'], median=table['p50'],
+                q3=table['p75'], upperfence=table['p90'],
+                name=measure,
+                marker_color='#4285f4',
+                showlegend=False
+            ), row=i // 2 + 1, col=i % 2 + 1)
+        fig.update_layout(
+            title='Distributions by Department (boxes p25-p75, whiskers p10-p90)',
+            template='plotly_white',
+            height=700,
+            margin=dict(l=40, r=40, t=80, b=40)
+        )
+        fig.write_html("distribution_chart.html")
+        webbrowser.open("distribution_chart.html")
+
     def get_analysis_options(self):
         """Return available analysis options."""
         return [
             "Sales Overview",
             "Product Analysis",
+            "ABC Analysis",
+            "Demand Forecast",
+            "Distribution Analysis",
             "Department Performance"
         ]
 
@@ -750,6 +1707,9 @@ class PaintAnalyticsApp:
                     print(f"{key}: {value}")  # Debug print
                     self.result_text.insert(tk.END, f"{key}: {value:,.2f}\n")
                 
+                self.last_results['metrics'] = metrics
+                self.update_metrics(metrics)
+                
                 # Check if any metrics are zero
                 zero_metrics = [k for k, v in metrics.items() if v == 0]
                 if zero_metrics:
@@ -757,55 +1717,33 @@ class PaintAnalyticsApp:
                     for metric in zero_metrics:
                         self.result_text.insert(tk.END, f"- {metric}\n")
                     
-                    # Show column information for troubleshooting
-                    self.result_text.insert(tk.END, "\nColumn Information for Debugging:\n")
-                    self.result_text.insert(tk.END, "=" * 50 + "\n\n")
-                    
-                    numeric_cols = ['Qty', 'CP incl VAT', 'SP incl VAT', 'Cost of Sale', 
-                                  'Discounts', 'Net Sales', 'Nt. Sl. Ls Vt']
-                    
-                    for col in numeric_cols:
-                        if col in df.columns:
-                            self.result_text.insert(tk.END, f"\n{col}:\n")
-                            self.result_text.insert(tk.END, f"  Type: {df[col].dtype}\n")
-                            self.result_text.insert(tk.END, f"  Non-null count: {df[col].count()}\n")
-                            self.result_text.insert(tk.END, f"  Sum: {df[col].sum()}\n")
-                            self.result_text.insert(tk.END, f"  Sample values: {df[col].head().tolist()}\n")
-                            
-                            # Check for string values that should be numeric
-                            if df[col].dtype == 'object':
-                                sample_strings = df[col].head().astype(str).tolist()
-                                self.result_text.insert(tk.END, f"  Sample strings: {sample_strings}\n")
-                        else:
-                            self.result_text.insert(tk.END, f"\nWarning: Column '{col}' not found in data\n")
-                    
-                    raise ValueError("All totals are zero. See details above for debugging information.")
+                    raise ValueError("All totals are zero. See the data quality report for details.")
                 
             except Exception as calc_error:
                 print(f"Error in financial calculations: {str(calc_error)}")
-                self.result_text.insert(tk.END, f"\nError in financial calculations: {str(calc_error)}\n")
-                self.result_text.insert(tk.END, "\nAvailable columns:\n")
-                for col in df.columns:
-                    self.result_text.insert(tk.END, f"- {col}\n")
-                    if col in df.columns:
-                        sample = df[col].head()
-                        self.result_text.insert(tk.END, f"  Sample values: {sample.tolist()}\n")
                 raise calc_error
             
+            if analysis_type in ("Product Analysis", "Department Performance"):
+                self.analyze_products(df, analysis_type)
+            elif analysis_type == "ABC Analysis":
+                self.analyze_abc(df)
+            elif analysis_type == "Demand Forecast":
+                self.analyze_forecast(df)
+            elif analysis_type == "Distribution Analysis":
+                self.analyze_distribution(df)
+            
+            if self.compare_var.get():
+                self.analyze_comparison(df)
+            
         except Exception as e:
             print(f"Analysis error: {str(e)}")
             error_msg = f"\nThe following error occurred:\n\n{str(e)}\n\n"
-            error_msg += "Available Columns in Your Data:\n"
+            if self.validation_report is not None:
+                error_msg += format_report(self.validation_report) + "\n"
             
-            for col in df.columns:
-                error_msg += f"- {col}\n"
-                if col in df.columns:
-                    dtype = df[col].dtype
-                    non_null = df[col].count()
-                    sample = df[col].head(3)
-                    error_msg += f"  Type: {dtype}\n"
-                    error_msg += f"  Non-null count: {non_null}\n"
-                    error_msg += f"  Sample values: {sample.tolist()}\n"
+            error_msg += "Available Columns in Your Data:\n"
+            for col, dtype in df.dtypes.items():
+                error_msg += f"- {col} ({dtype})\n"
             
             self.result_text.delete(1.0, tk.END)
             self.result_text.insert(tk.END, error_msg)
@@ -842,6 +1780,259 @@ class PaintAnalyticsApp:
     def refresh_analysis(self, value=None):
         self.run_analysis()
 
+    def on_close(self):
+        """Save a snapshot of the dashboard state and close the window."""
+        try:
+            if self.file_path and self.last_results:
+                state = dict(self.last_results)
+                state['source'] = session_snapshot.file_fingerprint(self.file_path)
+                state['start_date'] = self.start_date.get()
+                state['end_date'] = self.end_date.get()
+                state['view'] = self.analysis_var.get()
+                session_snapshot.save_snapshot(state)
+                print(f"Saved session snapshot to {session_snapshot.SNAPSHOT_PATH}")
+        except Exception as e:
+            print(f"Could not save session snapshot: {str(e)}")
+        if self.live_feed is not None:
+            self.live_feed.stop()
+        self.root.destroy()
+
+    def toggle_live_feed(self):
+        if self.live_feed is None:
+            self.start_live_feed()
+        else:
+            self.stop_live_feed()
+
+    def start_live_feed(self):
+        """Ask for a feed address and start ingesting till records from it."""
+        address = simpledialog.askstring("Live Feed", "Listen on host:port, or read from a named pipe path:",
+                                         initialvalue=DEFAULT_FEED_ADDRESS, parent=self.root)
+        if not address:
+            return
+        try:
+            # The cards and trend carry on from the loaded data, if any
+            self.live_totals = LiveTotals()
+            if self.df is not None:
+                self.live_totals.add(self.df, self.get_date_column(self.df))
+            self.live_frames = []
+            self.live_rejected = 0
+            self.live_started = None
+            self.live_chart_time = None
+            self.live_chart_pending = False
+            self.live_chart_thread = None
+            self.live_chart_opened = False
+            self.live_batches = queue.Queue()
+            
+            feed = LiveFeed(address, self.queue_live_batch,
+                            on_error=lambda message: self.live_batches.put(('error', message)))
+            feed.start()
+            self.live_feed = feed
+            self.live_button.config(text=" Stop Live Feed")
+            self.live_status.config(text=f"Live: waiting for records on {address}")
+            self.root.after(LIVE_POLL_MS, self.poll_live_feed, feed)
+        except Exception as e:
+            print(f"Error starting live feed: {str(e)}")
+            messagebox.showerror("Error", f"Could not start the live feed: {str(e)}")
+
+    def queue_live_batch(self, df, skipped):
+        """Feed thread: type a batch and queue it for the Tk thread."""
+        try:
+            batch = self.clean_feed_batch(df)
+            self.live_batches.put(('batch', (batch, skipped + len(df) - len(batch))))
+        except Exception as e:
+            self.live_batches.put(('error', str(e)))
+
+    def poll_live_feed(self, feed):
+        """Apply queued batches, then check again shortly while this feed runs."""
+        if feed is not self.live_feed:
+            return
+        self.apply_live_batches()
+        self.refresh_live_chart()
+        self.root.after(LIVE_POLL_MS, self.poll_live_feed, feed)
+
+    def apply_live_batches(self):
+        """Add the queued batches to the running totals and refresh the cards and trend."""
+        received = 0
+        while True:
+            try:
+                kind, payload = self.live_batches.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'error':
+                print(f"Live feed error: {payload}")
+                self.live_status.config(text=f"Live feed error: {payload}")
+                continue
+            batch, rejected = payload
+            self.live_totals.add(batch, next((col for col in batch.columns
+                                              if str(col).lower().strip() == 'date'), None))
+            self.live_frames.append(batch)
+            self.live_rejected += rejected
+            received += len(batch)
+        if not received:
+            return
+        
+        now = datetime.now()
+        if self.live_started is None:
+            self.live_started = now
+        records = sum(len(batch) for batch in self.live_frames)
+        elapsed = max((now - self.live_started).total_seconds(), LIVE_POLL_MS / 1000)
+        self.live_status.config(text=f"Live: {records:,} records ({records / elapsed:,.0f}/s), "
+                                     f"{self.live_rejected:,} rejected")
+        self.update_metrics(self.live_totals.metrics())
+        self.live_chart_pending = True
+
+    def refresh_live_chart(self):
+        """Rewrite the trend chart with the live totals, at most every LIVE_CHART_SECONDS.
+
+        Writing the chart file takes a few hundred ms, so it runs on a worker
+        thread, one render at a time; the browser is opened from the Tk
+        thread once the first chart has been written.
+        """
+        if self.live_chart_thread is not None:
+            if self.live_chart_thread.is_alive():
+                return
+            if not self.live_chart_opened:
+                webbrowser.open("trend_chart.html")
+                self.live_chart_opened = True
+        
+        now = datetime.now()
+        if not self.live_chart_pending or (
+                self.live_chart_time is not None
+                and (now - self.live_chart_time).total_seconds() < LIVE_CHART_SECONDS):
+            return
+        self.live_chart_pending = False
+        monthly = self.live_totals.monthly_trend()
+        if not len(monthly):
+            return
+        self.live_chart_thread = threading.Thread(target=self.render_trend_chart, args=(monthly,),
+                                                  kwargs={'open_browser': False}, daemon=True)
+        self.live_chart_thread.start()
+        self.live_chart_time = now
+
+    def stop_live_feed(self):
+        """Stop the feed and add the records received to the dataset."""
+        self.live_feed.stop()
+        self.live_feed = None
+        self.apply_live_batches()
+        # run_analysis writes the same chart file
+        if self.live_chart_thread is not None:
+            self.live_chart_thread.join()
+        self.live_button.config(text=" Live Feed")
+        if not self.live_frames:
+            self.live_status.config(text="")
+            return
+        
+        try:
+            records = sum(len(batch) for batch in self.live_frames)
+            frames = ([self.df] if self.df is not None else []) + self.live_frames
+            self.live_frames = []
+            df = pd.concat(frames, ignore_index=True)
+            self.df = self.memory.fit(df, self.analysed_columns(df))
+            # The dataset no longer matches a file, so no snapshot is saved for it
+            self.file_path = None
+            self.dataset_version += 1
+            self.product_sketch = None
+            self.distribution_sketches = None
+            self.build_filter_index()
+            self.live_status.config(text=f"Live: {records:,} records added")
+            
+            # Date range covering the received records
+            date_col = self.get_date_column(self.df)
+            if date_col:
+                self.start_date.delete(0, tk.END)
+                self.start_date.insert(0, self.df[date_col].min().strftime('%Y-%m-%d'))
+                self.end_date.delete(0, tk.END)
+                self.end_date.insert(0, self.df[date_col].max().strftime('%Y-%m-%d'))
+            self.run_analysis()
+        except Exception as e:
+            print(f"Error adding live feed records: {str(e)}")
+            messagebox.showerror("Error", f"Could not add the live feed records: {str(e)}")
+
+    def restore_snapshot(self):
+        """Render the last session from its snapshot, then verify it in the background."""
+        snapshot = session_snapshot.load_snapshot()
+        if not snapshot or 'source' not in snapshot:
+            return
+        
+        print(f"\nRestoring session snapshot from {snapshot.get('saved_at')}")
+        self.last_results = {key: snapshot[key] for key in
+                             ('metrics', 'products', 'departments', 'product_columns', 'monthly', 'forecast',
+                              'growth')
+                             if snapshot.get(key) is not None}
+        self.start_date.delete(0, tk.END)
+        self.start_date.insert(0, snapshot.get('start_date', ''))
+        self.end_date.delete(0, tk.END)
+        self.end_date.insert(0, snapshot.get('end_date', ''))
+        self.analysis_var.set(snapshot.get('view', "Sales Overview"))
+        
+        metrics = self.last_results.get('metrics')
+        if metrics:
+            self.update_metrics(metrics)
+        
+        if 'products' in self.last_results:
+            self.show_product_tables(self.last_results['products'],
+                                     self.last_results.get('departments'),
+                                     self.last_results['product_columns'])
+        elif metrics:
+            self.result_text.delete(1.0, tk.END)
+            self.result_text.insert(tk.END, "Financial Metrics:\n")
+            self.result_text.insert(tk.END, "=" * 50 + "\n\n")
+            for key, value in metrics.items():
+                self.result_text.insert(tk.END, f"{key}: {value:,.2f}\n")
+        
+        if 'monthly' in self.last_results:
+            self.render_trend_chart(self.last_results['monthly'], open_browser=False,
+                                    forecast=self.last_results.get('forecast'),
+                                    growth=self.last_results.get('growth'))
+        
+        self.result_text.insert(tk.END, f"\nRestored from session saved {snapshot.get('saved_at')}\n")
+        self.result_text.insert(tk.END, f"Source: {snapshot['source']['path']} (checking...)\n")
+        
+        threading.Thread(target=self.verify_snapshot, args=(snapshot,), daemon=True).start()
+        self.root.after(200, self.poll_background_results)
+
+    def verify_snapshot(self, snapshot):
+        """Background worker: check the snapshot source and reload it if unchanged."""
+        try:
+            if not session_snapshot.is_fresh(snapshot):
+                self.background_results.put(('stale', snapshot['source']['path']))
+                return
+            # Its own budget: a load started meanwhile must not release the spill files of this one
+            memory = MemoryBudget()
+            df, report = self.read_dataset(snapshot['source']['path'], memory=memory)
+            self.background_results.put(('fresh', (snapshot['source']['path'], df, report, memory)))
+        except Exception as e:
+            self.background_results.put(('error', str(e)))
+
+    def poll_background_results(self):
+        """Apply results from background workers on the Tk thread."""
+        try:
+            kind, payload = self.background_results.get_nowait()
+        except queue.Empty:
+            self.root.after(200, self.poll_background_results)
+            return
+        
+        if kind == 'fresh':
+            file_path, df, report, memory = payload
+            # Keep the dataset loaded by the user in the meantime
+            if self.df is None:
+                self.memory.release()
+                self.memory = memory
+                self.file_path, self.df, self.validation_report = file_path, df, report
+                self.dataset_version += 1
+                self.product_sketch = None
+                self.distribution_sketches = None
+                self.build_filter_index()
+                self.update_memory_status()
+                self.result_text.insert(tk.END, "Source file unchanged - data reloaded.\n")
+            else:
+                memory.release()
+        elif kind == 'stale':
+            self.result_text.insert(tk.END, f"Source file changed or missing since the snapshot: {payload}\n"
+                                            "Upload the data again to refresh the dashboard.\n")
+        else:
+            self.result_text.insert(tk.END, f"Could not verify session snapshot: {payload}\n")
+
 def main():
     root = tk.Tk()
     app = PaintAnalyticsApp(root)
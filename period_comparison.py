@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+# Period code of each row; rows in neither window get -1
+CURRENT = 0
+PREVIOUS = 1
+
+DAY = np.timedelta64(1, 'D')
+
+
+def comparison_windows(start, end):
+    """Current, previous and year-earlier windows for an inclusive date range.
+
+    Windows are half-open (lo, hi) pairs of datetime64. A range of whole
+    calendar months is compared with the same number of months before it
+    (March with February); any other range with the same number of days
+    just before it.
+    """
+    start = pd.Timestamp(start).normalize()
+    end = pd.Timestamp(end).normalize()
+    after_end = end + pd.Timedelta(days=1)
+    if start.day == 1 and after_end.day == 1:
+        months = (after_end.year - start.year) * 12 + after_end.month - start.month
+        previous_start = start - pd.DateOffset(months=months)
+    else:
+        previous_start = start - (after_end - start)
+    year = pd.DateOffset(years=1)
+    windows = {
+        'Current': (start, after_end),
+        'Previous': (previous_start, start),
+        # Shifted from end, not after_end: a year before 29 Feb is 28 Feb,
+        # which would otherwise fall outside the window
+        'Last Year': (start - year, end - year + pd.Timedelta(days=1))
+    }
+    return {name: (lo.to_datetime64(), hi.to_datetime64()) for name, (lo, hi) in windows.items()}
+
+
+def period_codes(dates, windows):
+    """Period code of every row (CURRENT, PREVIOUS or -1) and whether it falls in the last-year window."""
+    dates = np.asarray(dates, dtype='datetime64[ns]')
+
+    def inside(window):
+        lo, hi = window
+        return (dates >= lo) & (dates < hi)
+
+    period = np.full(len(dates), -1, dtype='int64')
+    period[inside(windows['Previous'])] = PREVIOUS
+    period[inside(windows['Current'])] = CURRENT
+    return period, inside(windows['Last Year'])
+
+
+def growth(current, base):
+    """Percentage change from base; NaN where base is zero."""
+    current = np.asarray(current, dtype='float64')
+    base = np.asarray(base, dtype='float64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(base != 0, (current - base) / np.abs(base) * 100, np.nan)
+
+
+def compare_groups(groups, period, last_year, values):
+    """Current, previous and last-year totals with growth for every group.
+
+    The period code is folded into the group code (code * 2 + period), so one
+    bincount gives the current and previous totals of all groups side by
+    side; the last-year totals come from the same codes, so every figure is
+    aligned by group without a join. Groups with no sales in any window are
+    left out.
+    """
+    codes, labels = pd.factorize(groups)
+    codes = codes.astype('int64')
+    values = np.nan_to_num(np.asarray(values, dtype='float64'))
+    n_groups = len(labels)
+
+    in_window = (codes >= 0) & (period >= 0)
+    paired = np.bincount(codes[in_window] * 2 + period[in_window], weights=values[in_window],
+                         minlength=n_groups * 2).reshape(n_groups, 2)
+    in_last_year = (codes >= 0) & last_year
+    last = np.bincount(codes[in_last_year], weights=values[in_last_year], minlength=n_groups)
+    active = np.bincount(codes[in_window | in_last_year], minlength=n_groups) > 0
+
+    table = pd.DataFrame({
+        'Current': paired[:, CURRENT],
+        'Previous': paired[:, PREVIOUS],
+        'Change %': growth(paired[:, CURRENT], paired[:, PREVIOUS]),
+        'Last Year': last,
+        'YoY %': growth(paired[:, CURRENT], last)
+    }, index=pd.Index(labels, name=getattr(groups, 'name', None)))
+    return table[active].sort_values('Current', ascending=False)
+
+
+def compare_periods(dates, groups, values, start, end):
+    """Compare start..end with the previous period and the same period last year.
+
+    groups maps names to aligned group Series (product, department, ...).
+    Rows are assigned to periods once and shared by every grouping. Returns
+    the windows, a totals dict and one compare_groups table per grouping.
+    """
+    windows = comparison_windows(start, end)
+    period, last_year = period_codes(dates, windows)
+    values = np.nan_to_num(np.asarray(values, dtype='float64'))
+
+    current = values[period == CURRENT].sum()
+    previous = values[period == PREVIOUS].sum()
+    last = values[last_year].sum()
+    totals = {
+        'Current': current,
+        'Previous': previous,
+        'Change %': float(growth(current, previous)),
+        'Last Year': last,
+        'YoY %': float(growth(current, last))
+    }
+    tables = {name: compare_groups(series, period, last_year, values) for name, series in groups.items()}
+    return windows, totals, tables
+
+
+def monthly_growth(dates, values):
+    """Totals per calendar month with month-on-month and year-on-year growth %.
+
+    Months without sales are included as zero so that the shifts by 1 and
+    12 months line up.
+    """
+    months = np.asarray(dates, dtype='datetime64[M]')
+    valid = ~np.isnat(months)
+    codes = months[valid].astype('int64')
+    if not len(codes):
+        return pd.DataFrame(columns=['Month', 'Total', 'MoM %', 'YoY %'])
+    first = codes.min()
+    totals = np.bincount(codes - first, weights=np.nan_to_num(np.asarray(values, dtype='float64')[valid]))
+
+    mom = np.full(len(totals), np.nan)
+    mom[1:] = growth(totals[1:], totals[:-1])
+    yoy = np.full(len(totals), np.nan)
+    yoy[12:] = growth(totals[12:], totals[:-12])
+    index = pd.period_range(pd.Period(np.datetime64(int(first), 'M'), freq='M'), periods=len(totals), freq='M')
+    return pd.DataFrame({'Month': index.astype(str), 'Total': totals, 'MoM %': mom, 'YoY %': yoy})
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+# Combined keys are re-densified before they could overflow int64
+MAX_KEY = 2 ** 62
+
+
+class Rollup:
+    """Grouping sets, subtotals and grand total from one pass over the rows.
+
+    Every dimension is integer-coded once, the codes are combined into a
+    single cell key, and the measures are summed per cell in a single
+    bincount pass. Any grouping set (by product, by department and brand,
+    the grand total, ...) is then aggregated from the cells, which are far
+    fewer than the rows, so each additional breakdown is cheap. Results are
+    cached per grouping set. Rows with a missing dimension value are left out
+    of the grouping sets using that dimension, as in pandas groupby.
+    """
+
+    def __init__(self, dimensions, measures):
+        """dimensions and measures map names to aligned Series (or arrays)."""
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        self.labels = {}
+        self.cache = {}
+
+        codes = {}
+        n_rows = len(next(iter(measures.values()))) if measures else len(next(iter(dimensions.values())))
+        key = np.zeros(n_rows, dtype='int64')
+        radix = 1
+        for name, values in dimensions.items():
+            dim_codes, uniques = pd.factorize(values, sort=True)
+            # Shift so that 0 marks a missing value
+            dim_codes = dim_codes.astype('int64') + 1
+            self.labels[name] = uniques
+            cardinality = len(uniques) + 1
+            if radix * cardinality >= MAX_KEY:
+                key = pd.factorize(key)[0].astype('int64')
+                radix = int(key.max()) + 1 if n_rows else 1
+            key = key * cardinality + dim_codes
+            radix *= cardinality
+            codes[name] = dim_codes
+
+        cell_ids, cells = pd.factorize(key)
+        n_cells = len(cells)
+        first_row = np.empty(n_cells, dtype='int64')
+        first_row[cell_ids[::-1]] = np.arange(n_rows - 1, -1, -1)
+
+        self.n_rows = n_rows
+        self.cell_codes = {name: dim_codes[first_row] for name, dim_codes in codes.items()}
+        self.cell_values = {
+            name: np.bincount(cell_ids, weights=np.nan_to_num(np.asarray(values, dtype='float64')),
+                              minlength=n_cells)
+            for name, values in measures.items()
+        }
+        self.cell_values['Rows'] = np.bincount(cell_ids, minlength=n_cells).astype('float64')
+        # Integer measures (and the row count) are reported as integers again
+        self.integer_measures = {name for name, values in measures.items()
+                                 if np.issubdtype(np.asarray(values).dtype, np.integer)} | {'Rows'}
+
+    @property
+    def n_cells(self):
+        return len(self.cell_values['Rows'])
+
+    def grand_total(self):
+        """Measure totals over all rows."""
+        return {name: int(values.sum()) if name in self.integer_measures else float(values.sum())
+                for name, values in self.cell_values.items()}
+
+    def grouping_set(self, dims):
+        """Measure totals per combination of dims, as a DataFrame with dims as columns."""
+        dims = tuple(dims)
+        if dims in self.cache:
+            return self.cache[dims]
+        if not dims:
+            result = pd.DataFrame([self.grand_total()])
+            self.cache[dims] = result
+            return result
+
+        key = np.zeros(self.n_cells, dtype='int64')
+        radix = 1
+        present = np.ones(self.n_cells, dtype=bool)
+        for name in dims:
+            dim_codes = self.cell_codes[name]
+            present &= dim_codes > 0
+            cardinality = len(self.labels[name]) + 1
+            if radix * cardinality >= MAX_KEY:
+                key = pd.factorize(key)[0].astype('int64')
+                radix = int(key.max()) + 1
+            key = key * cardinality + dim_codes
+            radix *= cardinality
+        group_ids, groups = pd.factorize(key[present])
+
+        columns = {}
+        kept = np.flatnonzero(present)
+        first_cell = np.empty(len(groups), dtype='int64')
+        first_cell[group_ids[::-1]] = kept[::-1]
+        for name in dims:
+            columns[name] = self.labels[name].take(self.cell_codes[name][first_cell] - 1)
+        for name, values in self.cell_values.items():
+            totals = np.bincount(group_ids, weights=values[present], minlength=len(groups))
+            columns[name] = totals.round().astype('int64') if name in self.integer_measures else totals
+
+        result = pd.DataFrame(columns)
+        self.cache[dims] = result
+        return result
+
+    def rollup(self, hierarchy):
+        """Grouping sets for every prefix of hierarchy, from the grand total down.
+
+        rollup(['Department', 'Product']) returns the grand total, the
+        per-department subtotals and the per-department-and-product rows.
+        """
+        hierarchy = tuple(hierarchy)
+        return {hierarchy[:level]: self.grouping_set(hierarchy[:level]) for level in range(len(hierarchy) + 1)}
@@ -1,90 +1,181 @@
+import argparse
+import importlib.util
+import os
+import time
+from concurrent.futures import as_completed
+
 import pandas as pd
 import plotly.express as px
-import plotly.io as pio
-from datetime import datetime
-
-# Read the sample data
-df = pd.read_excel('sample_paint_sales.xlsx')
-
-# 1. Overall Performance
-print("=== Overall Performance ===")
-total_revenue = df['Total Revenue'].sum()
-total_profit = df['Profit'].sum()
-total_units = df['Quantity Sold'].sum()
-profit_margin = (total_profit / total_revenue) * 100
-
-print(f"Total Revenue: ${total_revenue:,.2f}")
-print(f"Total Profit: ${total_profit:,.2f}")
-print(f"Total Units Sold: {total_units:,}")
-print(f"Overall Profit Margin: {profit_margin:.1f}%")
-
-# 2. Top Products
-print("\n=== Top 5 Products by Revenue ===")
-top_products = df.groupby('Product Name').agg({
-    'Total Revenue': 'sum',
-    'Quantity Sold': 'sum',
-    'Profit': 'sum'
-}).sort_values('Total Revenue', ascending=False).head(5)
-
-print(top_products)
-
-# Create and save top products chart
-fig_products = px.bar(top_products.reset_index(), 
-                     x='Product Name', 
-                     y='Total Revenue',
-                     title="Top 5 Products by Revenue")
-fig_products.write_html("top_products.html")
-
-# 3. Color Analysis
-print("\n=== Color Popularity ===")
-color_analysis = df.groupby('Color').agg({
-    'Total Revenue': 'sum',
-    'Quantity Sold': 'sum'
-}).sort_values('Quantity Sold', ascending=False)
-
-print(color_analysis)
-
-# Create and save color analysis chart
-fig_colors = px.pie(color_analysis.reset_index(), 
-                   values='Quantity Sold', 
-                   names='Color',
-                   title="Sales Distribution by Color")
-fig_colors.write_html("color_analysis.html")
-
-# 4. Monthly Trends
-df['Month'] = pd.to_datetime(df['Date']).dt.to_period('M')
-monthly_sales = df.groupby('Month').agg({
-    'Total Revenue': 'sum',
-    'Profit': 'sum'
-}).reset_index()
-monthly_sales['Month'] = monthly_sales['Month'].astype(str)
-
-print("\n=== Monthly Performance ===")
-print(monthly_sales)
-
-# Create and save monthly trends chart
-fig_trends = px.line(monthly_sales, 
-                    x='Month', 
-                    y=['Total Revenue', 'Profit'],
-                    title="Monthly Revenue and Profit Trends")
-fig_trends.write_html("monthly_trends.html")
-
-# 5. Brand Performance
-print("\n=== Brand Performance ===")
-brand_analysis = df.groupby('Brand').agg({
-    'Total Revenue': 'sum',
-    'Profit': 'sum',
-    'Quantity Sold': 'sum'
-}).sort_values('Total Revenue', ascending=False)
-brand_analysis['Profit Margin'] = (brand_analysis['Profit'] / brand_analysis['Total Revenue']) * 100
-
-print(brand_analysis)
-
-# Create and save brand analysis chart
-fig_brands = px.bar(brand_analysis.reset_index(),
-                   x='Brand',
-                   y=['Total Revenue', 'Profit'],
-                   title="Brand Performance Analysis")
-fig_brands.write_html("brand_analysis.html")
-
-print("\nAnalysis completed! Open the HTML files to view interactive charts.")
+
+from rollup import Rollup
+from shared_dataset import SharedDataset
+
+MEASURES = ['Total Revenue', 'Quantity Sold', 'Profit']
+DIMENSIONS = ['Product Name', 'Color', 'Month', 'Brand']
+REPORTS = ['top_products', 'color_analysis', 'monthly_trends', 'brand_analysis']
+
+
+def add_month(df):
+    if 'Month' not in df.columns:
+        df['Month'] = pd.to_datetime(df['Date'], format='mixed').dt.to_period('M')
+
+
+def aggregate(df, shared=None, pool=None):
+    """Build every report table from one shared pass over the data.
+
+    A Rollup sums the measures over all report dimensions at once; each
+    report is then one of its grouping sets. Given the SharedDataset of df
+    and its pool, the sums run in the worker processes instead, each over a
+    slice of the shared columns. A row missing one dimension (no colour,
+    say) still counts in the reports on the other dimensions.
+    """
+    add_month(df)
+    if shared is None:
+        rollup = Rollup({dim: df[dim] for dim in DIMENSIONS}, {measure: df[measure] for measure in MEASURES})
+
+        def grouping_set(dim, measures):
+            return rollup.grouping_set([dim]).set_index(dim)[measures]
+    else:
+        def grouping_set(dim, measures):
+            table = shared.group_sums(dim, measures, pool)
+            # Shared columns are float64; report integer measures as integers again
+            for measure in measures:
+                if pd.api.types.is_integer_dtype(df[measure]):
+                    table[measure] = table[measure].round().astype('int64')
+            return table
+
+    top_products = grouping_set('Product Name', MEASURES).nlargest(5, 'Total Revenue')
+
+    color_analysis = (grouping_set('Color', ['Total Revenue', 'Quantity Sold'])
+                      .sort_values('Quantity Sold', ascending=False))
+
+    monthly_sales = grouping_set('Month', ['Total Revenue', 'Profit']).sort_index().reset_index()
+    monthly_sales['Month'] = monthly_sales['Month'].astype(str)
+
+    brand_analysis = (grouping_set('Brand', ['Total Revenue', 'Profit', 'Quantity Sold'])
+                      .sort_values('Total Revenue', ascending=False))
+    brand_analysis['Profit Margin'] = (brand_analysis['Profit'] / brand_analysis['Total Revenue']) * 100
+
+    return {
+        'top_products': top_products,
+        'color_analysis': color_analysis,
+        'monthly_trends': monthly_sales,
+        'brand_analysis': brand_analysis
+    }
+
+
+def build_figure(name, table):
+    """Create the chart for one report table."""
+    if name == 'top_products':
+        return px.bar(table.reset_index(),
+                      x='Product Name',
+                      y='Total Revenue',
+                      title="Top 5 Products by Revenue")
+    if name == 'color_analysis':
+        return px.pie(table.reset_index(),
+                      values='Quantity Sold',
+                      names='Color',
+                      title="Sales Distribution by Color")
+    if name == 'monthly_trends':
+        return px.line(table,
+                       x='Month',
+                       y=['Total Revenue', 'Profit'],
+                       title="Monthly Revenue and Profit Trends")
+    if name == 'brand_analysis':
+        return px.bar(table.reset_index(),
+                      x='Brand',
+                      y=['Total Revenue', 'Profit'],
+                      title="Brand Performance Analysis")
+    raise ValueError(f"Unknown report: {name}")
+
+
+def render_report(name, table, output_format='html', output_dir='.'):
+    """Build, serialize and write one report. Runs in a worker process."""
+    start = time.perf_counter()
+    fig = build_figure(name, table)
+    path = os.path.join(output_dir, f"{name}.{output_format}")
+    if output_format == 'html':
+        fig.write_html(path)
+    else:
+        fig.write_image(path, format=output_format)
+    return name, path, time.perf_counter() - start
+
+
+def print_tables(df, tables):
+    # 1. Overall Performance
+    print("=== Overall Performance ===")
+    total_revenue = df['Total Revenue'].sum()
+    total_profit = df['Profit'].sum()
+    total_units = df['Quantity Sold'].sum()
+    profit_margin = (total_profit / total_revenue) * 100
+
+    print(f"Total Revenue: ${total_revenue:,.2f}")
+    print(f"Total Profit: ${total_profit:,.2f}")
+    print(f"Total Units Sold: {total_units:,}")
+    print(f"Overall Profit Margin: {profit_margin:.1f}%")
+
+    # 2. Top Products
+    print("\n=== Top 5 Products by Revenue ===")
+    print(tables['top_products'])
+
+    # 3. Color Analysis
+    print("\n=== Color Popularity ===")
+    print(tables['color_analysis'])
+
+    # 4. Monthly Trends
+    print("\n=== Monthly Performance ===")
+    print(tables['monthly_trends'])
+
+    # 5. Brand Performance
+    print("\n=== Brand Performance ===")
+    print(tables['brand_analysis'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the paint sales reports.")
+    parser.add_argument('data', nargs='?', default='sample_paint_sales.xlsx',
+                        help="Spreadsheet to analyse (default: sample_paint_sales.xlsx)")
+    parser.add_argument('--format', choices=['html', 'png', 'svg'], default='html',
+                        help="Chart output format; png/svg need the kaleido package")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of worker processes for aggregation and rendering (default: one per report)")
+    parser.add_argument('--output-dir', default='.', help="Directory for the chart files")
+    args = parser.parse_args()
+
+    if args.format != 'html' and importlib.util.find_spec('kaleido') is None:
+        parser.error(f"--format {args.format} requires kaleido (pip install kaleido)")
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    total_start = time.perf_counter()
+
+    # Read the sample data
+    df = pd.read_excel(args.data)
+
+    # The workers attach to the shared columns once instead of each receiving a copy of the data
+    add_month(df)
+    shared = SharedDataset.create(df, numeric=MEASURES, categorical=DIMENSIONS)
+    try:
+        with shared.executor(args.workers or len(REPORTS)) as pool:
+            start = time.perf_counter()
+            tables = aggregate(df, shared, pool)
+            aggregate_time = time.perf_counter() - start
+
+            print_tables(df, tables)
+
+            # Serialize and write the charts concurrently
+            print("\n=== Report Generation ===")
+            print(f"aggregation: {aggregate_time:.3f}s")
+            futures = [pool.submit(render_report, name, table, args.format, args.output_dir)
+                       for name, table in tables.items()]
+            for future in as_completed(futures):
+                name, path, elapsed = future.result()
+                print(f"{name}: {elapsed:.3f}s -> {path}")
+    finally:
+        shared.close()
+
+    print(f"total: {time.perf_counter() - total_start:.3f}s")
+    print(f"\nAnalysis completed! Open the {args.format.upper()} files to view the charts.")
+
+
+if __name__ == "__main__":
+    main()
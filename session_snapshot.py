@@ -0,0 +1,85 @@
+import gzip
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_PATH = os.path.join(os.path.expanduser('~'), '.paint_analytics', 'last_session.json.gz')
+
+
+def file_fingerprint(file_path):
+    """Return a cheap identity for a source file (path, size and modification time)."""
+    stat = os.stat(file_path)
+    return {
+        'path': os.path.abspath(file_path),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime
+    }
+
+
+def is_fresh(snapshot):
+    """Check whether the snapshot's source file is unchanged since it was taken."""
+    source = snapshot.get('source')
+    if not source or not os.path.exists(source['path']):
+        return False
+    try:
+        return file_fingerprint(source['path']) == source
+    except OSError:
+        return False
+
+
+def _encode_value(value):
+    if isinstance(value, pd.DataFrame):
+        return {'__frame__': json.loads(value.to_json(orient='split', date_format='iso'))}
+    if isinstance(value, dict):
+        return {key: _encode_value(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(val) for val in value]
+    if hasattr(value, 'item'):
+        # numpy scalars
+        return value.item()
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if '__frame__' in value:
+            frame = value['__frame__']
+            return pd.DataFrame(frame['data'], index=frame['index'], columns=frame['columns'])
+        return {key: _decode_value(val) for key, val in value.items()}
+    if isinstance(value, list):
+        return [_decode_value(val) for val in value]
+    return value
+
+
+def save_snapshot(state, path=SNAPSHOT_PATH):
+    """Write the dashboard state to a compressed JSON snapshot."""
+    payload = {
+        'version': SNAPSHOT_VERSION,
+        'saved_at': datetime.now().isoformat(timespec='seconds'),
+        'state': _encode_value(state)
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """Load a snapshot written by save_snapshot, or None if missing or unreadable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            payload = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Could not read session snapshot: {str(e)}")
+        return None
+    if payload.get('version') != SNAPSHOT_VERSION:
+        return None
+    state = _decode_value(payload['state'])
+    state['saved_at'] = payload.get('saved_at')
+    return state
@@ -0,0 +1,137 @@
+"""Share the cleaned dataset with worker processes without pickling it.
+
+The numeric columns and integer codes of the categorical columns are copied
+once into ``multiprocessing.shared_memory`` blocks. Workers attach to the
+blocks by name and wrap them in numpy arrays (no copy), then run the grouping
+kernels on their slice of rows. Only small per-group partial results travel
+back to the parent.
+
+    shared = SharedDataset.create(df, numeric=['Qty', 'Net Sales'], categorical=['Department'])
+    with shared.executor(workers=4) as pool:
+        by_dept = shared.group_sums('Department', ['Qty', 'Net Sales'], pool)
+    shared.close()
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# Arrays attached in a worker process, set by the pool initializer
+_worker_dataset = None
+
+
+class SharedDataset:
+    """Columns of a DataFrame held in shared memory blocks."""
+
+    def __init__(self, spec, blocks, owner):
+        self.spec = spec
+        self.blocks = blocks
+        self.owner = owner
+        self.arrays = {
+            col: np.ndarray((spec['rows'],), dtype=dtype, buffer=blocks[col].buf)
+            for col, (_, dtype) in spec['columns'].items()
+        }
+
+    @classmethod
+    def create(cls, df, numeric, categorical):
+        """Copy the given columns of df into new shared memory blocks.
+
+        Numeric columns are stored as float64 (NaN treated as 0 by the
+        kernels); categorical columns as int32 codes with their labels kept
+        in the spec.
+        """
+        spec = {'rows': len(df), 'columns': {}, 'labels': {}}
+        blocks = {}
+        sources = {}
+        for col in numeric:
+            sources[col] = np.nan_to_num(pd.to_numeric(df[col], errors='coerce').to_numpy(dtype='float64'))
+        for col in categorical:
+            codes, labels = pd.factorize(df[col], sort=True)
+            sources[col] = codes.astype('int32')
+            spec['labels'][col] = labels.tolist()
+
+        try:
+            for col, values in sources.items():
+                block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+                blocks[col] = block
+                np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[:] = values
+                spec['columns'][col] = (block.name, values.dtype.str)
+        except Exception:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+            raise
+        return cls(spec, blocks, owner=True)
+
+    @classmethod
+    def attach(cls, spec):
+        """Map existing blocks described by spec (in a worker process)."""
+        blocks = {col: shared_memory.SharedMemory(name=name) for col, (name, _) in spec['columns'].items()}
+        return cls(spec, blocks, owner=False)
+
+    @property
+    def rows(self):
+        return self.spec['rows']
+
+    def close(self):
+        """Release the mapping; the creating process also frees the memory."""
+        self.arrays = {}
+        for block in self.blocks.values():
+            block.close()
+            if self.owner:
+                block.unlink()
+        self.blocks = {}
+
+    def executor(self, workers=None):
+        """Process pool whose workers are attached to this dataset."""
+        return ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                   initializer=_attach_worker, initargs=(self.spec,))
+
+    def partitions(self, count):
+        """Split the rows into count contiguous (start, stop) ranges."""
+        bounds = np.linspace(0, self.rows, count + 1).astype(int)
+        return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+    def group_sums(self, key_col, value_cols, executor=None, partitions=None):
+        """Sum value_cols per value of key_col, one pool task per row partition.
+
+        Without an executor the kernel runs in this process over all rows.
+        """
+        n_groups = len(self.spec['labels'][key_col])
+        if executor is None:
+            totals = group_sum_kernel(self.arrays, key_col, value_cols, n_groups, 0, self.rows)
+        else:
+            count = partitions or os.cpu_count()
+            futures = [executor.submit(_partial_group_sums, key_col, value_cols, n_groups, start, stop)
+                       for start, stop in self.partitions(count)]
+            totals = sum(future.result() for future in futures)
+        return pd.DataFrame(totals.T, index=pd.Index(self.spec['labels'][key_col], name=key_col),
+                            columns=value_cols)
+
+
+def group_sum_kernel(arrays, key_col, value_cols, n_groups, start, stop):
+    """Per-group sums of value_cols over rows [start, stop), shape (values, groups)."""
+    codes = arrays[key_col][start:stop]
+    # Code -1 marks a missing category
+    valid = codes >= 0
+    has_missing = not valid.all()
+    if has_missing:
+        codes = codes[valid]
+    result = np.empty((len(value_cols), n_groups), dtype='float64')
+    for i, col in enumerate(value_cols):
+        values = arrays[col][start:stop]
+        if has_missing:
+            values = values[valid]
+        result[i] = np.bincount(codes, weights=values, minlength=n_groups)
+    return result
+
+
+def _attach_worker(spec):
+    global _worker_dataset
+    _worker_dataset = SharedDataset.attach(spec)
+
+
+def _partial_group_sums(key_col, value_cols, n_groups, start, stop):
+    return group_sum_kernel(_worker_dataset.arrays, key_col, value_cols, n_groups, start, stop)
@@ -0,0 +1,118 @@
+"""Simulate tills pushing transactions to the dashboard's live feed.
+
+Sends random sales lines dated today, in the columns the dashboard
+analyses, as newline-delimited JSON or CSV at a steady rate. Start the
+live feed in the dashboard first, then:
+
+    python simulate_pos_feed.py --address 127.0.0.1:9100 --rate 10000 --seconds 30
+
+--address may also be a named pipe path (a FIFO made with mkfifo, or
+\\\\.\\pipe\\name on Windows).
+"""
+import argparse
+import json
+import socket
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from live_feed import DEFAULT_FEED_ADDRESS, parse_address
+
+# Records are sent in this many bursts per second
+TICKS_PER_SECOND = 50
+
+# Distinct records generated and then sent in a loop
+POOL_SIZE = 10_000
+
+STORES = ['Nairobi CBD', 'Westlands', 'Mombasa Road', 'Kisumu', 'Nakuru']
+PRODUCTS = {
+    'Interior': ['Premium Interior Matte', 'Premium Interior Satin', 'Economy Interior Matte'],
+    'Exterior': ['Premium Exterior Flat', 'Premium Exterior Semi-Gloss', 'Economy Exterior Flat'],
+    'Specialty': ['Specialty Chalk Paint', 'Specialty Metal Paint'],
+    'Designer': ['Designer Collection Matte', 'Designer Collection Gloss']
+}
+BRANDS = ['ColorMaster', 'PaintPro', 'ArtisanHue', 'EcoPaint', 'LuxuryCoat']
+
+
+def make_records(n, seed=0):
+    """Random sales lines dated today."""
+    rng = np.random.default_rng(seed)
+    departments = rng.choice(list(PRODUCTS), n)
+    qty = rng.integers(1, 10, n)
+    price = rng.uniform(500, 5000, n).round(2)
+    cost = (price * rng.uniform(0.6, 0.8, n)).round(2)
+    discounts = np.where(rng.random(n) < 0.2, (qty * price * 0.05).round(2), 0)
+    net = (qty * price - discounts).round(2)
+    return pd.DataFrame({
+        'Date': date.today().isoformat(),
+        'Store': rng.choice(STORES, n),
+        'Department': departments,
+        'Category': departments,
+        'Brand': rng.choice(BRANDS, n),
+        'Product Description': [rng.choice(PRODUCTS[department]) for department in departments],
+        'Qty': qty,
+        'SP incl VAT': price,
+        'CP incl VAT': cost,
+        'Discounts': discounts,
+        'Net Sales': net,
+        'Cost of Sale': (qty * cost).round(2),
+        'Nt. Sl. Ls Vt': (net / 1.16).round(2)
+    })
+
+
+def encode_records(df, fmt):
+    """Encode the rows as lines of bytes; CSV output also returns the header line."""
+    if fmt == 'csv':
+        text = df.to_csv(index=False, lineterminator='\n')
+        header, _, body = text.partition('\n')
+        return (header + '\n').encode(), [line.encode() + b'\n' for line in body.splitlines()]
+    return b'', [json.dumps(record, default=str).encode() + b'\n' for record in df.to_dict('records')]
+
+
+def open_target(address):
+    endpoint = parse_address(address)
+    if endpoint is not None:
+        conn = socket.create_connection(endpoint)
+        return conn.sendall, conn.close
+    pipe = open(address, 'wb', buffering=0)
+    return pipe.write, pipe.close
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live POS feed simulator.")
+    parser.add_argument('--address', default=DEFAULT_FEED_ADDRESS,
+                        help=f"host:port of the live feed or a named pipe path (default: {DEFAULT_FEED_ADDRESS})")
+    parser.add_argument('--format', choices=['json', 'csv'], default='json')
+    parser.add_argument('--rate', type=int, default=10_000, help="Records per second (default: 10000)")
+    parser.add_argument('--seconds', type=float, default=30)
+    args = parser.parse_args()
+
+    header, lines = encode_records(make_records(POOL_SIZE), args.format)
+    print(f"Sending {args.format} records to {args.address} "
+          f"at {args.rate:,} records/s for {args.seconds:g}s")
+
+    send, close = open_target(args.address)
+    try:
+        send(header)
+        per_tick = args.rate / TICKS_PER_SECOND
+        sent = 0
+        start = time.perf_counter()
+        tick = 0
+        while time.perf_counter() - start < args.seconds:
+            tick += 1
+            due = int(tick * per_tick) - sent
+            chunk = b''.join(lines[(sent + i) % len(lines)] for i in range(due))
+            send(chunk)
+            sent += due
+            # Sleep until the next tick; a slow receiver just delays the sender
+            time.sleep(max(start + tick / TICKS_PER_SECOND - time.perf_counter(), 0))
+        elapsed = time.perf_counter() - start
+    finally:
+        close()
+    print(f"Sent {sent:,} records in {elapsed:.1f}s ({sent / elapsed:,.0f} records/s)")
+
+
+if __name__ == "__main__":
+    main()
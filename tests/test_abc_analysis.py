@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from abc_analysis import DateRangeTotals
+from paint_analytics import AnalyticsEngine
+
+
+@pytest.mark.parametrize('start, end', [
+    (None, None), ('2024-02-01', None), (None, '2024-02-15'), ('2024-01-10', '2024-03-01')])
+def test_date_range_totals_match_filter_date_range(start, end):
+    df = pd.DataFrame({
+        'Date': pd.to_datetime(['2024-01-05', None, '2024-02-10', '2024-03-20', None, '2024-02-01']),
+        'Product': ['A', 'A', 'B', 'A', 'B', 'B'],
+        'Net Sales': [10.0, 20.0, 30.0, 40.0, 50.0, 60.0]
+    })
+    totals = DateRangeTotals(df['Date'], df['Product'], df['Net Sales'])
+    # Moved from another range first, so the incremental path is used too
+    totals.update('2024-01-01', '2024-12-31')
+
+    mask = AnalyticsEngine().filter_date_range(df, 'Date', start, end)
+    expected = df[mask].groupby('Product')['Net Sales'].sum()
+    result = totals.update(start, end)
+    pd.testing.assert_series_equal(result.sort_index(), expected, check_names=False, check_index_type=False)
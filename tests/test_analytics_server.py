@@ -0,0 +1,53 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics_server import AnalyticsService
+
+
+def json_frame(df):
+    return pd.DataFrame(json.loads(df.to_json(orient='records')))
+
+
+@pytest.fixture(scope='module')
+def service(tmp_path_factory):
+    rng = np.random.default_rng(3)
+    n = 2000
+    qty = rng.integers(1, 10, n)
+    df = pd.DataFrame({
+        'Date': (pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 200, n), unit='D')).strftime('%Y-%m-%d'),
+        'Store': rng.choice(['Nairobi', 'Kisumu', 'Nakuru'], n),
+        'Department': rng.choice(['Interior', 'Exterior', 'Specialty'], n),
+        'Product Description': rng.choice([f'Paint {i:02d}' for i in range(25)], n),
+        'Qty': qty,
+        'Net Sales': (qty * rng.uniform(5, 80, n)).round(2),
+        'Cost of Sale': (qty * rng.uniform(3, 50, n)).round(2)
+    })
+    path = tmp_path_factory.mktemp('server') / 'sales.xlsx'
+    df.to_excel(path, index=False)
+    return AnalyticsService(str(path), workers=1)
+
+
+@pytest.mark.parametrize('params', [{}, {'store': 'Nairobi,Kisumu'}, {'start': '2024-02-10', 'end': '2024-05-20'}])
+def test_rollup_views_match_groupby(service, params):
+    df = service.select(params)
+    products, departments, columns = service.calculate_product_tables(df, top_n=10)
+    monthly = service.calculate_monthly_trend(df)
+
+    served = service.products(dict(params, top='10'))['rows']
+    pd.testing.assert_frame_equal(pd.DataFrame(served), json_frame(products), check_dtype=False)
+    served = service.departments(params)['rows']
+    pd.testing.assert_frame_equal(pd.DataFrame(served), json_frame(departments), check_dtype=False)
+    served = service.trend(params)['rows']
+    pd.testing.assert_frame_equal(pd.DataFrame(served), json_frame(monthly), check_dtype=False)
+
+
+def test_views_share_one_rollup_per_selection(service):
+    params = {'store': 'Nakuru'}
+    service.products(dict(params, top='5'))
+    rollup = service.rollups[tuple(sorted(params.items()))]
+    service.departments(params)
+    service.trend(params)
+    assert service.rollups[tuple(sorted(params.items()))] is rollup
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bitmap_index import BitmapIndex
+from paint_analytics import PaintAnalyticsApp
+
+# Not a multiple of 8, so the last packed byte has padding bits
+N_ROWS = 1003
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(8)
+    stores = rng.choice(['Nairobi', 'Kisumu', 'Nakuru', 'Eldoret'], N_ROWS).astype(object)
+    stores[rng.random(N_ROWS) < 0.03] = None
+    return pd.DataFrame({
+        'Store': stores,
+        'Brand': rng.choice(['Crown', 'Sadolin', 'Basco'], N_ROWS),
+        'Department': pd.Categorical(rng.choice(['Interior', 'Exterior'], N_ROWS)),
+        'Net Sales': rng.uniform(1, 100, N_ROWS)
+    })
+
+
+def test_bitsets_match_pandas_masks(df):
+    index = BitmapIndex(df, ['Store', 'Brand', 'Department'])
+    assert index.values('Store') == ['Eldoret', 'Kisumu', 'Nairobi', 'Nakuru']
+    for col in index.columns():
+        for value in index.values(col):
+            np.testing.assert_array_equal(index.to_mask(index.bitmap(col, value)), (df[col] == value).to_numpy())
+
+    stores = index.any_of('Store', ['Nairobi', 'Kisumu', 'Nowhere'])
+    np.testing.assert_array_equal(index.to_mask(stores), df['Store'].isin(['Nairobi', 'Kisumu']).to_numpy())
+    brands = index.any_of('Brand', ['Crown'])
+    both = index.all_of(stores, brands)
+    expected = df['Store'].isin(['Nairobi', 'Kisumu']) & (df['Brand'] == 'Crown')
+    np.testing.assert_array_equal(index.to_mask(both), expected.to_numpy())
+    assert index.count(both) == expected.sum()
+
+    # Rows with a missing store are in no store bitset, so NOT includes them
+    others = index.invert(stores)
+    np.testing.assert_array_equal(index.to_mask(others), (~df['Store'].isin(['Nairobi', 'Kisumu'])).to_numpy())
+    assert index.count(others) == N_ROWS - index.count(stores)
+    assert index.count(index.invert(index.empty())) == N_ROWS
+    assert index.count(index.invert(index.full())) == 0
+    assert index.count(index.all_of()) == N_ROWS
+
+
+def test_select_ors_within_and_ands_across_columns(df):
+    index = BitmapIndex(df, ['Store', 'Brand', 'Department'])
+    filters = {'Store': ['Nakuru', 'Eldoret'], 'Brand': ['Crown', 'Basco'], 'Department': ['Exterior']}
+    expected = np.ones(N_ROWS, dtype=bool)
+    for col, values in filters.items():
+        expected &= df[col].isin(values).to_numpy()
+    bits = index.select(filters)
+    np.testing.assert_array_equal(index.to_mask(bits), expected)
+    assert index.count(bits) == expected.sum()
+
+
+class Ticked:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def test_dimension_mask_with_several_values_per_dimension(df):
+    app = PaintAnalyticsApp.__new__(PaintAnalyticsApp)
+    app.df = df
+    app.filter_columns = {'Store': 'Store', 'Brand': 'Brand', 'Department': 'Department'}
+    app.filter_index = BitmapIndex(df, list(app.filter_columns.values()))
+    chosen = {'Store': ['Nairobi', 'Nakuru', 'Eldoret'], 'Brand': ['Crown', 'Sadolin']}
+    app.filter_vars = {dimension: {value: Ticked(value in chosen.get(dimension, []))
+                                   for value in app.filter_index.values(col)}
+                       for dimension, col in app.filter_columns.items()}
+
+    expected = df['Store'].isin(chosen['Store']) & df['Brand'].isin(chosen['Brand'])
+    np.testing.assert_array_equal(app.dimension_mask(), expected.to_numpy())
+
+    for values in app.filter_vars.values():
+        for var in values.values():
+            var.value = False
+    assert app.dimension_mask() is None
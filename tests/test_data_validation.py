@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+from data_validation import validate_dataset, format_report
+
+
+def clean_frame():
+    return pd.DataFrame({
+        'Date': pd.to_datetime(['2024-01-03', '2024-01-15', '2024-02-10', '2024-02-27']),
+        'Product Description': ['Matte', 'Gloss', 'Satin', 'Matte'],
+        'Qty': [2, 1, 3, 5],
+        'SP incl VAT': [100.0, 250.0, 80.0, 100.0],
+        'Discounts': [0.0, 10.0, np.nan, 25.0],
+        'Net Sales': [200.0, 240.0, 240.0, 475.0]
+    })
+
+
+def checks(df, **kwargs):
+    report = validate_dataset(df, date_col='Date', **kwargs)
+    return {name: result['count'] for name, result in report['checks'].items()}
+
+
+def test_clean_frame_reports_nothing():
+    report = validate_dataset(clean_frame(), date_col='Date')
+    assert report['rows'] == 4
+    assert report['checks'] == {}
+    assert report['date_range'] == ('2024-01-01', '2024-02-29')
+    assert "No problems found." in format_report(report)
+
+
+def test_unparseable_values():
+    df = clean_frame()
+    df.loc[1, 'Qty'] = np.nan
+    unparseable = {'Qty': np.array([False, True, False, False])}
+    report = validate_dataset(df, unparseable, date_col='Date')
+    assert report['checks'] == {'Unparseable Qty': {'count': 1, 'rows': [1]}}
+
+
+def test_negative_quantities_and_sales():
+    df = clean_frame()
+    df.loc[0, ['Qty', 'Net Sales']] = [-2, -200.0]
+    df.loc[2, 'Net Sales'] = -240.0
+    df.loc[2, 'SP incl VAT'] = -80.0
+    assert checks(df) == {'Negative Qty': 1, 'Negative Net Sales': 2}
+
+
+def test_duplicated_rows():
+    df = clean_frame()
+    df = pd.concat([df, df.iloc[[0, 0, 3]]], ignore_index=True)
+    report = validate_dataset(df, date_col='Date')
+    assert report['checks'] == {'Duplicate transactions': {'count': 3, 'rows': [4, 5, 6]}}
+
+
+def test_missing_dates():
+    df = clean_frame()
+    df.loc[2, 'Date'] = pd.NaT
+    assert checks(df) == {'Missing or unparseable Date': 1}
+
+
+def test_dates_outside_the_file_range():
+    df = clean_frame()
+    report = validate_dataset(df, date_col='Date',
+                              date_range=(pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-31 23:59:59')))
+    assert report['checks'] == {'Date outside file range': {'count': 2, 'rows': [2, 3]}}
+
+
+def test_net_sales_mismatch_tolerance():
+    df = pd.concat([clean_frame()] * 2, ignore_index=True)
+    df['Date'] = pd.Timestamp('2024-01-10')
+    df['Product Description'] = [f'Paint {i}' for i in range(len(df))]
+    # Allowed off by 0.05 + 0.5% of the expected value: 1.05 at 200, 1.25 at 240
+    df.loc[0, 'Net Sales'] = 201.04
+    df.loc[1, 'Net Sales'] = 240.0 - 1.3
+    df.loc[4, 'Net Sales'] = 200.0 - 1.04
+    df.loc[5, 'Net Sales'] = 240.0 + 1.3
+    df.loc[6, 'Net Sales'] = np.nan
+    report = validate_dataset(df, date_col='Date')
+    assert report['checks'] == {'Net Sales != Qty x SP incl VAT - Discounts': {'count': 2, 'rows': [1, 5]}}
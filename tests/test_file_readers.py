@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+import file_readers
+from file_readers import FileReader, choose_reader, supported_extensions
+
+
+def make_reader(name, rank, installed=True):
+    return type(name, (FileReader,), {'name': name, 'extensions': ('.dat',), 'rank': rank,
+                                      'requires': () if installed else (f'missing_{name}',)})
+
+
+def test_choose_reader_picks_fastest_installed(monkeypatch):
+    fast_missing = make_reader('fast', 1, installed=False)
+    medium = make_reader('medium', 20)
+    slow = make_reader('slow', 60)
+    monkeypatch.setattr(file_readers, 'READERS', [slow, fast_missing, medium])
+
+    assert choose_reader('sales.DAT').name == 'medium'
+    assert choose_reader('sales.dat', 'slow').name == 'slow'
+    with pytest.raises(ValueError):
+        choose_reader('sales.dat', 'fast')
+
+
+def test_uninstalled_xls_error_lists_supported_extensions(monkeypatch):
+    monkeypatch.setattr(file_readers.CalamineReader, 'available', classmethod(lambda cls: False))
+    monkeypatch.setattr(file_readers.XlrdReader, 'available', classmethod(lambda cls: False))
+    with pytest.raises(ValueError) as error:
+        choose_reader('old_sales.xls')
+    message = str(error.value)
+    assert 'install python_calamine or xlrd' in message
+    assert f"Supported files: {', '.join(supported_extensions())}" in message
+    assert '.csv' in message
+
+
+def test_unsupported_extension_error_lists_supported_extensions():
+    with pytest.raises(ValueError) as error:
+        choose_reader('notes.txt')
+    assert 'install' not in str(error.value)
+    assert f"Supported files: {', '.join(supported_extensions())}" in str(error.value)
+
+
+def test_openpyxl_reader_matches_read_excel_across_chunks(tmp_path, monkeypatch):
+    pytest.importorskip('openpyxl')
+    df = pd.DataFrame({
+        'Date': pd.date_range('2024-01-01', periods=23, freq='D'),
+        'Store': [f'Store {i % 3}' for i in range(23)],
+        'Qty': range(23),
+        'Net Sales': [i * 1.5 for i in range(23)]
+    })
+    path = tmp_path / 'sales.xlsx'
+    df.to_excel(path, index=False)
+    monkeypatch.setattr(file_readers, 'OPENPYXL_CHUNK_ROWS', 5)
+
+    result = file_readers.OpenpyxlReader().read(str(path))
+    pd.testing.assert_frame_equal(result, pd.read_excel(path), check_dtype=False)
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from forecasting import build_series_matrix
+
+
+def make_sales():
+    return pd.DataFrame({
+        'Date': pd.to_datetime(['2024-01-05', '2024-02-10', '2024-01-20', '2024-03-01', None, None, '2024-02-02']),
+        'Product': ['Matte', 'Matte', 'Gloss', np.nan, 'Satin', 'Satin', 'Gloss'],
+        'Store': ['Nairobi', 'Nairobi', 'Kisumu', 'Kisumu', 'Nairobi', 'Kisumu', 'Kisumu'],
+        'Qty': [1, 2, 3, 4, 5, 6, 7]
+    })
+
+
+def test_blank_product_is_left_out():
+    matrix, keys, months = build_series_matrix(make_sales(), ['Product', 'Store'], 'Date', 'Qty')
+    assert keys['Product'].notna().all()
+    assert matrix.sum() == 1 + 2 + 3 + 7
+
+
+def test_group_with_only_undated_rows_is_left_out():
+    matrix, keys, months = build_series_matrix(make_sales(), ['Product', 'Store'], 'Date', 'Qty')
+    assert len(keys) == len(matrix) == 2
+    assert 'Satin' not in set(keys['Product'])
+    by_product = dict(zip(keys['Product'], matrix.tolist()))
+    assert list(months.astype(str)) == ['2024-01', '2024-02']
+    assert by_product == {'Matte': [1.0, 2.0], 'Gloss': [3.0, 7.0]}
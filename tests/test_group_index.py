@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from group_index import GroupIndex, GroupIndexCache, totals_by, daily_totals
+
+
+def make_sales(n=1000, seed=2):
+    rng = np.random.default_rng(seed)
+    department = rng.choice(['Interior', 'Exterior', 'Specialty', None], n).astype(object)
+    dates = pd.Series(pd.Timestamp('2024-03-01') + pd.to_timedelta(rng.integers(0, 40 * 24, n), unit='h'))
+    dates[rng.random(n) < 0.05] = pd.NaT
+    net_sales = rng.uniform(1, 100, n).round(2)
+    net_sales[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame({'Department': department, 'Date': dates,
+                         'Qty': rng.integers(1, 10, n), 'Net Sales': net_sales})
+
+
+def test_rows_are_the_group_positions():
+    df = make_sales()
+    index = GroupIndex(df['Department'])
+    for label, group in df.groupby('Department').groups.items():
+        np.testing.assert_array_equal(index.rows(label), df.index.get_indexer(group))
+    assert len(index.rows('Missing')) == 0
+
+
+def test_totals_by_matches_groupby():
+    df = make_sales()
+    index = GroupIndex(df['Department'])
+    measures = {'Net Sales': df['Net Sales'].to_numpy(), 'Qty': df['Qty'].to_numpy()}
+    for rows in [np.arange(len(df)), np.flatnonzero(df['Qty'].to_numpy() > 4)]:
+        subset = df.iloc[rows]
+        expected = subset.groupby('Department').agg(**{'Net Sales': ('Net Sales', 'sum'), 'Qty': ('Qty', 'sum'),
+                                                       'Rows': ('Qty', 'size')})
+        expected = expected.sort_values('Net Sales', ascending=False).reset_index()
+        table = totals_by(index, rows, measures)
+        assert table['Group'].tolist() == expected['Department'].tolist()
+        np.testing.assert_allclose(table['Net Sales'], expected['Net Sales'])
+        np.testing.assert_allclose(table['Qty'], expected['Qty'])
+        np.testing.assert_array_equal(table['Rows'], expected['Rows'])
+
+
+def test_daily_totals_matches_groupby():
+    df = make_sales()
+    rows = GroupIndex(df['Department']).rows('Exterior')
+    daily = daily_totals(df['Date'].to_numpy(), rows, {'Net Sales': df['Net Sales'].to_numpy()})
+
+    subset = df.iloc[rows]
+    expected = subset.groupby(subset['Date'].dt.floor('D'))['Net Sales'].sum()
+    np.testing.assert_array_equal(daily['Date'].to_numpy(), expected.index.to_numpy().astype('datetime64[D]'))
+    np.testing.assert_allclose(daily['Net Sales'], expected.to_numpy())
+
+
+def test_cache_rebuilds_after_dataset_version_changes():
+    df = make_sales()
+    cache = GroupIndexCache()
+    first = cache.get(df, 'Department', 1)
+    assert cache.get(df, 'Department', 1) is first
+
+    df = pd.concat([df, pd.DataFrame({'Department': ['Tools'], 'Qty': [1], 'Net Sales': [5.0]})],
+                   ignore_index=True)
+    rebuilt = cache.get(df, 'Department', 2)
+    assert rebuilt is not first
+    np.testing.assert_array_equal(rebuilt.rows('Tools'), [len(df) - 1])
@@ -0,0 +1,83 @@
+import errno
+import json
+import os
+import socket
+import threading
+import time
+
+from live_feed import LiveFeed
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def test_batches_records_and_forgets_closed_connections():
+    batches = []
+    received = threading.Event()
+
+    def on_batch(df, skipped):
+        batches.append((df, skipped))
+        if sum(len(batch) for batch, _ in batches) == 30:
+            received.set()
+
+    port = free_port()
+    feed = LiveFeed(f"127.0.0.1:{port}", on_batch, batch_records=10, batch_seconds=0.1)
+    feed.start()
+    try:
+        for till in range(3):
+            with socket.create_connection(('127.0.0.1', port)) as conn:
+                lines = [json.dumps({'Date': '2024-01-05', 'Qty': i, 'Net Sales': 10.0}) for i in range(10)]
+                conn.sendall(('\n'.join(lines) + '\nnot json\n').encode())
+        assert received.wait(5)
+        deadline = time.monotonic() + 5
+        while feed.connections and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert feed.connections == []
+        assert sum(skipped for _, skipped in batches) == 3
+    finally:
+        feed.stop()
+
+
+def test_stop_flushes_the_pending_batch():
+    batches = []
+    port = free_port()
+    feed = LiveFeed(f"127.0.0.1:{port}", lambda df, skipped: batches.append(df),
+                    batch_records=1000, batch_seconds=60)
+    feed.start()
+    with socket.create_connection(('127.0.0.1', port)) as conn:
+        lines = [json.dumps({'Date': '2024-01-05', 'Qty': i}) for i in range(5)]
+        conn.sendall(('\n'.join(lines) + '\n').encode())
+        time.sleep(0.3)
+        feed.stop()
+    assert sum(len(df) for df in batches) == 5
+
+
+def test_stop_wakes_and_flushes_a_named_pipe(tmp_path):
+    path = str(tmp_path / 'feed')
+    os.mkfifo(path)
+    batches = []
+    feed = LiveFeed(path, lambda df, skipped: batches.append(df), batch_records=1000, batch_seconds=60)
+
+    # Stopped while still waiting for a writer to open the pipe
+    feed.start()
+    time.sleep(0.2)
+    feed.stop()
+    time.sleep(0.2)
+    try:
+        os.close(os.open(path, os.O_WRONLY | os.O_NONBLOCK))
+        reader_left = False
+    except OSError as e:
+        reader_left = e.errno == errno.ENXIO
+    assert reader_left
+
+    # Stopped while a writer holds the pipe open with records still batching
+    feed = LiveFeed(path, lambda df, skipped: batches.append(df), batch_records=1000, batch_seconds=60)
+    feed.start()
+    with open(path, 'wb', buffering=0) as pipe:
+        pipe.write(b''.join(json.dumps({'Qty': i}).encode() + b'\n' for i in range(4)))
+        time.sleep(0.3)
+        feed.stop()
+    assert sum(len(df) for df in batches) == 4
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from paint_analytics import AnalyticsEngine
+from period_comparison import comparison_windows, compare_periods, monthly_growth
+
+
+def make_sales(seed=4):
+    rng = np.random.default_rng(seed)
+    days = pd.date_range('2023-01-01', '2024-12-31', freq='D')
+    n = 6000
+    df = pd.DataFrame({
+        'Date': rng.choice(days, n),
+        'Department': rng.choice(['Interior', 'Exterior', 'Specialty'], n),
+        'Net Sales': rng.uniform(1, 100, n).round(2)
+    })
+    # A department that only sells in the current windows below
+    df.loc[df['Date'] >= '2024-06-01', 'Department'] = df['Department'].where(rng.random(n) < 0.9, 'Tools')
+    return df
+
+
+# (start, end, previous window, last-year window), all inclusive
+CASES = [
+    ('2024-03-01', '2024-03-31', ('2024-02-01', '2024-02-29'), ('2023-03-01', '2023-03-31')),
+    ('2024-03-01', '2024-04-30', ('2024-01-01', '2024-02-29'), ('2023-03-01', '2023-04-30')),
+    ('2024-02-01', '2024-02-29', ('2024-01-01', '2024-01-31'), ('2023-02-01', '2023-02-28')),
+    ('2024-02-20', '2024-02-28', ('2024-02-11', '2024-02-19'), ('2023-02-20', '2023-02-28')),
+    ('2024-02-29', '2024-03-06', ('2024-02-22', '2024-02-28'), ('2023-02-28', '2023-03-06')),
+    ('2024-01-31', '2024-02-01', ('2024-01-29', '2024-01-30'), ('2023-01-31', '2023-02-01')),
+    ('2024-07-15', '2024-08-14', ('2024-06-14', '2024-07-14'), ('2023-07-15', '2023-08-14')),
+]
+
+
+@pytest.mark.parametrize('start, end, previous, last_year', CASES)
+def test_windows_match_filter_date_range(start, end, previous, last_year):
+    engine = AnalyticsEngine()
+    df = make_sales()
+    windows, totals, tables = compare_periods(df['Date'], {'Department': df['Department']}, df['Net Sales'],
+                                              start, end)
+
+    def window_totals(lo, hi):
+        rows = df[engine.filter_date_range(df, 'Date', lo, hi)]
+        return rows.groupby('Department')['Net Sales'].sum()
+
+    current = window_totals(start, end)
+    expected = pd.DataFrame({'Current': current, 'Previous': window_totals(*previous),
+                             'Last Year': window_totals(*last_year)}).fillna(0)
+    table = tables['Department']
+    assert set(table.index) == set(expected.index)
+    for name in ['Current', 'Previous', 'Last Year']:
+        np.testing.assert_allclose(table[name], expected.loc[table.index, name])
+        assert totals[name] == pytest.approx(expected[name].sum())
+    assert table['Current'].is_monotonic_decreasing
+
+
+def test_previous_window_without_rows_has_no_growth():
+    dates = pd.Series(pd.to_datetime(['2024-05-03', '2024-05-20', '2023-05-10']))
+    windows, totals, tables = compare_periods(dates, {'Department': pd.Series(['A', 'B', 'A'])},
+                                              pd.Series([10.0, 5.0, 4.0]), '2024-05-01', '2024-05-31')
+    assert totals['Previous'] == 0 and np.isnan(totals['Change %'])
+    table = tables['Department']
+    assert table['Change %'].isna().all()
+    assert table.loc['A', 'YoY %'] == pytest.approx(150.0)
+    assert np.isnan(table.loc['B', 'YoY %'])
+
+
+def test_leap_day_year_on_year_windows():
+    windows = comparison_windows('2024-02-29', '2024-02-29')
+    assert windows['Last Year'] == (np.datetime64('2023-02-28'), np.datetime64('2023-03-01'))
+    windows = comparison_windows('2024-02-20', '2024-02-28')
+    assert windows['Last Year'] == (np.datetime64('2023-02-20'), np.datetime64('2023-03-01'))
+
+
+def test_monthly_growth_matches_groupby():
+    df = make_sales()
+    # Leave a gap month, which still counts as a month of zero sales
+    df = df[df['Date'].dt.to_period('M') != pd.Period('2024-04', 'M')]
+    growth = monthly_growth(df['Date'], df['Net Sales'])
+
+    monthly = df.groupby(df['Date'].dt.to_period('M'))['Net Sales'].sum()
+    monthly = monthly.reindex(pd.period_range(monthly.index.min(), monthly.index.max(), freq='M'), fill_value=0)
+    assert growth['Month'].tolist() == monthly.index.astype(str).tolist()
+    np.testing.assert_allclose(growth['Total'], monthly.to_numpy())
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mom = (monthly / monthly.shift(1) - 1) * 100
+        yoy = (monthly / monthly.shift(12) - 1) * 100
+    mom[monthly.shift(1) == 0] = np.nan
+    np.testing.assert_allclose(growth['MoM %'], mom.to_numpy())
+    np.testing.assert_allclose(growth['YoY %'], yoy.to_numpy())
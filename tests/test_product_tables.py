@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from paint_analytics import AnalyticsEngine
+
+
+def make_sales(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    qty = rng.integers(1, 10, n)
+    return pd.DataFrame({
+        'Date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n), unit='D'),
+        # Listed so that first-seen order differs from revenue order
+        'Department': rng.choice(['Z Tools', 'B Interior', 'M Exterior', 'A Specialty'], n, p=[0.1, 0.4, 0.3, 0.2]),
+        'Product Description': rng.choice([f'Paint {i:02d}' for i in range(40)], n),
+        'Qty': qty,
+        'Net Sales': (qty * rng.uniform(5, 80, n)).round(2),
+        'Cost of Sale': (qty * rng.uniform(3, 50, n)).round(2)
+    })
+
+
+def test_rollup_and_groupby_tables_match():
+    engine = AnalyticsEngine()
+    df = make_sales()
+    products, departments, columns = engine.calculate_product_tables(df)
+    rolled_products, rolled_departments, _ = engine.calculate_product_tables(df, rollup=engine.build_rollup(df))
+
+    assert rolled_departments[columns['department']].tolist() == departments[columns['department']].tolist()
+    pd.testing.assert_frame_equal(rolled_departments.reset_index(drop=True), departments.reset_index(drop=True),
+                                  check_dtype=False)
+    pd.testing.assert_frame_equal(rolled_products.reset_index(drop=True), products.reset_index(drop=True),
+                                  check_dtype=False)
+
+
+def test_departments_sorted_by_revenue():
+    engine = AnalyticsEngine()
+    df = make_sales()
+    _, departments, columns = engine.calculate_product_tables(df, rollup=engine.build_rollup(df))
+    assert departments[columns['revenue']].is_monotonic_decreasing
+
+
+def test_categorical_columns_list_only_observed_groups():
+    engine = AnalyticsEngine()
+    df = make_sales()
+    # As stored by the memory budget, plus a category with no rows
+    df['Department'] = df['Department'].astype(pd.CategoricalDtype(
+        sorted(df['Department'].unique()) + ['Unused']))
+    df['Product Description'] = df['Product Description'].astype('category')
+    products, departments, columns = engine.calculate_product_tables(df)
+    assert 'Unused' not in set(departments['Department'])
+    assert len(products) == df['Product Description'].nunique()
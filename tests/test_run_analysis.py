@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from run_analysis import DIMENSIONS, MEASURES, add_month, aggregate
+from shared_dataset import SharedDataset
+
+
+def test_rows_missing_a_dimension_stay_in_the_other_reports():
+    df = pd.DataFrame({
+        'Date': ['2024-01-05', '2024-01-06', '2024-02-01'],
+        'Product Name': ['Matte', 'Matte', 'Gloss'],
+        'Color': ['White', np.nan, 'Blue'],
+        'Brand': ['PaintPro', 'PaintPro', None],
+        'Total Revenue': [100.0, 50.0, 30.0],
+        'Quantity Sold': [2, 1, 1],
+        'Profit': [20.0, 10.0, 6.0]
+    })
+    tables = aggregate(df)
+
+    assert tables['top_products'].loc['Matte', 'Total Revenue'] == 150.0
+    assert tables['monthly_trends']['Total Revenue'].tolist() == [150.0, 30.0]
+    assert tables['brand_analysis'].loc['PaintPro', 'Total Revenue'] == 150.0
+    # The missing values themselves are not reported as a group
+    assert tables['color_analysis']['Total Revenue'].sum() == 130.0
+
+
+def test_shared_memory_pool_matches_in_process_aggregation():
+    rng = np.random.default_rng(0)
+    n = 2000
+    df = pd.DataFrame({
+        'Date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n), unit='D'),
+        'Product Name': rng.choice(['Matte', 'Gloss', 'Satin'], n),
+        'Color': rng.choice(['White', 'Blue', None], n),
+        'Brand': rng.choice(['PaintPro', 'EcoPaint'], n),
+        'Total Revenue': rng.uniform(10, 100, n).round(2),
+        'Quantity Sold': rng.integers(1, 5, n),
+        'Profit': rng.uniform(1, 10, n).round(2)
+    })
+    expected = aggregate(df.copy())
+
+    add_month(df)
+    shared = SharedDataset.create(df, numeric=MEASURES, categorical=DIMENSIONS)
+    try:
+        with shared.executor(2) as pool:
+            tables = aggregate(df, shared, pool)
+    finally:
+        shared.close()
+
+    for name, table in expected.items():
+        pd.testing.assert_frame_equal(tables[name], table, check_names=False, check_index_type=False)
@@ -0,0 +1,97 @@
+import gzip
+import json
+import os
+import queue
+
+import numpy as np
+import pandas as pd
+
+import session_snapshot
+from memory_budget import MemoryBudget
+from paint_analytics import PaintAnalyticsApp
+from session_snapshot import (_encode_value, _decode_value, file_fingerprint, is_fresh,
+                              load_snapshot, save_snapshot)
+
+
+def make_state():
+    return {
+        'metrics': {'Total Revenue': np.float64(1234.5), 'Total Units Sold': np.int64(42),
+                    'Profit Margin (%)': np.float32(12.5)},
+        'products': pd.DataFrame({'Product Description': ['Matte', 'Gloss'], 'Qty': [3, 1],
+                                  'Net Sales': [300.25, 99.5]}),
+        'nested': {'windows': [np.int32(1), 2.5, 'text', None], 'flags': {'top_n': np.bool_(True)}},
+        'view': 'Product Analysis'
+    }
+
+
+def test_encoded_values_round_trip_through_json():
+    state = make_state()
+    decoded = _decode_value(json.loads(json.dumps(_encode_value(state))))
+
+    pd.testing.assert_frame_equal(decoded['products'], state['products'])
+    assert decoded['metrics'] == {'Total Revenue': 1234.5, 'Total Units Sold': 42, 'Profit Margin (%)': 12.5}
+    assert type(decoded['metrics']['Total Units Sold']) is int
+    assert decoded['nested'] == {'windows': [1, 2.5, 'text', None], 'flags': {'top_n': True}}
+    assert decoded['view'] == 'Product Analysis'
+
+
+def test_save_and_load_snapshot(tmp_path):
+    path = str(tmp_path / 'session' / 'last_session.json.gz')
+    save_snapshot(make_state(), path)
+    loaded = load_snapshot(path)
+    pd.testing.assert_frame_equal(loaded['products'], make_state()['products'])
+    assert loaded['metrics']['Total Revenue'] == 1234.5
+    assert loaded['saved_at']
+    assert not os.path.exists(path + '.tmp')
+
+
+def test_missing_unreadable_or_other_version_snapshot_is_none(tmp_path):
+    assert load_snapshot(str(tmp_path / 'missing.json.gz')) is None
+
+    path = str(tmp_path / 'broken.json.gz')
+    with open(path, 'wb') as f:
+        f.write(b'not gzip')
+    assert load_snapshot(path) is None
+
+    path = str(tmp_path / 'old.json.gz')
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump({'version': session_snapshot.SNAPSHOT_VERSION + 1, 'state': {}}, f)
+    assert load_snapshot(path) is None
+
+
+def test_is_fresh_until_the_source_changes(tmp_path):
+    source = tmp_path / 'sales.csv'
+    source.write_text('Date,Qty\n2024-01-01,1\n')
+    snapshot = {'source': file_fingerprint(str(source))}
+    assert is_fresh(snapshot)
+
+    source.write_text('Date,Qty\n2024-01-01,1\n2024-01-02,2\n')
+    assert not is_fresh(snapshot)
+
+    snapshot = {'source': file_fingerprint(str(source))}
+    os.utime(source, (0, 0))
+    assert not is_fresh(snapshot)
+
+    source.unlink()
+    assert not is_fresh(snapshot)
+    assert not is_fresh({})
+
+
+def test_snapshot_verification_loads_with_its_own_memory_budget(tmp_path):
+    source = tmp_path / 'sales.xlsx'
+    pd.DataFrame({'Date': ['2024-01-05', '2024-02-10'], 'Product Description': ['Matte', 'Gloss'],
+                  'Qty': [2, 1], 'Net Sales': [200.0, 99.5]}).to_excel(source, index=False)
+
+    app = PaintAnalyticsApp.__new__(PaintAnalyticsApp)
+    app.background_results = queue.Queue()
+    # The dataset the user loaded meanwhile, partly spilled to disk
+    app.memory = MemoryBudget(spill_dir=str(tmp_path))
+    loaded = app.memory.spill(pd.DataFrame({'Net Sales': np.arange(100.0)}), ['Net Sales'])
+    spill_files = list(app.memory.spill_files)
+
+    app.verify_snapshot({'source': file_fingerprint(str(source))})
+    kind, (file_path, df, report, memory) = app.background_results.get_nowait()
+    assert kind == 'fresh' and len(df) == 2
+    assert memory is not app.memory
+    assert app.memory.spill_files == spill_files and all(os.path.exists(path) for path in spill_files)
+    assert loaded['Net Sales'].sum() == 4950.0
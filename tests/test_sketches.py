@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import sketches
+from paint_analytics import AnalyticsEngine
+from sketches import SpaceSaving, CountMinSketch, ProductSketch, QuantileSketch
+
+
+def skewed_stream(n=60_000, items=3000, seed=5):
+    rng = np.random.default_rng(seed)
+    # Zipf-like popularity, so a few products carry most of the revenue
+    popularity = 1 / np.arange(1, items + 1) ** 1.2
+    labels = np.array([f'Product {i:04d}' for i in range(items)])
+    products = labels[rng.choice(items, n, p=popularity / popularity.sum())]
+    weights = rng.uniform(1, 50, n).round(2)
+    return products, weights
+
+
+def true_totals(products, weights):
+    return pd.Series(weights).groupby(products).sum()
+
+
+def feed(sketch, products, weights, batch=5000):
+    for start in range(0, len(products), batch):
+        sketch.update(products[start:start + batch], weights[start:start + batch])
+    return sketch
+
+
+def assert_space_saving_bounds(sketch, truth):
+    top = sketch.top(len(sketch.counts))
+    actual = truth.reindex(top.index, fill_value=0).to_numpy()
+    assert (top['estimate'].to_numpy() >= actual - 1e-6).all()
+    assert (top['estimate'].to_numpy() <= actual + top['max_error'].to_numpy() + 1e-6).all()
+    untracked = truth.drop(top.index, errors='ignore')
+    assert untracked.max() <= sketch.floor + 1e-6
+    assert sketch.floor <= sketch.total / sketch.capacity + 1e-6
+
+
+def test_space_saving_counts_within_error():
+    products, weights = skewed_stream()
+    truth = true_totals(products, weights)
+    sketch = feed(SpaceSaving(capacity=100), products, weights)
+    assert_space_saving_bounds(sketch, truth)
+    # The heaviest products are found exactly in order
+    assert sketch.top(5).index.tolist() == truth.nlargest(5).index.tolist()
+
+
+def test_space_saving_merge_matches_whole_stream():
+    products, weights = skewed_stream()
+    truth = true_totals(products, weights)
+    half = len(products) // 2
+    merged = feed(SpaceSaving(capacity=100), products[:half], weights[:half])
+    merged.merge(feed(SpaceSaving(capacity=100), products[half:], weights[half:]))
+    whole = feed(SpaceSaving(capacity=100), products, weights)
+
+    assert merged.total == pytest.approx(whole.total)
+    assert_space_saving_bounds(merged, truth)
+    assert merged.top(10).index.tolist() == whole.top(10).index.tolist()
+
+
+def test_count_min_never_underestimates():
+    products, weights = skewed_stream()
+    truth = true_totals(products, weights)
+    sketch = feed(CountMinSketch(epsilon=0.01, delta=0.01), products, weights)
+    estimates = sketch.estimate(truth.index)
+    assert (estimates >= truth.to_numpy() - 1e-6).all()
+    within = estimates - truth.to_numpy() <= sketch.error_bound()
+    assert within.mean() >= 1 - sketch.delta
+
+
+def test_count_min_merge_matches_whole_stream():
+    products, weights = skewed_stream()
+    half = len(products) // 2
+    merged = feed(CountMinSketch(epsilon=0.01), products[:half], weights[:half])
+    merged.merge(feed(CountMinSketch(epsilon=0.01), products[half:], weights[half:]))
+    whole = feed(CountMinSketch(epsilon=0.01), products, weights)
+    np.testing.assert_allclose(merged.table, whole.table)
+    assert merged.total == pytest.approx(whole.total)
+
+
+def test_product_sketch_bounds_contain_true_totals():
+    products, weights = skewed_stream()
+    truth = true_totals(products, weights)
+    sketch = ProductSketch(capacity=100, epsilon=0.01)
+    for start in range(0, len(products), 5000):
+        sketch.update(products[start:start + 5000], {'Revenue': weights[start:start + 5000]})
+    top = sketch.top('Revenue', 10)
+    actual = truth.reindex(top.index).to_numpy()
+    assert (top['lower_bound'].to_numpy() <= actual + 1e-6).all()
+    assert (actual <= top['estimate'].to_numpy() + 1e-6).all()
+
+
+def assert_rank_error(estimates, data, qs, error):
+    """Every estimate's rank in data is within error of its quantile (ties count either way)."""
+    data = np.sort(np.asarray(data, dtype='float64'))
+    below = np.searchsorted(data, estimates, side='left') / len(data)
+    at_or_below = np.searchsorted(data, estimates, side='right') / len(data)
+    qs = np.asarray(qs)
+    assert ((below - error <= qs) & (qs <= at_or_below + error)).all(), (qs, below, at_or_below)
+
+
+QUANTILES = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+
+def test_quantile_sketch_rank_error_after_merging():
+    rng = np.random.default_rng(6)
+    for data in [rng.uniform(0, 1000, 200_000), rng.lognormal(3, 1.5, 200_000)]:
+        parts = np.array_split(data, 7)
+        sketch = QuantileSketch(seed=1)
+        sketch.update(parts[0])
+        others = []
+        for i, part in enumerate(parts[1:]):
+            other = QuantileSketch(seed=i + 2)
+            for batch in np.array_split(part, 5):
+                other.update(batch)
+            others.append(other)
+        sketch.merge(*others)
+
+        assert sketch.n == len(data)
+        assert sketch.size() < 4 * sketch.k
+        assert sketch.min == data.min() and sketch.max == data.max()
+        assert_rank_error(sketch.quantiles(QUANTILES), data, QUANTILES, sketch.rank_error())
+
+
+def make_lines(n=40_000, seed=7):
+    rng = np.random.default_rng(seed)
+    qty = rng.integers(1, 12, n)
+    price = rng.lognormal(6, 0.8, n).round(2)
+    discount = np.where(rng.random(n) < 0.3, (qty * price * rng.uniform(0.02, 0.2, n)).round(2), 0)
+    department = rng.choice(['Interior', 'Exterior', 'Specialty', None], n, p=[0.4, 0.3, 0.28, 0.02])
+    return pd.DataFrame({
+        'Date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 181, n), unit='D'),
+        'Store': rng.choice(['Nairobi', 'Kisumu', 'Nakuru'], n),
+        'Department': department,
+        'Qty': qty,
+        'SP incl VAT': price,
+        'Discounts': discount,
+        'Net Sales': (qty * price - discount).round(2)
+    })
+
+
+def test_distribution_cells_merge_to_whole_dataset(monkeypatch):
+    monkeypatch.setattr(sketches, '_SHARED_RNG', np.random.default_rng(0))
+    engine = AnalyticsEngine()
+    df = make_lines()
+    built = engine.build_distribution_sketches(df)
+    merged = built.merged('Line Value', groups={'Interior', 'Specialty'}, stores={'Kisumu'})
+    rows = df[df['Department'].isin(['Interior', 'Specialty']) & (df['Store'] == 'Kisumu')]
+    assert merged.n == len(rows)
+    assert_rank_error(merged.quantiles(QUANTILES), rows['Net Sales'], QUANTILES, merged.rank_error())
+
+
+@pytest.mark.parametrize('start, end, partial_months', [
+    ('2024-02-14', '2024-05-09', True),
+    ('2024-03-01', '2024-04-30', False),
+    # Starts before the first date in the data, so only the end month is partial
+    ('2023-12-01', '2024-03-17', True),
+    (None, '2024-06-12', True),
+    (None, None, False)
+])
+def test_date_range_quantiles_match_selected_rows(monkeypatch, start, end, partial_months):
+    monkeypatch.setattr(sketches, '_SHARED_RNG', np.random.default_rng(0))
+    engine = AnalyticsEngine()
+    df = make_lines()
+    built = engine.build_distribution_sketches(df)
+    selected = df[engine.filter_date_range(df, 'Date', start, end)]
+    result, edge_rows = engine.range_distribution_sketches(built, df['Date'], selected, 'Date', start, end)
+
+    summary = result.summary('Line Value', QUANTILES)
+    # Rows without a department are left out, as in calculate_department_table
+    assert 'nan' not in [str(group) for group in summary.index]
+    assert list(summary.index) == ['Exterior', 'Interior', 'Specialty', 'All']
+    for group, rows in list(selected.groupby('Department')) + [('All', selected.dropna(subset=['Department']))]:
+        assert summary.loc[group, 'Count'] == len(rows)
+        estimates = summary.loc[group].iloc[1:].to_numpy(dtype='float64')
+        assert_rank_error(estimates, rows['Net Sales'], QUANTILES, QuantileSketch().rank_error())
+    assert (edge_rows > 0) == partial_months